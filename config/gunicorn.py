@@ -0,0 +1,49 @@
+"""
+Gunicorn server hooks, loaded by scripts/start.sh with --config python:config.gunicorn.
+Command line flags still set every other option.
+"""
+import itertools
+import os
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.development")
+
+# Imported up front, as child_exit runs in the master's SIGCHLD handler, which can interrupt
+# an import it started itself
+from utils.metrics import retire_worker  # noqa: E402
+
+# Pids of exited workers whose metrics are still to be folded into the aggregate
+_exited_workers = []
+_retiring = False
+
+
+def pre_fork(server, worker):
+    """Give the worker the lowest log file slot no live worker holds (see config/logs.py)."""
+    taken = {getattr(live_worker, "log_slot", None) for live_worker in server.WORKERS.values()}
+    worker.log_slot = next(slot for slot in itertools.count(1) if slot not in taken)
+
+
+def post_fork(server, worker):
+    """Point the worker's logging at its slot's file, read when Django configures logging."""
+    os.environ["LOG_FILE_SLOT"] = str(worker.log_slot)
+
+
+def post_worker_init(worker):
+    """Start the worker's import job workers, which adopt jobs orphaned by recycled or crashed workers."""
+    from utils.import_jobs import start_import_workers
+
+    start_import_workers()
+
+
+def child_exit(server, worker):
+    """Fold the metrics of an exited (or killed) worker into the aggregate and remove its file."""
+    global _retiring
+    _exited_workers.append(worker.pid)
+    # A SIGCHLD arriving while a previous call is folding only queues its pid for that call
+    if _retiring:
+        return
+    _retiring = True
+    try:
+        while _exited_workers:
+            retire_worker(_exited_workers.pop())
+    finally:
+        _retiring = False
@@ -1,12 +1,17 @@
+import atexit
 import logging
+import logging.config
 import os
+import queue
+import random
+import time
 from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
-import pytz
 import structlog
 from django.dispatch import receiver
-from django.utils.timezone import datetime
 from django_structlog import signals
 
 #####################################
@@ -21,15 +26,77 @@ if not os.path.exists(LOGGING_DIR):
 # Setup logging
 DEFAULT_LOG_LEVEL = os.getenv("DJANGO_LOG_LEVEL", "DEBUG")
 
+# Hand records to a background listener thread so file and console I/O never block requests
+LOG_QUEUE_ENABLED = True if os.getenv("LOG_QUEUE_ENABLED", "True") == "True" else False
+# Records held per queue before new ones are dropped, so a stalled listener never blocks requests
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# Write django-<slot>.log per gunicorn worker slot (LOG_FILE_SLOT, set by config/gunicorn.py), so
+# workers never rotate each other's file and a recycled worker reuses its slot's file; other
+# processes write django.log
+LOG_FILE_PER_PROCESS = True if os.getenv("LOG_FILE_PER_PROCESS", "True") == "True" else False
+# Fraction of successful (below 400) request_finished access logs written to the log file, with
+# errors always kept; 0 (the default) discards the access log
+ACCESS_LOG_SAMPLE_RATE = float(os.getenv("ACCESS_LOG_SAMPLE_RATE", "0"))
+
+ACCESS_LOGGER_NAME = "django_structlog.middlewares.request"
+
+# Asia/Kolkata has had no DST since 1945, so a fixed offset gives the same wall time
+IST = timezone(timedelta(hours=5, minutes=30), "IST")
+_ist_time = (None, None)
+_pid = os.getpid()
+
+
+def _refresh_pid():
+    global _pid
+    _pid = os.getpid()
+
+
+os.register_at_fork(after_in_child=_refresh_pid)
+
 
 def add_extra_context_to_logs(
     logger: logging.Logger, method_name: str, event_dict: structlog.types.EventDict
 ) -> structlog.types.EventDict:
-    # Add ist time
-    event_dict["ist_time"] = datetime.now().astimezone(pytz.timezone("Asia/Kolkata")).strftime("%Y-%m-%d %H:%M:%S")
-    # Add PID and TID
-    event_dict["pid"] = os.getpid()
+    global _ist_time
+    # Add ist time, formatted once per second rather than for every event
+    second = int(time.time())
+    cached_second, ist_time = _ist_time
+    if cached_second != second:
+        ist_time = datetime.fromtimestamp(second, IST).strftime("%Y-%m-%d %H:%M:%S")
+        _ist_time = (second, ist_time)
+    event_dict["ist_time"] = ist_time
+    # Add PID, cached per process
+    event_dict["pid"] = _pid
+
+    return event_dict
+
+
+def add_queued_context(
+    logger: logging.Logger, method_name: str, event_dict: structlog.types.EventDict
+) -> structlog.types.EventDict:
+    # Standard library records are formatted on the listener thread; merge the request
+    # context captured when they were queued (see StructlogQueueHandler)
+    context = getattr(event_dict.get("_record"), "structlog_context", None)
+    if context:
+        for key, value in context.items():
+            event_dict.setdefault(key, value)
+    return event_dict
+
 
+def sample_access_logs(
+    logger: logging.Logger, method_name: str, event_dict: structlog.types.EventDict
+) -> structlog.types.EventDict:
+    # Runs first, so dropped access logs cost no further processing
+    if getattr(logger, "name", None) != ACCESS_LOGGER_NAME:
+        return event_dict
+    event = event_dict.get("event")
+    if event == "request_started":
+        # request_finished repeats everything it carries
+        raise structlog.DropEvent
+    if event == "request_finished" and event_dict.get("code", 500) < 400:
+        if random.random() >= ACCESS_LOG_SAMPLE_RATE:
+            raise structlog.DropEvent
+        event_dict["sample_rate"] = ACCESS_LOG_SAMPLE_RATE
     return event_dict
 
 
@@ -37,6 +104,7 @@ def add_extra_context_to_logs(
 # `foreign_pre_chain` to both formatters.
 foreign_pre_chain = [
     structlog.contextvars.merge_contextvars,
+    add_queued_context,
     structlog.processors.TimeStamper(fmt="iso"),
     structlog.stdlib.add_logger_name,
     structlog.stdlib.add_log_level,
@@ -50,6 +118,7 @@ foreign_pre_chain = [
 structlog.configure(
     processors=[
         structlog.stdlib.filter_by_level,
+        sample_access_logs,
         *foreign_pre_chain,
         structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
     ],
@@ -117,10 +186,126 @@ LOGGING = {
         "default": {"handlers": ["file_write", "console"], "level": DEFAULT_LOG_LEVEL, "propagate": False},
         "django": {"handlers": ["console"], "level": "INFO", "propagate": False},
         "django.request": {"handlers": ["file_write", "console"], "level": "WARNING", "propagate": False},
-        "django_structlog.middlewares.request": {"handlers": ["null"], "level": "ERROR", "propagate": False},
+        # Sampled access log when enabled, see sample_access_logs
+        ACCESS_LOGGER_NAME: (
+            {"handlers": ["file_write"], "level": "INFO", "propagate": False}
+            if ACCESS_LOG_SAMPLE_RATE > 0
+            else {"handlers": ["null"], "level": "ERROR", "propagate": False}
+        ),
     },
 }
 
+# Django passes LOGGING to this instead of logging.config.dictConfig
+LOGGING_CONFIG = "config.logs.configure_logging"
+
+
+######################################
+#      QUEUED LOGGING PIPELINE       #
+######################################
+class StructlogQueueHandler(QueueHandler):
+    """
+    QueueHandler for an in-process queue that leaves records unformatted.
+
+    structlog events carry their event dict in record.msg, which the ProcessorFormatter
+    of the target handlers needs intact, so records are not pre-formatted the way
+    QueueHandler does for multiprocess queues. Standard library records are formatted on
+    the listener thread, so the request's structlog context is captured with them here.
+    When the bounded queue is full, records are dropped and counted rather than waited on.
+    """
+
+    dropped = 0
+
+    def prepare(self, record):
+        if not isinstance(record.msg, dict):
+            record.structlog_context = structlog.contextvars.get_contextvars()
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            StructlogQueueHandler.dropped += 1
+
+
+# (queue handler, target handlers, listener) of every queued handler group
+_queues = []
+
+
+def _worker_log_file(handler: logging.FileHandler, slot) -> None:
+    """Point a file handler at the django-<slot>.log of a worker slot, or at django.log if slot is None."""
+    shared_filename = getattr(handler, "_shared_filename", handler.baseFilename)
+    handler._shared_filename = shared_filename
+    root, extension = os.path.splitext(shared_filename)
+    filename = shared_filename if slot is None else f"{root}-{slot}{extension}"
+    if filename == handler.baseFilename:
+        return
+    handler.baseFilename = filename
+    if handler.stream is not None:
+        handler.stream.close()
+        handler.stream = handler._open()
+
+
+def _start_listeners() -> None:
+    for index, (queue_handler, handlers, _) in enumerate(_queues):
+        queue_handler.queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+        listener.start()
+        _queues[index] = (queue_handler, handlers, listener)
+
+
+def _stop_listeners() -> None:
+    # Drain what is still queued before the process exits
+    for _, _, listener in _queues:
+        if listener is not None and listener._thread is not None:
+            listener.stop()
+
+
+def _after_fork_in_child() -> None:
+    # A process forked by a worker must not write to the worker's slot file
+    os.environ.pop("LOG_FILE_SLOT", None)
+    for _, handlers, _ in _queues:
+        for handler in handlers:
+            if isinstance(handler, logging.FileHandler):
+                _worker_log_file(handler, None)
+    # The parent's listener threads do not exist in a forked process
+    _start_listeners()
+
+
+os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def configure_logging(logging_settings: dict) -> None:
+    """
+    Apply LOGGING, then move each configured logger's handlers behind a queue.
+
+    Loggers sharing the same handlers share one StructlogQueueHandler, holding up to
+    LOG_QUEUE_SIZE records, and one QueueListener thread that runs the formatting and I/O.
+    With LOG_FILE_PER_PROCESS (the default), file handlers of a gunicorn worker write to
+    its slot's file instead of the shared one.
+    """
+    logging.config.dictConfig(logging_settings)
+    if not LOG_QUEUE_ENABLED:
+        return
+
+    slot = os.getenv("LOG_FILE_SLOT") if LOG_FILE_PER_PROCESS else None
+    groups = {}
+    for name in logging_settings.get("loggers", {}):
+        logger = logging.getLogger(name)
+        handlers = tuple(handler for handler in logger.handlers if not isinstance(handler, logging.NullHandler))
+        if not handlers:
+            continue
+        if handlers not in groups:
+            groups[handlers] = StructlogQueueHandler(queue.Queue(maxsize=LOG_QUEUE_SIZE))
+            _queues.append((groups[handlers], handlers, None))
+            if slot is not None:
+                for handler in handlers:
+                    if isinstance(handler, logging.FileHandler):
+                        _worker_log_file(handler, slot)
+        logger.handlers = [groups[handlers]]
+
+    _start_listeners()
+    atexit.register(_stop_listeners)
+
 
 ######################################
 #       LOGGING CONTEXT MANAGER      #
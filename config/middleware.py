@@ -1,8 +1,14 @@
 import json
+import time
+from contextlib import ExitStack
 
 import structlog
+from django.conf import settings
+from django.db import connections
 from django.utils.deprecation import MiddlewareMixin
 
+from utils import metrics
+
 logger = structlog.getLogger("default")
 
 
@@ -93,3 +99,128 @@ class IPLoggingMiddleware(MiddlewareMixin):
             pass
 
         return response
+
+
+class RequestTimings:
+    """
+    Query count, database time and render time collected for one request.
+
+    Installed as a database execute wrapper, so it sees every query run on the request's
+    thread. SQL is only kept when SLOW_REQUEST_THRESHOLD_MS is enabled.
+    """
+
+    def __init__(self, keep_sql):
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_time = 0.0
+        self.sql = [] if keep_sql else None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.queries += 1
+            self.db_time += duration
+            if self.sql is not None:
+                self.sql.append((round(duration * 1000, 2), sql))
+
+
+class ServerTimingMiddleware:
+    """
+    Measure where request time goes: database queries, rendering and the rest of the view.
+
+    Emits a Server-Timing header (db, render, app and total durations in milliseconds,
+    with the query count as the db description) and binds the same numbers to the
+    structlog context, so they appear on the request_finished access log. Requests slower
+    than SLOW_REQUEST_THRESHOLD_MS are logged with the SQL they ran.
+
+    Must be listed after django_structlog's RequestMiddleware so the access log, written
+    when that middleware finishes, already carries the fields.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        threshold = settings.SLOW_REQUEST_THRESHOLD_MS
+        timings = RequestTimings(keep_sql=threshold > 0)
+        request._timings = timings
+
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timings))
+            response = self.get_response(request)
+        total = (time.perf_counter() - started) * 1000
+
+        db_time = timings.db_time * 1000
+        render_time = timings.render_time * 1000
+        app_time = max(total - db_time - render_time, 0.0)
+        if settings.SERVER_TIMING_HEADER:
+            response["Server-Timing"] = (
+                f'db;dur={db_time:.1f};desc="{timings.queries} queries", render;dur={render_time:.1f}, '
+                f"app;dur={app_time:.1f}, total;dur={total:.1f}"
+            )
+        structlog.contextvars.bind_contextvars(
+            db_queries=timings.queries,
+            db_time_ms=round(db_time, 1),
+            render_time_ms=round(render_time, 1),
+            total_time_ms=round(total, 1),
+        )
+
+        if 0 < threshold <= total:
+            logger.warning(
+                f"Slow request took {total:.0f} ms",
+                request_method=request.method,
+                request_path=request.path,
+                request_query_params=dict(request.GET),
+                response_status_code=response.status_code,
+                db_queries=timings.queries,
+                db_time_ms=round(db_time, 1),
+                sql=timings.sql,
+            )
+        return response
+
+    def process_template_response(self, request, response):
+        """Time the deferred rendering of DRF and template responses, which runs after the view."""
+        timings = request._timings
+        render = response.render
+
+        def timed_render():
+            started = time.perf_counter()
+            try:
+                return render()
+            finally:
+                timings.render_time += time.perf_counter() - started
+
+        response.render = timed_render
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Record the latency and response size of every request, labelled by route name
+    (e.g. weatherdata-list or weatherdata-trends), for the /metrics endpoint.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        match = request.resolver_match
+        route = match.view_name if match is not None else "unmatched"
+        metrics.observe(
+            "http_request_duration_seconds", duration,
+            route=route, method=request.method, status=str(response.status_code),
+        )
+        if response.has_header("Content-Length"):
+            metrics.observe("http_response_size_bytes", int(response["Content-Length"]), route=route)
+        elif not response.streaming:
+            metrics.observe("http_response_size_bytes", len(response.content), route=route)
+        return response
@@ -76,8 +76,28 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "crum.CurrentRequestUserMiddleware",
     "django_structlog.middlewares.RequestMiddleware",
+    "config.middleware.ServerTimingMiddleware",
+    "config.middleware.MetricsMiddleware",
 ]
 
+# Send the per-request db/render/app/total breakdown as a Server-Timing header
+SERVER_TIMING_HEADER = True if os.environ.get("SERVER_TIMING_HEADER", "True") == "True" else False
+# Requests slower than this are logged with the SQL they ran (0 disables)
+SLOW_REQUEST_THRESHOLD_MS = int(os.environ.get("SLOW_REQUEST_THRESHOLD_MS", 1000))
+
+# Directory where every process (gunicorn worker, import command) flushes its metrics for
+# /metrics to merge; empty limits /metrics to the serving process. Exited processes are folded
+# into its aggregate.json; clear the directory to reset the counters
+METRICS_DIR = os.environ.get("METRICS_DIR", os.path.join(BASE_DIR, "cache", "metrics"))
+# Seconds between flushes of a process's metrics to METRICS_DIR
+METRICS_FLUSH_INTERVAL = int(os.environ.get("METRICS_FLUSH_INTERVAL", 5))
+# Bearer token Prometheus must send to scrape /metrics, which exposes per-route traffic;
+# empty (the default) disables the endpoint
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
+# Runs tests with metrics flushed to a temporary directory instead of METRICS_DIR
+TEST_RUNNER = "config.test_runner.TestRunner"
+
 #############################
 #        TEMPLATES          #
 #############################
@@ -161,6 +181,41 @@ REST_FRAMEWORK = {
 }
 
 
+#############################
+#          CACHES           #
+#############################
+# Local-memory (LRU) cache by default; point CACHE_BACKEND/CACHE_LOCATION at a shared backend
+# to share cached responses between workers. Dataset versions live in the database (DatasetVersion),
+# so a per-process cache never serves a response older than the latest committed write
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache")
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKEND,
+        "LOCATION": os.environ.get("CACHE_LOCATION", "weather-data"),
+        "TIMEOUT": int(os.environ.get("CACHE_TIMEOUT", 3600)),
+    }
+}
+if CACHE_BACKEND.endswith("LocMemCache"):
+    CACHES["default"]["OPTIONS"] = {"MAX_ENTRIES": int(os.environ.get("CACHE_MAX_ENTRIES", 5000))}
+
+# Seconds a cached series response is kept (writes to the series invalidate it sooner)
+SERIES_CACHE_TIMEOUT = int(os.environ.get("SERIES_CACHE_TIMEOUT", 3600))
+
+# Cache-Control sent with ETagged read responses: browsers and the CDN may store them but
+# must revalidate with If-None-Match, which is answered with a cheap 304
+API_CACHE_CONTROL = os.environ.get("API_CACHE_CONTROL", "public, max-age=0, must-revalidate")
+
+# Directory of the memory-mapped columnar snapshot used to answer series reads (empty to disable).
+# Snapshots are only served for series whose version still matches the database, see utils.series_store
+SERIES_STORE_DIR = os.environ.get("SERIES_STORE_DIR", os.path.join(BASE_DIR, "cache", "series_store"))
+
+# Rows fetched per server-side cursor round trip, and encoded per streamed chunk, by the bulk export
+EXPORT_CHUNK_SIZE = int(os.environ.get("EXPORT_CHUNK_SIZE", 2000))
+
+# Directory of the Parquet/Arrow extracts rebuilt after imports when pyarrow is installed (empty to disable)
+EXPORT_SNAPSHOT_DIR = os.environ.get("EXPORT_SNAPSHOT_DIR", os.path.join(BASE_DIR, "cache", "exports"))
+
+
 #################################
 #       JWT AUTH SETTINGS       #
 #################################
@@ -198,6 +253,7 @@ CORS_ALLOW_HEADERS = [
 ]
 CORS_EXPOSE_HEADERS = [
     "x-request-id",
+    "etag",
 ]
 
 
@@ -218,3 +274,41 @@ DJANGO_STRUCTLOG_USER_ID_FIELD = "id"
 #     MetOffice Base URL    #
 #############################
 METOFFICE_BASE_URL = 'https://www.metoffice.gov.uk/pub/data/weather/uk/climate/datasets/'
+
+# Seconds to wait for the MetOffice server to connect and respond before retrying
+METOFFICE_REQUEST_TIMEOUT = int(os.environ.get("METOFFICE_REQUEST_TIMEOUT", 30))
+
+# Directory of downloaded MetOffice files used for conditional GETs (empty to disable)
+METOFFICE_CACHE_DIR = os.environ.get("METOFFICE_CACHE_DIR", os.path.join(BASE_DIR, "cache", "metoffice"))
+
+# Number of rows written per INSERT/UPDATE statement when saving an imported series
+METOFFICE_IMPORT_BATCH_SIZE = int(os.environ.get("METOFFICE_IMPORT_BATCH_SIZE", 1000))
+
+# Load imports on PostgreSQL with COPY into an unlogged staging table and one merge statement
+# (SQLite and other backends always use batched ORM upserts)
+METOFFICE_POSTGRES_COPY = True if os.environ.get("METOFFICE_POSTGRES_COPY", "True") == "True" else False
+
+# Climatology period imported anomalies are computed against, as "START-END" years.
+# The MetOffice publishes against 1961-1990 and 1991-2020; run recompute_anomalies after changing it
+ANOMALY_BASELINE = os.environ.get("ANOMALY_BASELINE", "1991-2020")
+
+#############################
+#   IMPORT JOB SETTINGS     #
+#############################
+# Background import worker threads per process, so API imports never tie up request workers
+IMPORT_JOB_WORKERS = int(os.environ.get("IMPORT_JOB_WORKERS", 2))
+# Seconds between heartbeats of the queued and running jobs a process owns
+IMPORT_JOB_HEARTBEAT_INTERVAL = int(os.environ.get("IMPORT_JOB_HEARTBEAT_INTERVAL", 30))
+# Seconds without a heartbeat after which a queued or running job is requeued by another process
+IMPORT_JOB_STALE_AFTER = int(os.environ.get("IMPORT_JOB_STALE_AFTER", 300))
+# Times a job is started before an orphaned job is failed rather than requeued
+IMPORT_JOB_MAX_ATTEMPTS = int(os.environ.get("IMPORT_JOB_MAX_ATTEMPTS", 3))
+# Seconds after a successful job before the series store and export snapshot are rebuilt, shared
+# by every job finishing in that window (0 leaves rebuilding to the build commands)
+IMPORT_JOB_REBUILD_DELAY = int(os.environ.get("IMPORT_JOB_REBUILD_DELAY", 60))
+
+#############################
+#     CRONTAB SETTINGS      #
+#############################
+# Cron jobs run outside gunicorn and append to the shared django.log that CRON mode tails
+CRONTAB_COMMAND_PREFIX = "LOG_FILE_PER_PROCESS=False"
@@ -0,0 +1,27 @@
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+
+from utils import metrics
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Test runner that keeps the metrics of the test process out of METRICS_DIR.
+
+    Every request a test makes records metrics, which the process would otherwise flush
+    to METRICS_DIR in the working tree. They go to a temporary directory instead, removed
+    once the tests have run; the final flush happens first, so nothing is written at exit.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.metrics_dir = tempfile.mkdtemp(prefix='metrics-')
+        settings.METRICS_DIR = self.metrics_dir
+
+    def teardown_test_environment(self, **kwargs):
+        metrics.flush(final=True)
+        shutil.rmtree(self.metrics_dir, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
@@ -1,6 +1,7 @@
 from django.conf import settings
 from django.urls import include, path
 from django.contrib import admin
+from utils.metrics import metrics_view
 from drf_spectacular.views import (
     SpectacularAPIView,
     SpectacularRedocView,
@@ -21,6 +22,10 @@ urlpatterns = [
     #         HEALTH CHECK        #
     ###############################
     path(r"health/", include("health_check.urls")),
+    ###############################
+    #          METRICS            #
+    ###############################
+    path("metrics", metrics_view, name="metrics"),
 ]
 
 
@@ -0,0 +1,87 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from db.models import Parameter, Region, WeatherData
+from utils.data_parser import MetOfficeParser
+from utils.pg_loader import copy_load_available
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark saving a synthetic MetOffice series with the legacy row-by-row upsert "
+        "against the batched bulk upsert. Runs against the configured default database "
+        "and rolls back everything it writes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--years', type=int, default=140, help='Number of years in the synthetic series')
+        parser.add_argument('--batch-size', type=int, default=None, help='Batch size for the bulk upsert')
+
+    def build_series(self, years):
+        """Build parsed data points shaped like MetOfficeParser.parse_data output"""
+        data = []
+        for year in range(1884, 1884 + years):
+            for month in range(1, 13):
+                data.append({'year': year, 'period_type': 'monthly', 'month': month, 'value': float(month)})
+            for period_type in ['win', 'spr', 'sum', 'aut', 'ann']:
+                data.append({'year': year, 'period_type': period_type, 'month': None, 'value': 1.0})
+        return data
+
+    def save_row_by_row(self, parameter_code, region_code, data):
+        """The pre-bulk implementation: one update_or_create per data point"""
+        region, _ = Region.objects.get_or_create(code=region_code, defaults={'name': region_code})
+        parameter, _ = Parameter.objects.get_or_create(code=parameter_code, defaults={'name': parameter_code, 'unit': ''})
+        for item in data:
+            WeatherData.objects.update_or_create(
+                region=region,
+                parameter=parameter,
+                year=item['year'],
+                period_type=item['period_type'],
+                month=item['month'],
+                defaults={'value': item['value']},
+            )
+
+    def measure(self, label, func):
+        query_count = 0
+
+        def count_queries(execute, sql, params, many, context):
+            nonlocal query_count
+            query_count += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count_queries):
+            started = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - started
+        self.stdout.write(f"  {label:<28} {elapsed * 1000:>10.1f} ms {query_count:>8} queries")
+        return elapsed
+
+    def handle(self, *args, **options):
+        data = self.build_series(options['years'])
+        parser = MetOfficeParser(batch_size=options['batch_size'])
+        load_path = 'COPY + merge' if copy_load_available() else f"batch size {parser.batch_size}"
+
+        self.stdout.write(self.style.NOTICE(
+            f"Benchmarking {len(data)} rows on '{connection.vendor}' ({load_path})"
+        ))
+
+        with transaction.atomic():
+            legacy_insert = self.measure(
+                'row-by-row insert', lambda: self.save_row_by_row('BENCH_LEGACY', 'BENCH', data)
+            )
+            legacy_update = self.measure(
+                'row-by-row update', lambda: self.save_row_by_row('BENCH_LEGACY', 'BENCH', data)
+            )
+            bulk_insert = self.measure(
+                'bulk insert', lambda: parser.save_to_database('BENCH_BULK', 'BENCH', {}, data)
+            )
+            bulk_update = self.measure(
+                'bulk update', lambda: parser.save_to_database('BENCH_BULK', 'BENCH', {}, data)
+            )
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Speedup: insert {legacy_insert / bulk_insert:.1f}x, update {legacy_update / bulk_update:.1f}x"
+        ))
@@ -0,0 +1,80 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rest_framework.renderers import JSONRenderer
+
+from db.models import WeatherData
+from weather_api.renderers import FastJSONRenderer
+from weather_api.serializers.rows import LIST_FIELDS, encode_rows
+from weather_api.serializers.weather import WeatherDataListSerializer
+
+# The model ordering ties across series, so pin both paths to the same total order
+ORDERING = ['-year', 'period_type', '-month', 'id']
+
+
+class Command(BaseCommand):
+    help = (
+        "Check that the serializer-free list path renders byte-identical JSON to "
+        "WeatherDataListSerializer with a query count independent of the page size, "
+        "and benchmark both."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--page-sizes', type=int, nargs='+', default=[10, 100, 1000], help='Page sizes to check and time'
+        )
+        parser.add_argument('--iterations', type=int, default=20, help='Timed renders per page size')
+
+    def serializer_page(self, page_size):
+        page = WeatherData.objects.order_by(*ORDERING)[:page_size]
+        return JSONRenderer().render(WeatherDataListSerializer(page, many=True).data)
+
+    def fast_page(self, page_size):
+        rows = WeatherData.objects.order_by(*ORDERING).values_list(*LIST_FIELDS)[:page_size]
+        return FastJSONRenderer().render(encode_rows(rows))
+
+    def run(self, func, page_size):
+        query_count = 0
+
+        def count_queries(execute, sql, params, many, context):
+            nonlocal query_count
+            query_count += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count_queries):
+            output = func(page_size)
+        return output, query_count
+
+    def measure(self, func, page_size, iterations):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func(page_size)
+        return (time.perf_counter() - started) / iterations * 1000
+
+    def handle(self, *args, **options):
+        if not WeatherData.objects.exists():
+            raise CommandError("No weather data imported; run import_metaoffice_data first")
+
+        failures = []
+        fast_query_counts = set()
+        for page_size in options['page_sizes']:
+            expected, serializer_queries = self.run(self.serializer_page, page_size)
+            output, fast_queries = self.run(self.fast_page, page_size)
+            fast_query_counts.add(fast_queries)
+            if output != expected:
+                failures.append(f"output differs from WeatherDataListSerializer at page size {page_size}")
+
+            serializer_ms = self.measure(self.serializer_page, page_size, options['iterations'])
+            fast_ms = self.measure(self.fast_page, page_size, options['iterations'])
+            self.stdout.write(
+                f"  page size {page_size:>6}: serializer {serializer_ms:>9.2f} ms {serializer_queries:>6} queries   "
+                f"fast path {fast_ms:>8.2f} ms {fast_queries:>3} queries   {serializer_ms / fast_ms:>6.1f}x"
+            )
+
+        if len(fast_query_counts) != 1:
+            failures.append(f"fast path query count depends on the page size: {sorted(fast_query_counts)}")
+
+        if failures:
+            raise CommandError('; '.join(failures))
+        self.stdout.write(self.style.SUCCESS("Fast path output is byte-identical with a fixed query count"))
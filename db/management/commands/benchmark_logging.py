@@ -0,0 +1,132 @@
+import logging
+import os
+import queue
+import tempfile
+import time
+from logging.handlers import QueueListener, TimedRotatingFileHandler
+
+import pytz
+import structlog
+from django.core.management.base import BaseCommand
+from django.utils.timezone import datetime
+
+from config import logs as log_config
+
+
+def legacy_context(logger, method_name, event_dict):
+    """The pre-queue context processor: builds a pytz timezone and formats a timestamp per event"""
+    event_dict["ist_time"] = datetime.now().astimezone(pytz.timezone("Asia/Kolkata")).strftime("%Y-%m-%d %H:%M:%S")
+    event_dict["pid"] = os.getpid()
+    return event_dict
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the per-request logging overhead on the request thread: the synchronous "
+        "pipeline (file and console handlers called inline, pytz context processor, every "
+        "access log written) against the queued pipeline with access log sampling."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=5000, help='Number of simulated requests')
+        parser.add_argument('--sample-rate', type=float, default=0.1, help='Access log sample rate of the queued pipeline')
+
+    def build_handlers(self, directory, name):
+        """A JSON file handler and a console handler writing to /dev/null, as configured in config.logs"""
+        file_handler = TimedRotatingFileHandler(os.path.join(directory, f"{name}.log"), when="midnight")
+        file_handler.setFormatter(structlog.stdlib.ProcessorFormatter(processor=structlog.processors.JSONRenderer()))
+        console_handler = logging.StreamHandler(open(os.devnull, 'w'))
+        console_handler.setFormatter(structlog.stdlib.ProcessorFormatter(processor=structlog.dev.ConsoleRenderer(colors=True)))
+        return [file_handler, console_handler]
+
+    def simulate(self, logger, requests):
+        """Log what one request logs today (request_started and request_finished) and time it"""
+        started = time.perf_counter()
+        for index in range(requests):
+            structlog.contextvars.bind_contextvars(request_id=str(index), request_path='/api/v1/weather-data/')
+            logger.info("request_started", request="GET /api/v1/weather-data/")
+            logger.info("request_finished", code=200, request="GET /api/v1/weather-data/", db_queries=2, total_time_ms=3.1)
+            structlog.contextvars.clear_contextvars()
+        return time.perf_counter() - started
+
+    def report(self, label, requests, elapsed, drained=None):
+        line = f"  {label:<24} {elapsed / requests * 1e6:>8.1f} us/request on the request thread"
+        if drained is not None:
+            line += f"   ({drained * 1000:.0f} ms until the listener drained)"
+        self.stdout.write(line)
+
+    def handle(self, *args, **options):
+        requests = options['requests']
+        tail = [
+            structlog.stdlib.PositionalArgumentsFormatter(),
+            structlog.processors.StackInfoRenderer(),
+            structlog.processors.format_exc_info,
+            structlog.processors.UnicodeDecoder(),
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+        ]
+        self.stdout.write(self.style.NOTICE(f"Logging {requests} simulated requests"))
+
+        with tempfile.TemporaryDirectory() as directory:
+            legacy_handlers = self.build_handlers(directory, 'legacy')
+            legacy = structlog.wrap_logger(
+                self.standalone_logger(legacy_handlers),
+                processors=[*self.head(), legacy_context, *tail],
+                wrapper_class=structlog.stdlib.BoundLogger,
+            )
+            legacy_time = self.simulate(legacy, requests)
+            self.report('synchronous', requests, legacy_time)
+
+            for handler in legacy_handlers:
+                handler.close()
+
+            # Queueing alone, then queueing with access log sampling
+            for sample_rate in [1.0, options['sample_rate']]:
+                queued_time = self.run_queued(directory, tail, requests, sample_rate)
+
+        self.stdout.write(self.style.SUCCESS(f"Speedup on the request thread: {legacy_time / queued_time:.1f}x"))
+
+    def run_queued(self, directory, tail, requests, sample_rate):
+        """Time the queued pipeline at the given access log sample rate and wait for the listener to drain"""
+        handlers = self.build_handlers(directory, f"queued-{sample_rate:g}")
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        queued = structlog.wrap_logger(
+            self.standalone_logger([log_config.StructlogQueueHandler(log_queue)]),
+            processors=[
+                *self.head(sampled=True), log_config.add_queued_context, log_config.add_extra_context_to_logs, *tail
+            ],
+            wrapper_class=structlog.stdlib.BoundLogger,
+        )
+        configured_rate = log_config.ACCESS_LOG_SAMPLE_RATE
+        log_config.ACCESS_LOG_SAMPLE_RATE = sample_rate
+        try:
+            started = time.perf_counter()
+            queued_time = self.simulate(queued, requests)
+            listener.stop()
+            drained = time.perf_counter() - started
+        finally:
+            log_config.ACCESS_LOG_SAMPLE_RATE = configured_rate
+        for handler in handlers:
+            handler.close()
+
+        self.report(f"queued, sampled at {sample_rate:g}", requests, queued_time, drained)
+        return queued_time
+
+    def standalone_logger(self, handlers):
+        # Named like the access logger so sampling applies, but outside the configured hierarchy
+        stdlib_logger = logging.Logger(log_config.ACCESS_LOGGER_NAME, logging.INFO)
+        for handler in handlers:
+            stdlib_logger.addHandler(handler)
+        return stdlib_logger
+
+    def head(self, sampled=False):
+        """The leading processors of config.logs, with or without access log sampling"""
+        return [
+            structlog.stdlib.filter_by_level,
+            *([log_config.sample_access_logs] if sampled else []),
+            structlog.contextvars.merge_contextvars,
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.stdlib.add_logger_name,
+            structlog.stdlib.add_log_level,
+        ]
@@ -0,0 +1,81 @@
+import contextlib
+import io
+import random
+import time
+
+import pandas as pd
+from django.core.management.base import BaseCommand
+
+from utils.data_parser import COLUMN_NAMES, MONTHLY_COLUMNS, MetOfficeParser
+
+
+class Command(BaseCommand):
+    help = (
+        "Micro-benchmark the wide-to-long reshape of a synthetic MetOffice data section: "
+        "the legacy per-row iterrows passes against the vectorized columnar reshape."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--years', type=int, default=10000, help='Number of years in the synthetic file')
+        parser.add_argument('--repeat', type=int, default=3, help='Number of timed runs (best is reported)')
+
+    def build_data_text(self, years):
+        """Build a synthetic data section with a sprinkling of missing values"""
+        rng = random.Random(0)
+        lines = []
+        for year in range(1000, 1000 + years):
+            values = [f"{rng.uniform(-5, 25):.1f}" if rng.random() > 0.02 else '---' for _ in COLUMN_NAMES[1:]]
+            lines.append(' '.join([str(year), *values]))
+        return '\n'.join(lines)
+
+    def legacy_reshape(self, data_text):
+        """The pre-vectorization reshape: one iterrows pass per period group"""
+        rows = [line.split() for line in data_text.split('\n')]
+        df = pd.DataFrame(rows, columns=COLUMN_NAMES)
+        for col in df.columns:
+            if col != 'year':
+                df[col] = pd.to_numeric(df[col], errors='coerce')
+
+        result = []
+        for _, row in df.iterrows():
+            year = int(row['year'])
+            for month_number, month in enumerate(MONTHLY_COLUMNS, start=1):
+                if pd.notna(row[month]):
+                    result.append({'year': year, 'period_type': 'monthly', 'month': month_number, 'value': float(row[month])})
+        for code in ['ann', 'win', 'spr', 'sum', 'aut']:
+            for _, row in df.iterrows():
+                if pd.notna(row[code]):
+                    result.append({'year': int(row['year']), 'period_type': code, 'month': None, 'value': float(row[code])})
+        return result
+
+    def best_of(self, repeat, func):
+        timings = []
+        result = None
+        for _ in range(repeat):
+            with contextlib.redirect_stdout(io.StringIO()):
+                started = time.perf_counter()
+                result = func()
+                timings.append(time.perf_counter() - started)
+        return min(timings), result
+
+    def handle(self, *args, **options):
+        data_text = self.build_data_text(options['years'])
+        parser = MetOfficeParser()
+        repeat = options['repeat']
+
+        self.stdout.write(self.style.NOTICE(f"Reshaping {options['years']} synthetic years (best of {repeat})"))
+
+        legacy_time, legacy_records = self.best_of(repeat, lambda: self.legacy_reshape(data_text))
+        columnar_time, columns = self.best_of(repeat, lambda: parser._parse_data_columns(data_text))
+        records_time, records = self.best_of(repeat, lambda: parser._parse_data_with_pandas(data_text))
+
+        if records != legacy_records:
+            self.stdout.write(self.style.ERROR("Vectorized output differs from the legacy output"))
+
+        self.stdout.write(f"  {'legacy iterrows':<24} {legacy_time * 1000:>10.1f} ms")
+        self.stdout.write(f"  {'columnar arrays':<24} {columnar_time * 1000:>10.1f} ms")
+        self.stdout.write(f"  {'columnar + dict adapter':<24} {records_time * 1000:>10.1f} ms")
+        self.stdout.write(self.style.SUCCESS(
+            f"Speedup: {legacy_time / columnar_time:.1f}x columnar, {legacy_time / records_time:.1f}x with adapter "
+            f"({len(columns['value'])} data points)"
+        ))
@@ -0,0 +1,77 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from db.models import WeatherData
+from utils.series_store import build_series_store, get_series_store
+from weather_api.serializers.weather import WeatherDataListSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark p50/p99 latency of answering a series read (one page, rendered to JSON) "
+        "from the ORM and serializer against the memory-mapped series store."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--region', type=str, default=None, help='Region code (defaults to the first imported)')
+        parser.add_argument('--parameter', type=str, default=None, help='Parameter code (defaults to the first imported)')
+        parser.add_argument('--iterations', type=int, default=500, help='Timed requests per scenario')
+        parser.add_argument('--page-size', type=int, default=100, help='Rows per page')
+
+    def orm_page(self, region_code, parameter_code, period_types, page_size):
+        queryset = WeatherData.objects.filter(region__code=region_code, parameter__code=parameter_code)
+        if period_types:
+            queryset = queryset.filter(period_type__in=period_types)
+        count = queryset.count()
+        data = WeatherDataListSerializer(queryset[:page_size], many=True).data
+        return JSONRenderer().render({'count': count, 'results': data})
+
+    def store_page(self, region_code, parameter_code, period_types, page_size):
+        rows = get_series_store().get_series(region_code, parameter_code, period_types=period_types)
+        return JSONRenderer().render({'count': len(rows), 'results': rows[0:page_size]})
+
+    def measure(self, label, iterations, func):
+        func()  # warm up
+        timings = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        p50, p99 = np.percentile(timings, [50, 99])
+        self.stdout.write(f"  {label:<36} p50 {p50:>8.3f} ms   p99 {p99:>8.3f} ms")
+        return p50
+
+    def handle(self, *args, **options):
+        series = WeatherData.objects.values_list('region__code', 'parameter__code').order_by('region__code', 'parameter__code')
+        if options['region'] and options['parameter']:
+            region_code, parameter_code = options['region'], options['parameter']
+        elif series.exists():
+            region_code, parameter_code = series.first()
+        else:
+            raise CommandError("No weather data imported; run import_metaoffice_data first")
+
+        if build_series_store() is None:
+            raise CommandError("The series store is disabled (SERIES_STORE_DIR is empty)")
+
+        iterations = options['iterations']
+        page_size = options['page_size']
+        self.stdout.write(self.style.NOTICE(f"Series {parameter_code} in {region_code}, {iterations} iterations"))
+
+        for label, period_types in [('annual', ['ann']), ('seasonal', ['win', 'spr', 'sum', 'aut']), ('all periods', None)]:
+            if self.orm_page(region_code, parameter_code, period_types, page_size) != self.store_page(
+                region_code, parameter_code, period_types, page_size
+            ):
+                self.stdout.write(self.style.ERROR(f"Store output differs from the ORM output for {label}"))
+
+            orm = self.measure(
+                f"{label} ORM + serializer", iterations,
+                lambda pt=period_types: self.orm_page(region_code, parameter_code, pt, page_size),
+            )
+            store = self.measure(
+                f"{label} series store", iterations,
+                lambda pt=period_types: self.store_page(region_code, parameter_code, pt, page_size),
+            )
+            self.stdout.write(self.style.SUCCESS(f"  {label}: {orm / store:.1f}x faster at p50"))
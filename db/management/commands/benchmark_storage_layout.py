@@ -0,0 +1,153 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from db.models import Parameter, Region, WeatherData, WeatherYear
+from utils.data_parser import MetOfficeParser, compute_anomalies
+from utils.weather_years import build_weather_years, get_year_points, save_weather_years
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the long WeatherData layout (one row per month or period) with the wide "
+        "WeatherYear layout (one row per year): table and index size, import time of a "
+        "synthetic series and p50/p99 latency of a series read. WeatherYear is built from "
+        "WeatherData for the comparison, and every write is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--years', type=int, default=140, help='Number of years in the synthetic series')
+        parser.add_argument('--region', type=str, default=None, help='Region code to read (defaults to the first imported)')
+        parser.add_argument('--parameter', type=str, default=None, help='Parameter code to read (defaults to the first imported)')
+        parser.add_argument('--iterations', type=int, default=200, help='Timed reads per layout')
+
+    def relation_sizes(self, model):
+        """Return the (table, index) size in bytes of a model's table, or None if unsupported."""
+        table = model._meta.db_table
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute("SELECT pg_table_size(%s), pg_indexes_size(%s)", [table, table])
+                return cursor.fetchone()
+            if connection.vendor == 'sqlite':
+                try:
+                    cursor.execute(
+                        "SELECT SUM(CASE WHEN name = %s THEN pgsize ELSE 0 END), "
+                        "SUM(CASE WHEN name != %s THEN pgsize ELSE 0 END) FROM dbstat "
+                        "WHERE name = %s OR name IN (SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = %s)",
+                        [table, table, table, table],
+                    )
+                except Exception:
+                    # SQLite builds without the dbstat virtual table
+                    return None
+                return cursor.fetchone()
+        return None
+
+    def report_sizes(self):
+        self.stdout.write(self.style.NOTICE("Storage size"))
+        for model in [WeatherData, WeatherYear]:
+            sizes = self.relation_sizes(model)
+            rows = model.objects.count()
+            if sizes is None:
+                self.stdout.write(f"  {model.__name__:<12} {rows:>9} rows   (size not available on {connection.vendor})")
+                continue
+            table_size, index_size = (size or 0 for size in sizes)
+            self.stdout.write(
+                f"  {model.__name__:<12} {rows:>9} rows   table {table_size / 1024:>9.1f} KiB   "
+                f"indexes {index_size / 1024:>9.1f} KiB"
+            )
+
+    def build_columns(self, years):
+        """Build a synthetic parsed series shaped like MetOfficeParser.parse_data_columns output"""
+        rng = np.random.default_rng(0)
+        data = []
+        for year in range(1884, 1884 + years):
+            for month in range(1, 13):
+                data.append({'year': year, 'period_type': 'monthly', 'month': month, 'value': round(rng.normal(10, 3), 1)})
+            for period_type in ['win', 'spr', 'sum', 'aut', 'ann']:
+                data.append({'year': year, 'period_type': period_type, 'month': None, 'value': round(rng.normal(10, 1), 1)})
+        return data, MetOfficeParser.records_to_columns(data)
+
+    def build_wide_layout(self):
+        """Build WeatherYear from every WeatherData series."""
+        self.stdout.write(self.style.NOTICE("Building WeatherYear from WeatherData"))
+        started = time.perf_counter()
+        WeatherYear.objects.all().delete()
+        regions = Region.objects.in_bulk()
+        parameters = Parameter.objects.in_bulk()
+        series = WeatherData.objects.order_by().values_list('region_id', 'parameter_id').distinct()
+        for region_id, parameter_id in series:
+            build_weather_years(regions[region_id], parameters[parameter_id])
+        self.stdout.write(f"  {len(series)} series in {time.perf_counter() - started:.1f} s")
+
+    def report_import(self, years):
+        self.stdout.write(self.style.NOTICE(f"Import of a synthetic {years}-year series"))
+        parser = MetOfficeParser(cache_dir='')
+        data, columns = self.build_columns(years)
+        with transaction.atomic():
+            region, _ = Region.objects.get_or_create(code='BENCH', defaults={'name': 'Benchmark'})
+            parameter, _ = Parameter.objects.get_or_create(code='BENCH', defaults={'name': 'Benchmark', 'unit': ''})
+
+            started = time.perf_counter()
+            anomalies = compute_anomalies(columns).tolist()
+            rows = [
+                WeatherData(region=region, parameter=parameter, anomaly=None if np.isnan(anomaly) else anomaly, **item)
+                for item, anomaly in zip(data, anomalies)
+            ]
+            parser._bulk_upsert(region, parameter, rows)
+            long_time = time.perf_counter() - started
+
+            started = time.perf_counter()
+            save_weather_years(region, parameter, columns, parser.batch_size)
+            wide_time = time.perf_counter() - started
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"  {'WeatherData':<12} {len(rows):>9} rows   {long_time * 1000:>9.1f} ms")
+        self.stdout.write(f"  {'WeatherYear':<12} {years:>9} rows   {wide_time * 1000:>9.1f} ms")
+
+    def measure(self, label, iterations, func):
+        func()  # warm up
+        timings = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        p50, p99 = np.percentile(timings, [50, 99])
+        self.stdout.write(f"  {label:<12} p50 {p50:>8.3f} ms   p99 {p99:>8.3f} ms")
+
+    def report_reads(self, region_code, parameter_code, iterations):
+        self.stdout.write(self.style.NOTICE(f"Full series read of {parameter_code} in {region_code}"))
+
+        # Both layouts are read as the same (year, period_type, month, value) points
+        def read_long():
+            return list(
+                WeatherData.objects.filter(region__code=region_code, parameter__code=parameter_code).values_list(
+                    'year', 'period_type', 'month', 'value'
+                )
+            )
+
+        def read_wide():
+            return get_year_points(region_code, parameter_code)
+
+        if read_long() != read_wide():
+            raise CommandError(f"WeatherYear does not match WeatherData for {parameter_code} in {region_code}")
+        self.measure('WeatherData', iterations, read_long)
+        self.measure('WeatherYear', iterations, read_wide)
+
+    def handle(self, *args, **options):
+        series = WeatherData.objects.values_list('region__code', 'parameter__code').order_by('region__code', 'parameter__code')
+        if options['region'] and options['parameter']:
+            region_code, parameter_code = options['region'], options['parameter']
+        elif series.exists():
+            region_code, parameter_code = series.first()
+        else:
+            raise CommandError("No weather data imported; run import_metaoffice_data first")
+
+        with transaction.atomic():
+            self.build_wide_layout()
+            self.report_sizes()
+            self.report_import(options['years'])
+            self.report_reads(region_code, parameter_code, options['iterations'])
+            transaction.set_rollback(True)
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.export_snapshot import arrow_available, build_export_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Write content-addressed Parquet and Arrow extracts of WeatherData, served by "
+        "/api/v1/weather-data/snapshot/<parquet|arrow>/"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--directory', type=str, default=None, help='Snapshot directory (defaults to EXPORT_SNAPSHOT_DIR)')
+
+    def handle(self, *args, **options):
+        if not arrow_available():
+            raise CommandError("pyarrow is required for export snapshots; install it with pip install pyarrow")
+
+        manifest = build_export_snapshot(options['directory'])
+        if manifest is None:
+            self.stdout.write(self.style.WARNING("Export snapshots are disabled (EXPORT_SNAPSHOT_DIR is empty)"))
+            return
+
+        self.stdout.write(self.style.SUCCESS(f"Export snapshot {manifest['snapshot']} written with {manifest['rows']} rows"))
+        for name, artifact in manifest['artifacts'].items():
+            self.stdout.write(f"  {name:<8} {artifact['file']}  {artifact['size'] / 1024:>9.1f} KiB")
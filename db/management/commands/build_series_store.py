@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from utils.series_store import build_series_store
+
+
+class Command(BaseCommand):
+    help = "Write a fresh memory-mapped columnar snapshot of WeatherData for the series read endpoints"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--directory', type=str, default=None, help='Store directory (defaults to SERIES_STORE_DIR)')
+
+    def handle(self, *args, **options):
+        manifest = build_series_store(options['directory'])
+        if manifest is None:
+            self.stdout.write(self.style.WARNING("The series store is disabled (SERIES_STORE_DIR is empty)"))
+            return
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Series store snapshot {manifest['snapshot']} written with {manifest['rows']} rows "
+            f"in {len(manifest['series'])} series"
+        ))
@@ -1,6 +1,12 @@
 import argparse
+import os
+import time
 from django.core.management.base import BaseCommand, CommandError
+from utils import metrics
 from utils.data_parser import MetOfficeParser
+from utils.export_snapshot import arrow_available, build_export_snapshot
+from utils.import_pipeline import ImportPipeline
+from utils.series_store import build_series_store
 
 
 class Command(BaseCommand):
@@ -11,6 +17,23 @@ class Command(BaseCommand):
         parser.add_argument('--region', type=str, help='Region code (e.g., UK)', required=False)
         parser.add_argument('--all-regions', action='store_true', help='Import data for all available regions')
         parser.add_argument('--all-parameters', action='store_true', help='Import data for all available parameters')
+        parser.add_argument(
+            '--concurrency', type=int, default=None,
+            help='Number of files to download in parallel (default 1). Values above 1 use the concurrent '
+                 'fetch/parse/save pipeline. With --source-dir, the number of parse processes (default: CPU count)'
+        )
+        parser.add_argument(
+            '--source-dir', type=str, default=None,
+            help='Import from a local mirror of <parameter>/date/<region>.txt files instead of the MetOffice website'
+        )
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Parse and save every series, even if its file is unchanged since the last import'
+        )
+        parser.add_argument(
+            '--incremental', action='store_true',
+            help='Only write rows whose values differ from the database, deleting rows no longer in the file'
+        )
         
     def handle(self, *args, **options):
         parameter_code = options.get('parameter')
@@ -18,6 +41,10 @@ class Command(BaseCommand):
         all_regions = options.get('all_regions', False)
         all_parameters = options.get('all_parameters', False)
         
+        if options.get('source_dir'):
+            self.import_local(options['source_dir'], parameter_code, region_code, options)
+            return
+        
         # If no specific parameter or region is provided, import all data
         if parameter_code is None and region_code is None and not all_regions and not all_parameters:
             self.stdout.write(self.style.NOTICE("No specific parameter or region provided. Importing all available data..."))
@@ -50,38 +77,151 @@ class Command(BaseCommand):
             # If region is not specified but parameter is, use all regions
             regions_to_process = regions
         
-        parser = MetOfficeParser(max_retries=5, retry_delay=2)  # Use retry mechanism
+        concurrency = options.get('concurrency') or 1
+        only_if_changed = not options.get('force', False)
+        incremental = options.get('incremental', False)
+        # Use retry mechanism, with enough pooled connections for every concurrent download
+        parser = MetOfficeParser(max_retries=5, retry_delay=2, pool_size=max(concurrency, 10))
         total_records = 0
         
-        for param in params_to_process:
-            for region in regions_to_process:
-                try:
-                    self.stdout.write(self.style.NOTICE(f"Importing data for parameter '{param}' and region '{region}'..."))
-                    
-                    # Fetch the data with retry mechanism
-                    content = parser.fetch_data(param, region)
-                    
-                    # Parse the data
-                    metadata, data = parser.parse_data(content)
-                    
-                    # Save to database
-                    records_count = parser.save_to_database(param, region, metadata, data)
-                    
-                    # Print breakdown of data types
-                    monthly_count = len([d for d in data if d.get('period_type') == 'monthly'])
-                    annual_count = len([d for d in data if d.get('period_type') == 'ann'])
-                    seasonal_count = len([d for d in data if d.get('period_type') in ['win', 'spr', 'sum', 'aut']])
-                    
-                    self.stdout.write(self.style.SUCCESS(
-                        f"Successfully imported {records_count} records for {param} in {region} "
-                        f"({monthly_count} monthly, {annual_count} annual, {seasonal_count} seasonal)"
-                    ))
-                    
-                    total_records += records_count
-                    
-                except Exception as e:
-                    self.stdout.write(self.style.ERROR(f"Error importing data for {param} in {region}: {str(e)}"))
-                    if not (all_parameters or all_regions):
-                        raise CommandError(f"Import failed: {str(e)}")
+        if concurrency > 1:
+            series = [(param, region) for param in params_to_process for region in regions_to_process]
+            self.stdout.write(self.style.NOTICE(
+                f"Importing {len(series)} series with {concurrency} concurrent downloads..."
+            ))
+            pipeline = ImportPipeline(
+                parser, concurrency=concurrency, only_if_changed=only_if_changed, incremental=incremental
+            )
+            results = pipeline.run(series, on_result=self.report_result)
+            
+            total_records = sum(result['records'] for result in results)
+            failed = [result for result in results if result['error'] is not None]
+            if failed and not (all_parameters or all_regions):
+                raise CommandError(f"Import failed: {str(failed[0]['error'])}")
+        else:
+            for param in params_to_process:
+                for region in regions_to_process:
+                    try:
+                        self.stdout.write(self.style.NOTICE(f"Importing data for parameter '{param}' and region '{region}'..."))
+                        
+                        # Fetch the data with retry mechanism
+                        content = parser.fetch_data(param, region, only_if_changed=only_if_changed)
+                        if content is None:
+                            self.report_unchanged(param, region)
+                            continue
+                        
+                        started = time.perf_counter()
+                        if incremental:
+                            # Parse into arrays and write only the rows that differ
+                            metadata, columns = parser.parse_data_columns(content)
+                            self.observe_parse(param, region, started)
+                            counts = parser.save_changes(param, region, metadata, columns)
+                            parser.mark_imported(param, region)
+                            
+                            self.report_changes(param, region, counts)
+                            total_records += counts['inserted'] + counts['updated'] + counts['unchanged']
+                            continue
+                        
+                        # Parse the data
+                        metadata, data = parser.parse_data(content)
+                        self.observe_parse(param, region, started)
+                        
+                        # Save to database
+                        records_count = parser.save_to_database(param, region, metadata, data)
+                        parser.mark_imported(param, region)
+                        
+                        self.report_success(param, region, records_count, data)
+                        total_records += records_count
+                        
+                    except Exception as e:
+                        self.stdout.write(self.style.ERROR(f"Error importing data for {param} in {region}: {str(e)}"))
+                        if not (all_parameters or all_regions):
+                            raise CommandError(f"Import failed: {str(e)}")
         
         self.stdout.write(self.style.SUCCESS(f"Import completed. Total records imported: {total_records}"))
+        
+        self.publish_series_store()
+    
+    def import_local(self, source_dir, parameter_code, region_code, options):
+        """Import every discovered file of a local mirror, optionally filtered to one parameter or region"""
+        if not os.path.isdir(source_dir):
+            raise CommandError(f"Source directory '{source_dir}' does not exist")
+        
+        files = [
+            (param, region, path) for param, region, path in MetOfficeParser.discover_local_files(source_dir)
+            if (parameter_code is None or param == parameter_code) and (region_code is None or region == region_code)
+        ]
+        if not files:
+            raise CommandError(f"No <parameter>/date/<region>.txt files to import in '{source_dir}'")
+        
+        concurrency = options.get('concurrency') or os.cpu_count() or 1
+        self.stdout.write(self.style.NOTICE(
+            f"Importing {len(files)} series from {source_dir} with {concurrency} parse processes..."
+        ))
+        pipeline = ImportPipeline(
+            MetOfficeParser(cache_dir=''), concurrency=concurrency, incremental=options.get('incremental', False)
+        )
+        results = pipeline.run_local(files, on_result=self.report_result)
+        
+        total_records = sum(result['records'] for result in results)
+        failed = [result for result in results if result['error'] is not None]
+        self.stdout.write(self.style.SUCCESS(
+            f"Import completed. Total records imported: {total_records} ({len(failed)} series failed)"
+        ))
+        self.publish_series_store()
+    
+    def observe_parse(self, param, region, started):
+        """Record the parse duration of a series in the import metrics"""
+        metrics.observe(
+            'metoffice_import_duration_seconds', time.perf_counter() - started, stage='parse', parameter=param, region=region
+        )
+    
+    def publish_series_store(self):
+        """Publish fresh snapshots for the memory-mapped series store and the Parquet/Arrow downloads"""
+        manifest = build_series_store()
+        if manifest is not None:
+            self.stdout.write(self.style.SUCCESS(f"Series store rebuilt with {manifest['rows']} rows"))
+        
+        manifest = build_export_snapshot() if arrow_available() else None
+        if manifest is not None:
+            self.stdout.write(self.style.SUCCESS(f"Export snapshot rebuilt with {manifest['rows']} rows"))
+    
+    def report_result(self, result):
+        """Report the outcome of one series imported by the concurrent pipeline"""
+        if result['error'] is not None:
+            self.stdout.write(self.style.ERROR(
+                f"Error importing data for {result['parameter']} in {result['region']}: {str(result['error'])}"
+            ))
+            return
+        if result['skipped']:
+            self.report_unchanged(result['parameter'], result['region'])
+            return
+        
+        if result['counts'] is not None:
+            self.report_changes(result['parameter'], result['region'], result['counts'])
+        else:
+            self.report_success(result['parameter'], result['region'], result['records'], result['data'])
+        timings = ', '.join(f"{stage} {seconds:.2f}s" for stage, seconds in result['timings'].items())
+        self.stdout.write(f"  ({timings})")
+    
+    def report_unchanged(self, param, region):
+        """Report a series skipped because its file has not changed"""
+        self.stdout.write(self.style.NOTICE(f"Data for {param} in {region} is unchanged since the last import, skipping"))
+    
+    def report_changes(self, param, region, counts):
+        """Print the per-series row counts of an incremental import"""
+        self.stdout.write(self.style.SUCCESS(
+            f"Successfully imported {param} in {region}: {counts['unchanged']} unchanged, "
+            f"{counts['inserted']} inserted, {counts['updated']} updated, {counts['deleted']} deleted"
+        ))
+    
+    def report_success(self, param, region, records_count, data):
+        """Print the number of imported records with a breakdown of data types"""
+        monthly_count = len([d for d in data if d.get('period_type') == 'monthly'])
+        annual_count = len([d for d in data if d.get('period_type') == 'ann'])
+        seasonal_count = len([d for d in data if d.get('period_type') in ['win', 'spr', 'sum', 'aut']])
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"Successfully imported {records_count} records for {param} in {region} "
+            f"({monthly_count} monthly, {annual_count} annual, {seasonal_count} seasonal)"
+        ))
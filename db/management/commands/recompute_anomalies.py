@@ -0,0 +1,87 @@
+import time
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from db.models import WeatherData
+from utils.data_parser import PERIOD_TYPES, compute_anomalies, parse_baseline
+from utils.export_snapshot import arrow_available, build_export_snapshot
+from utils.series_cache import bump_series_version
+from utils.series_store import build_series_store
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the anomalies of every series against a baseline climatology, with one "
+        "query and one vectorized pass per series. Only rows whose anomaly changes are written."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--baseline', type=str, default=None,
+            help='Baseline period as START-END years, e.g. 1961-1990 (defaults to ANOMALY_BASELINE)'
+        )
+        parser.add_argument('--batch-size', type=int, default=None, help='Rows per UPDATE statement')
+
+    def handle(self, *args, **options):
+        try:
+            baseline = parse_baseline(options['baseline'] or settings.ANOMALY_BASELINE)
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+        if baseline != parse_baseline(settings.ANOMALY_BASELINE):
+            self.stdout.write(self.style.WARNING(
+                f"Imports compute anomalies against ANOMALY_BASELINE ({settings.ANOMALY_BASELINE}); "
+                f"set it to {baseline[0]}-{baseline[1]} so new imports agree with this run"
+            ))
+
+        batch_size = options['batch_size'] or settings.METOFFICE_IMPORT_BATCH_SIZE
+        period_codes = {code: index for index, code in enumerate(PERIOD_TYPES)}
+        series = (
+            WeatherData.objects.order_by('region__code', 'parameter__code')
+            .values_list('region_id', 'parameter_id', 'region__code', 'parameter__code')
+            .distinct()
+        )
+
+        started = time.perf_counter()
+        total_updated = 0
+        for region_id, parameter_id, region_code, parameter_code in series:
+            with transaction.atomic():
+                rows = list(
+                    WeatherData.objects.filter(region_id=region_id, parameter_id=parameter_id).values_list(
+                        'id', 'year', 'period_type', 'month', 'value', 'anomaly'
+                    )
+                )
+                ids, years, period_types, months, values, current = zip(*rows, strict=True)
+                anomalies = compute_anomalies({
+                    'year': np.array(years, dtype=np.int32),
+                    'period_type': np.array([period_codes[code] for code in period_types], dtype=np.int8),
+                    'month': np.array([month or 0 for month in months], dtype=np.int8),
+                    'value': np.array(values, dtype=np.float64),
+                }, baseline)
+
+                to_update = [
+                    WeatherData(pk=pk, anomaly=anomaly)
+                    for pk, anomaly, previous in zip(
+                        ids, [None if np.isnan(anomaly) else anomaly for anomaly in anomalies.tolist()], current,
+                        strict=True,
+                    )
+                    if anomaly != previous
+                ]
+                WeatherData.objects.bulk_update(to_update, ['anomaly'], batch_size=batch_size)
+                if to_update:
+                    bump_series_version(region_code, parameter_code)
+
+            total_updated += len(to_update)
+            self.stdout.write(f"  {parameter_code} in {region_code}: {len(to_update)} of {len(rows)} anomalies changed")
+
+        if total_updated:
+            build_series_store()
+            if arrow_available():
+                build_export_snapshot()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Recomputed anomalies against {baseline[0]}-{baseline[1]}: {total_updated} rows updated "
+            f"in {time.perf_counter() - started:.1f}s"
+        ))
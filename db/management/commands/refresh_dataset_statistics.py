@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from utils.dataset_stats import refresh_all_statistics
+
+
+class Command(BaseCommand):
+    help = "Rebuild the precomputed series statistics from WeatherData (imports keep them current)"
+
+    def handle(self, *args, **options):
+        count = refresh_all_statistics()
+        self.stdout.write(self.style.SUCCESS(f"Refreshed statistics for {count} series"))
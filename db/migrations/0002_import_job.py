@@ -0,0 +1,65 @@
+# Generated by Django 5.1.15 on 2026-10-17 15:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImportJob",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(auto_now_add=True, verbose_name="Created At")),
+                ("updated_at", models.DateTimeField(auto_now=True, verbose_name="Last Modified At")),
+                (
+                    "parameter_code",
+                    models.CharField(help_text="Parameter code as used in MetOffice URLs", max_length=20),
+                ),
+                ("region_code", models.CharField(help_text="Region code as used in MetOffice URLs", max_length=20)),
+                (
+                    "state",
+                    models.CharField(
+                        choices=[
+                            ("queued", "Queued"),
+                            ("running", "Running"),
+                            ("succeeded", "Succeeded"),
+                            ("failed", "Failed"),
+                        ],
+                        default="queued",
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "started_at",
+                    models.DateTimeField(blank=True, help_text="When a worker picked up the job", null=True),
+                ),
+                (
+                    "finished_at",
+                    models.DateTimeField(blank=True, help_text="When the job succeeded or failed", null=True),
+                ),
+                (
+                    "timings",
+                    models.JSONField(
+                        blank=True, default=dict, help_text="Seconds spent in each stage (fetch, parse, save)"
+                    ),
+                ),
+                ("records_written", models.IntegerField(default=0, help_text="Number of records saved by the import")),
+                ("error", models.TextField(blank=True, help_text="Error message if the job failed", null=True)),
+            ],
+            options={
+                "ordering": ["-created_at"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        condition=models.Q(("state__in", ["queued", "running"])),
+                        fields=("parameter_code", "region_code"),
+                        name="unique_active_import_job",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.1.15 on 2026-10-17 16:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_series_statistics(apps, schema_editor):
+    WeatherData = apps.get_model("db", "WeatherData")
+    SeriesStatistics = apps.get_model("db", "SeriesStatistics")
+    aggregates = (
+        WeatherData.objects.order_by()
+        .values("region_id", "parameter_id", "period_type")
+        .annotate(row_count=models.Count("id"), min_year=models.Min("year"), max_year=models.Max("year"))
+    )
+    SeriesStatistics.objects.bulk_create([SeriesStatistics(**aggregate) for aggregate in aggregates], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0002_import_job"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SeriesStatistics",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(auto_now_add=True, verbose_name="Created At")),
+                ("updated_at", models.DateTimeField(auto_now=True, verbose_name="Last Modified At")),
+                (
+                    "period_type",
+                    models.CharField(
+                        choices=[
+                            ("monthly", "Monthly"),
+                            ("win", "Winter"),
+                            ("spr", "Spring"),
+                            ("sum", "Summer"),
+                            ("aut", "Autumn"),
+                            ("ann", "Annual"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("row_count", models.IntegerField(default=0, help_text="Number of WeatherData rows")),
+                ("min_year", models.IntegerField(help_text="Earliest year with data")),
+                ("max_year", models.IntegerField(help_text="Latest year with data")),
+                (
+                    "last_imported_at",
+                    models.DateTimeField(blank=True, help_text="When the series was last imported", null=True),
+                ),
+                (
+                    "parameter",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="series_statistics", to="db.parameter"
+                    ),
+                ),
+                (
+                    "region",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="series_statistics", to="db.region"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Series statistics",
+                "ordering": ["region", "parameter", "period_type"],
+                "unique_together": {("region", "parameter", "period_type")},
+            },
+        ),
+        migrations.RunPython(backfill_series_statistics, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,104 @@
+# Generated by Django 5.1.15 on 2026-10-17 16:14
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+WIDE_COLUMNS = [
+    "jan",
+    "feb",
+    "mar",
+    "apr",
+    "may",
+    "jun",
+    "jul",
+    "aug",
+    "sep",
+    "oct",
+    "nov",
+    "dec",
+    "win",
+    "spr",
+    "sum",
+    "aut",
+    "ann",
+]
+
+
+def backfill_weather_years(apps, schema_editor):
+    """Pivot the existing WeatherData rows into one WeatherYear row per series-year."""
+    WeatherData = apps.get_model("db", "WeatherData")
+    WeatherYear = apps.get_model("db", "WeatherYear")
+    years = {}
+    rows = WeatherData.objects.order_by().values_list(
+        "region_id", "parameter_id", "year", "period_type", "month", "value"
+    )
+    for region_id, parameter_id, year, period_type, month, value in rows.iterator(chunk_size=10000):
+        column = WIDE_COLUMNS[month - 1] if period_type == "monthly" else period_type
+        years.setdefault((region_id, parameter_id, year), {})[column] = value
+    WeatherYear.objects.bulk_create(
+        [
+            WeatherYear(region_id=region_id, parameter_id=parameter_id, year=year, **values)
+            for (region_id, parameter_id, year), values in years.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0003_series_statistics"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WeatherYear",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "year",
+                    models.IntegerField(
+                        validators=[
+                            django.core.validators.MinValueValidator(1800),
+                            django.core.validators.MaxValueValidator(2100),
+                        ]
+                    ),
+                ),
+                ("jan", models.FloatField(blank=True, null=True)),
+                ("feb", models.FloatField(blank=True, null=True)),
+                ("mar", models.FloatField(blank=True, null=True)),
+                ("apr", models.FloatField(blank=True, null=True)),
+                ("may", models.FloatField(blank=True, null=True)),
+                ("jun", models.FloatField(blank=True, null=True)),
+                ("jul", models.FloatField(blank=True, null=True)),
+                ("aug", models.FloatField(blank=True, null=True)),
+                ("sep", models.FloatField(blank=True, null=True)),
+                ("oct", models.FloatField(blank=True, null=True)),
+                ("nov", models.FloatField(blank=True, null=True)),
+                ("dec", models.FloatField(blank=True, null=True)),
+                ("win", models.FloatField(blank=True, help_text="Winter (Dec-Feb)", null=True)),
+                ("spr", models.FloatField(blank=True, help_text="Spring (Mar-May)", null=True)),
+                ("sum", models.FloatField(blank=True, help_text="Summer (Jun-Aug)", null=True)),
+                ("aut", models.FloatField(blank=True, help_text="Autumn (Sep-Nov)", null=True)),
+                ("ann", models.FloatField(blank=True, help_text="Annual", null=True)),
+                (
+                    "parameter",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="weather_years", to="db.parameter"
+                    ),
+                ),
+                (
+                    "region",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="weather_years", to="db.region"
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-year"],
+                "unique_together": {("region", "parameter", "year")},
+            },
+        ),
+        migrations.RunPython(backfill_weather_years, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.1.15 on 2026-10-17 16:17
+
+from django.db import migrations
+
+POSTGRES_FORWARD = [
+    # Staging table of the COPY load path (utils.pg_loader); unlogged, as rows only live for one import
+    """
+    CREATE UNLOGGED TABLE IF NOT EXISTS db_weatherdata_staging (
+        load_id uuid NOT NULL,
+        region_id bigint NOT NULL,
+        parameter_id bigint NOT NULL,
+        year integer NOT NULL,
+        period_type varchar(10) NOT NULL,
+        month integer NULL,
+        value double precision NOT NULL,
+        anomaly double precision NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS db_weatherdata_staging_load_idx ON db_weatherdata_staging (load_id)",
+    # The merge's conflict target and the series read index are built concurrently by 0010
+]
+
+POSTGRES_REVERSE = [
+    "DROP TABLE IF EXISTS db_weatherdata_staging",
+]
+
+
+def run_on_postgres(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0004_weather_year"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="weatherdata",
+            name="db_weatherd_region__80b665_idx",
+        ),
+        migrations.RunPython(run_on_postgres(POSTGRES_FORWARD), run_on_postgres(POSTGRES_REVERSE)),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.15 on 2026-10-17 17:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0005_postgres_load_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DatasetVersion",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(auto_now_add=True, verbose_name="Created At")),
+                ("updated_at", models.DateTimeField(auto_now=True, verbose_name="Last Modified At")),
+                (
+                    "name",
+                    models.CharField(help_text="Dataset name, e.g. 'series:UK:Tmax'", max_length=100, unique=True),
+                ),
+                ("version", models.BigIntegerField(help_text="Time-based version, replaced on every change")),
+            ],
+            options={
+                "ordering": ["name"],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.15 on 2026-10-17 17:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0006_dataset_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importjob",
+            name="attempts",
+            field=models.IntegerField(
+                default=0, help_text="Times a worker started the job; orphaned jobs are retried"
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.15 on 2026-10-17 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0007_import_job_attempts"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="seriesstatistics",
+            name="source_hash",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="SHA-256 of the file the series was imported from; cleared by any other write",
+                max_length=64,
+            ),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.1.15 on 2026-10-17 18:55
+
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery
+
+# Fields identifying a seasonal or annual point, whose month is NULL
+POINT_FIELDS = ["region_id", "parameter_id", "year", "period_type"]
+
+
+def dedupe_series_points(apps, schema_editor):
+    """
+    Delete duplicate seasonal and annual rows ahead of the unique index of 0010.
+
+    unique_together treats NULL months as distinct, so a (region, parameter, year,
+    period_type) can hold several NULL-month rows. The most recently inserted one
+    (highest id) is kept, and the row counts of the affected series are corrected.
+    """
+    WeatherData = apps.get_model("db", "WeatherData")
+    SeriesStatistics = apps.get_model("db", "SeriesStatistics")
+
+    duplicates = (
+        WeatherData.objects.filter(month__isnull=True)
+        .order_by()
+        .values(*POINT_FIELDS)
+        .annotate(rows=Count("id"))
+        .filter(rows__gt=1)
+    )
+    series = {(point["region_id"], point["parameter_id"]) for point in duplicates}
+    if not series:
+        return
+
+    latest = (
+        WeatherData.objects.filter(month__isnull=True, **{field: OuterRef(field) for field in POINT_FIELDS})
+        .order_by("-id")
+        .values("id")[:1]
+    )
+    deleted, _ = (
+        WeatherData.objects.filter(month__isnull=True)
+        .exclude(id=Subquery(latest))
+        .delete()
+    )
+    print(f"\n  Deleted {deleted} duplicate seasonal and annual rows from {len(series)} series")
+
+    for region_id, parameter_id in series:
+        counts = (
+            WeatherData.objects.filter(region_id=region_id, parameter_id=parameter_id)
+            .order_by()
+            .values("period_type")
+            .annotate(rows=Count("id"))
+        )
+        for count in counts:
+            SeriesStatistics.objects.filter(
+                region_id=region_id, parameter_id=parameter_id, period_type=count["period_type"]
+            ).update(row_count=count["rows"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0008_series_statistics_source_hash"),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_series_points, migrations.RunPython.noop),
+    ]
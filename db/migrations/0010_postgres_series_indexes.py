@@ -0,0 +1,54 @@
+# Generated by Django 5.1.15 on 2026-10-17 19:05
+
+from django.db import migrations
+
+# (name, definition) of the indexes built without blocking writes to db_weatherdata
+POSTGRES_INDEXES = [
+    # Conflict target of the COPY merge; NULL months of seasonal and annual rows compare equal as 0
+    (
+        "db_weatherdata_series_point_uniq",
+        "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS db_weatherdata_series_point_uniq "
+        "ON db_weatherdata (region_id, parameter_id, year, period_type, (COALESCE(month, 0)))",
+    ),
+    # Serves series reads filtered on region, parameter and period type as index-only scans
+    (
+        "db_weatherdata_series_read_idx",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS db_weatherdata_series_read_idx "
+        "ON db_weatherdata (region_id, parameter_id, period_type, year) INCLUDE (month, value, anomaly)",
+    ),
+]
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, statement in POSTGRES_INDEXES:
+        # A failed concurrent build leaves an invalid index behind that IF NOT EXISTS would keep
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass(%s)", [name]
+            )
+            row = cursor.fetchone()
+        if row and row[0]:
+            schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+        schema_editor.execute(statement)
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _ in reversed(POSTGRES_INDEXES):
+        schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("db", "0009_dedupe_series_points"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
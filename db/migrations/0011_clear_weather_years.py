@@ -0,0 +1,19 @@
+# Generated by Django 5.1.15 on 2026-10-17 19:40
+
+from django.db import migrations
+
+
+def clear_weather_years(apps, schema_editor):
+    """Empty WeatherYear, which imports and API writes no longer keep in step with WeatherData."""
+    apps.get_model("db", "WeatherYear").objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0010_postgres_series_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_weather_years, migrations.RunPython.noop),
+    ]
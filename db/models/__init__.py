@@ -1 +1,5 @@
 from db.models.weather import Region, Parameter, WeatherData
+from db.models.weather_year import WeatherYear
+from db.models.import_job import ImportJob
+from db.models.series_statistics import SeriesStatistics
+from db.models.dataset_version import DatasetVersion
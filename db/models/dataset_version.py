@@ -0,0 +1,19 @@
+from django.db import models
+
+from db.mixins import TimeAuditModel
+
+
+class DatasetVersion(TimeAuditModel):
+    """
+    Current version of a dataset ('regions', 'parameters' or one series), shared by every
+    process. Rewritten in the transaction that changes the dataset, so cached responses,
+    ETags and series store snapshots keyed on it go stale in all workers at commit.
+    """
+    name = models.CharField(max_length=100, unique=True, help_text="Dataset name, e.g. 'series:UK:Tmax'")
+    version = models.BigIntegerField(help_text="Time-based version, replaced on every change")
+
+    def __str__(self):
+        return f"{self.name} @ {self.version}"
+
+    class Meta:
+        ordering = ['name']
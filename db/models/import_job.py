@@ -0,0 +1,47 @@
+from django.db import models
+from django.db.models import Q
+
+from db.mixins import TimeAuditModel
+
+
+class ImportJob(TimeAuditModel):
+    """
+    Represents a background import of one MetOffice series (parameter and region).
+    Only one queued or running job may exist per series, so identical requests coalesce.
+    The process that owns an active job refreshes its updated_at as a heartbeat.
+    """
+    STATE_QUEUED = 'queued'
+    STATE_RUNNING = 'running'
+    STATE_SUCCEEDED = 'succeeded'
+    STATE_FAILED = 'failed'
+    
+    STATE_CHOICES = [
+        (STATE_QUEUED, 'Queued'),
+        (STATE_RUNNING, 'Running'),
+        (STATE_SUCCEEDED, 'Succeeded'),
+        (STATE_FAILED, 'Failed'),
+    ]
+    ACTIVE_STATES = [STATE_QUEUED, STATE_RUNNING]
+    
+    parameter_code = models.CharField(max_length=20, help_text="Parameter code as used in MetOffice URLs")
+    region_code = models.CharField(max_length=20, help_text="Region code as used in MetOffice URLs")
+    state = models.CharField(max_length=10, choices=STATE_CHOICES, default=STATE_QUEUED)
+    started_at = models.DateTimeField(null=True, blank=True, help_text="When a worker picked up the job")
+    finished_at = models.DateTimeField(null=True, blank=True, help_text="When the job succeeded or failed")
+    timings = models.JSONField(default=dict, blank=True, help_text="Seconds spent in each stage (fetch, parse, save)")
+    records_written = models.IntegerField(default=0, help_text="Number of records saved by the import")
+    attempts = models.IntegerField(default=0, help_text="Times a worker started the job; orphaned jobs are retried")
+    error = models.TextField(null=True, blank=True, help_text="Error message if the job failed")
+    
+    def __str__(self):
+        return f"Import {self.parameter_code}/{self.region_code} ({self.state})"
+    
+    class Meta:
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['parameter_code', 'region_code'],
+                condition=Q(state__in=['queued', 'running']),
+                name='unique_active_import_job',
+            ),
+        ]
@@ -0,0 +1,32 @@
+from django.db import models
+
+from db.mixins import TimeAuditModel
+from db.models.weather import Region, Parameter, WeatherData
+
+
+class SeriesStatistics(TimeAuditModel):
+    """
+    Precomputed summary of one period type of a series (region and parameter).
+    Maintained by the import path so dataset statistics never scan WeatherData.
+    source_hash records the downloaded file the series was imported from, so an unchanged
+    download is only skipped when this database already holds it.
+    """
+    region = models.ForeignKey(Region, on_delete=models.CASCADE, related_name='series_statistics')
+    parameter = models.ForeignKey(Parameter, on_delete=models.CASCADE, related_name='series_statistics')
+    period_type = models.CharField(max_length=10, choices=WeatherData.PERIOD_CHOICES)
+    row_count = models.IntegerField(default=0, help_text="Number of WeatherData rows")
+    min_year = models.IntegerField(help_text="Earliest year with data")
+    max_year = models.IntegerField(help_text="Latest year with data")
+    last_imported_at = models.DateTimeField(null=True, blank=True, help_text="When the series was last imported")
+    source_hash = models.CharField(
+        max_length=64, blank=True, default='',
+        help_text="SHA-256 of the file the series was imported from; cleared by any other write",
+    )
+    
+    def __str__(self):
+        return f"{self.region.code} - {self.parameter.code} - {self.period_type}: {self.row_count} rows"
+    
+    class Meta:
+        verbose_name_plural = 'Series statistics'
+        ordering = ['region', 'parameter', 'period_type']
+        unique_together = ['region', 'parameter', 'period_type']
@@ -84,7 +84,8 @@ class WeatherData(models.Model):
         ordering = ['-year', 'period_type', '-month']
         unique_together = ['region', 'parameter', 'year', 'period_type', 'month']
         verbose_name_plural = "Weather Data"
+        # The unique_together index already serves (region, parameter, ...) lookups. On
+        # PostgreSQL migration 0010 adds the COPY merge target and a covering series index.
         indexes = [
-            models.Index(fields=['region', 'parameter', 'year', 'period_type', 'month']),
             models.Index(fields=['year', 'period_type', 'month']),
         ]
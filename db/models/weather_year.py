@@ -0,0 +1,42 @@
+from django.core.validators import MinValueValidator, MaxValueValidator
+from django.db import models
+
+from db.models.weather import Region, Parameter
+
+
+class WeatherYear(models.Model):
+    """
+    Compact wide storage of one year of a series (region and parameter): the 12 monthly,
+    4 seasonal and annual values of a MetOffice data row in a single table row, instead
+    of the 17 WeatherData rows the same year takes. Missing values are null.
+    Not kept in step with WeatherData, which holds the row ids and stored anomalies the
+    API serves; benchmark_storage_layout builds it to compare the layouts and rolls back.
+    """
+    region = models.ForeignKey(Region, on_delete=models.CASCADE, related_name='weather_years')
+    parameter = models.ForeignKey(Parameter, on_delete=models.CASCADE, related_name='weather_years')
+    year = models.IntegerField(validators=[MinValueValidator(1800), MaxValueValidator(2100)])
+    jan = models.FloatField(null=True, blank=True)
+    feb = models.FloatField(null=True, blank=True)
+    mar = models.FloatField(null=True, blank=True)
+    apr = models.FloatField(null=True, blank=True)
+    may = models.FloatField(null=True, blank=True)
+    jun = models.FloatField(null=True, blank=True)
+    jul = models.FloatField(null=True, blank=True)
+    aug = models.FloatField(null=True, blank=True)
+    sep = models.FloatField(null=True, blank=True)
+    oct = models.FloatField(null=True, blank=True)
+    nov = models.FloatField(null=True, blank=True)
+    dec = models.FloatField(null=True, blank=True)
+    win = models.FloatField(null=True, blank=True, help_text="Winter (Dec-Feb)")
+    spr = models.FloatField(null=True, blank=True, help_text="Spring (Mar-May)")
+    sum = models.FloatField(null=True, blank=True, help_text="Summer (Jun-Aug)")
+    aut = models.FloatField(null=True, blank=True, help_text="Autumn (Sep-Nov)")
+    ann = models.FloatField(null=True, blank=True, help_text="Annual")
+    
+    def __str__(self):
+        return f"{self.region.code} - {self.parameter.code} - {self.year}"
+    
+    class Meta:
+        ordering = ['-year']
+        # The unique constraint's index doubles as the series lookup index
+        unique_together = ['region', 'parameter', 'year']
@@ -120,6 +120,7 @@ if [ "$DEPLOYMENT_MODE" == "API" ]; then
     echo "Starting Gunicorn..."
     cd $PROJECT_ROOT_DIR
     exec gunicorn \
+        --config python:config.gunicorn \
         --bind 0.0.0.0:$PORT \
         --workers $GUNICORN_WORKERS \
         --threads $GUNICORN_THREADS_PER_WORKER \
@@ -145,6 +146,7 @@ if [ "$DEPLOYMENT_MODE" == "FULL" ]; then
 
     echo "Starting Gunicorn..."
     exec gunicorn \
+        --config python:config.gunicorn \
         --bind 0.0.0.0:$PORT \
         --workers $GUNICORN_WORKERS \
         --threads $GUNICORN_THREADS_PER_WORKER \
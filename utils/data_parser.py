@@ -1,16 +1,129 @@
+import numpy as np
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
 import re
 import io
+import mmap
+import os
 import time
 import logging
 from typing import Dict, List, Tuple, Optional
 from django.conf import settings
-from db.models import Region, Parameter, WeatherData
+from django.db import transaction
+from db.models import Region, Parameter, WeatherData, SeriesStatistics
+from utils.http_cache import HTTPFileCache
+from utils.dataset_stats import refresh_series_statistics
+from utils.series_cache import bump_series_version
+from utils.pg_loader import copy_load_available, copy_upsert
+from utils import metrics
 
 
 logger = logging.getLogger(__name__)
 
+# Column layout of the MetOffice data section
+MONTHLY_COLUMNS = ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec')
+PERIOD_COLUMNS = ('ann', 'win', 'spr', 'sum', 'aut')
+COLUMN_NAMES = ['year', *MONTHLY_COLUMNS, 'win', 'spr', 'sum', 'aut', 'ann']
+
+# Period types in output order; the columnar 'period_type' array holds indexes into this tuple
+PERIOD_TYPES = ('monthly', *PERIOD_COLUMNS)
+
+# Value columns of the wide WeatherYear layout, in data file order
+WIDE_COLUMNS = tuple(COLUMN_NAMES[1:])
+
+# WIDE_COLUMNS index of each non-monthly PERIOD_TYPES index (monthly points use month - 1)
+PERIOD_WIDE_INDEX = np.array([-1] + [WIDE_COLUMNS.index(code) for code in PERIOD_COLUMNS], dtype=np.intp)
+
+
+def empty_columns() -> Dict[str, np.ndarray]:
+    """Return an empty set of parsed columns"""
+    return {
+        'year': np.empty(0, dtype=np.int32),
+        'period_type': np.empty(0, dtype=np.int8),
+        'month': np.empty(0, dtype=np.int8),
+        'value': np.empty(0, dtype=np.float64),
+    }
+
+
+def parse_baseline(baseline: str) -> Tuple[int, int]:
+    """
+    Parse a baseline period such as '1961-1990' into inclusive (start_year, end_year).
+    
+    Raises:
+        ValueError: If the period is malformed or ends before it starts
+    """
+    match = re.fullmatch(r'\s*(\d{4})\s*-\s*(\d{4})\s*', baseline or '')
+    if not match or int(match.group(1)) > int(match.group(2)):
+        raise ValueError(f"Invalid anomaly baseline '{baseline}', expected START-END years such as 1991-2020")
+    return int(match.group(1)), int(match.group(2))
+
+
+def compute_anomalies(columns: Dict[str, np.ndarray], baseline: Optional[Tuple[int, int]] = None) -> np.ndarray:
+    """
+    Compute the anomaly of every point of a series against its baseline climatology.
+    
+    The climatology is the mean over the baseline years of each month, season and the
+    annual value, computed for the whole series in one vectorized pass. Points whose
+    month or season has no value in the baseline get NaN.
+    
+    Args:
+        columns: Parallel 'year', 'period_type' (PERIOD_TYPES indexes), 'month' (0 if not
+            monthly) and 'value' arrays, as returned by parse_data_columns
+        baseline: Inclusive (start_year, end_year); defaults to settings.ANOMALY_BASELINE
+        
+    Returns:
+        float64 array of anomalies rounded to 2 decimals, NaN where unavailable
+    """
+    start_year, end_year = baseline or parse_baseline(settings.ANOMALY_BASELINE)
+    values = np.asarray(columns['value'], dtype=np.float64)
+    
+    # One climatology slot per (period type, month); month is 0 for seasons and annual
+    slots = np.asarray(columns['period_type'], dtype=np.intp) * 13 + np.asarray(columns['month'], dtype=np.intp)
+    n_slots = len(PERIOD_TYPES) * 13
+    years = np.asarray(columns['year'])
+    in_baseline = (years >= start_year) & (years <= end_year) & ~np.isnan(values)
+    
+    sums = np.bincount(slots[in_baseline], weights=values[in_baseline], minlength=n_slots)
+    counts = np.bincount(slots[in_baseline], minlength=n_slots)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        climatology = np.where(counts > 0, sums / counts, np.nan)
+    # Adding 0.0 turns the -0.0 that rounding can produce into 0.0
+    return np.round(values - climatology[slots], 2) + 0.0
+
+
+def columns_to_wide(columns: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pivot parsed columns into one row per year with a value per WIDE_COLUMNS entry.
+    
+    Returns:
+        A tuple of the sorted distinct years and a (years x WIDE_COLUMNS) float64 matrix,
+        NaN where the year has no value for that month or period
+    """
+    years, rows = np.unique(np.asarray(columns['year']), return_inverse=True)
+    period_types = np.asarray(columns['period_type'], dtype=np.intp)
+    slots = np.where(period_types == 0, np.asarray(columns['month'], dtype=np.intp) - 1, PERIOD_WIDE_INDEX[period_types])
+    matrix = np.full((len(years), len(WIDE_COLUMNS)), np.nan)
+    matrix[rows, slots] = columns['value']
+    return years, matrix
+
+
+def wide_to_columns(years: np.ndarray, matrix: np.ndarray) -> Dict[str, np.ndarray]:
+    """Unpivot a (years x WIDE_COLUMNS) matrix back into parsed columns, dropping NaNs."""
+    n_monthly = len(MONTHLY_COLUMNS)
+    slot_period_types = np.array(
+        [0] * n_monthly + [PERIOD_TYPES.index(code) for code in WIDE_COLUMNS[n_monthly:]], dtype=np.int8
+    )
+    slot_months = np.array(list(range(1, n_monthly + 1)) + [0] * (len(WIDE_COLUMNS) - n_monthly), dtype=np.int8)
+    present = ~np.isnan(matrix)
+    rows, slots = np.nonzero(present)
+    return {
+        'year': np.asarray(years, dtype=np.int32)[rows],
+        'period_type': slot_period_types[slots],
+        'month': slot_months[slots],
+        'value': matrix[present],
+    }
+
 
 class MetOfficeParser:
     """
@@ -20,26 +133,52 @@ class MetOfficeParser:
     and converting them to structured data for storage in the database.
     """
     
-    def __init__(self, max_retries=3, retry_delay=1):
+    # Columns that identify a single data point (mirrors WeatherData.Meta.unique_together)
+    UNIQUE_FIELDS = ['region', 'parameter', 'year', 'period_type', 'month']
+
+    def __init__(self, max_retries=3, retry_delay=1, batch_size=None, pool_size=10, cache_dir=None):
         self.base_url = settings.METOFFICE_BASE_URL
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self.batch_size = batch_size or settings.METOFFICE_IMPORT_BATCH_SIZE
+        self.timeout = settings.METOFFICE_REQUEST_TIMEOUT
+        
+        # Downloaded files are cached on disk for conditional GETs; an empty directory disables it
+        cache_dir = settings.METOFFICE_CACHE_DIR if cache_dir is None else cache_dir
+        self.cache = HTTPFileCache(cache_dir) if cache_dir else None
+        
+        # Share one pooled session so repeated fetches reuse TCP/TLS connections
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+    
+    def build_url(self, parameter_code: str, region_code: str) -> str:
+        """Return the URL of the MetOffice data file for a parameter and region."""
+        return f"{self.base_url}{parameter_code}/date/{region_code}.txt"
+    
+    def retry_wait_time(self, attempt: int) -> float:
+        """Return the exponential backoff delay after the given (1-based) failed attempt."""
+        return self.retry_delay * (2 ** (attempt - 1))
     
-    def fetch_data(self, parameter_code: str, region_code: str) -> str:
+    def fetch_data(self, parameter_code: str, region_code: str, only_if_changed: bool = False) -> Optional[str]:
         """
         Fetch data from the MetOffice website for a given parameter and region.
         
         Args:
             parameter_code: The code for the parameter (e.g., 'Tmax')
             region_code: The code for the region (e.g., 'UK')
+            only_if_changed: Return None instead of the content when the file is
+                unchanged since it was last imported (see mark_imported)
             
         Returns:
-            The text content of the file
+            The text content of the file, or None if only_if_changed is set and
+            the file has not changed
             
         Raises:
             requests.RequestException: If the request fails after all retries
         """
-        url = f"{self.base_url}{parameter_code}/date/{region_code}.txt"
+        url = self.build_url(parameter_code, region_code)
         
         # Print for debugging
         print(f"Attempting to fetch data from: {url}")
@@ -50,33 +189,14 @@ class MetOfficeParser:
         while retries < self.max_retries:
             try:
                 print(f"Fetching data from {url} (attempt {retries + 1}/{self.max_retries})")
-                response = requests.get(url)
-                
-                # Print status code for debugging
-                print(f"Response status code: {response.status_code}")
-                
-                # If it's a 404, we'll check if the response contains useful content anyway
-                if response.status_code == 404:
-                    print(f"Got 404 for {url}, but checking if response has content...")
-                    if len(response.text) > 100:  # If it has substantial content
-                        print(f"Response has content despite 404, proceeding with content...")
-                        return response.text
-                    else:
-                        print(f"Response has no usable content. Content preview: {response.text[:100]}")
-                
-                response.raise_for_status()  # Raise an exception for HTTP errors
-                
-                # Print content preview for debugging
-                content_preview = response.text[:200] + "..." if len(response.text) > 200 else response.text
-                print(f"Successfully fetched data. Content preview: {content_preview}")
-                
-                return response.text
+                return self.fetch_once(parameter_code, region_code, only_if_changed=only_if_changed)
             except requests.RequestException as e:
                 last_exception = e
                 retries += 1
                 print(f"Request failed: {str(e)}")
                 if retries < self.max_retries:
-                    wait_time = self.retry_delay * (2 ** (retries - 1))  # Exponential backoff
+                    metrics.inc('metoffice_fetch_retries_total', parameter=parameter_code, region=region_code)
+                    wait_time = self.retry_wait_time(retries)  # Exponential backoff
                     print(f"Retrying in {wait_time} seconds...")
                     time.sleep(wait_time)
                 else:
@@ -89,6 +209,147 @@ class MetOfficeParser:
         # Fallback error in case no exception was captured
         raise requests.RequestException(f"Failed to fetch data from {url} after {self.max_retries} attempts")
     
+    def fetch_once(self, parameter_code: str, region_code: str, only_if_changed: bool = False) -> Optional[str]:
+        """
+        Make a single attempt to fetch the data file for a given parameter and region.
+        
+        When the cache is enabled the request is sent as a conditional GET, and a
+        304 Not Modified response is answered from the cached copy.
+        
+        Args:
+            parameter_code: The code for the parameter (e.g., 'Tmax')
+            region_code: The code for the region (e.g., 'UK')
+            only_if_changed: Return None instead of the content when the file is
+                unchanged since it was last imported
+            
+        Returns:
+            The text content of the file, or None if only_if_changed is set and
+            the file has not changed
+            
+        Raises:
+            requests.RequestException: If the request fails
+        """
+        url = self.build_url(parameter_code, region_code)
+        entry = self.cache.get(url) if self.cache else None
+        headers = HTTPFileCache.conditional_headers(entry)
+        started = time.perf_counter()
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        metrics.observe('metoffice_import_duration_seconds', time.perf_counter() - started, stage='fetch', parameter=parameter_code, region=region_code)
+        metrics.inc('metoffice_download_bytes_total', len(response.content), parameter=parameter_code, region=region_code)
+        
+        # Print status code for debugging
+        print(f"Response status code: {response.status_code}")
+        
+        if response.status_code == 304 and entry is not None:
+            print(f"{url} not modified, using cached copy")
+        else:
+            # If it's a 404, we'll check if the response contains useful content anyway
+            if response.status_code == 404:
+                print(f"Got 404 for {url}, but checking if response has content...")
+                if len(response.text) > 100:  # If it has substantial content
+                    print(f"Response has content despite 404, proceeding with content...")
+                    return response.text
+                else:
+                    print(f"Response has no usable content. Content preview: {response.text[:100]}")
+            
+            response.raise_for_status()  # Raise an exception for HTTP errors
+            
+            # Print content preview for debugging
+            content_preview = response.text[:200] + "..." if len(response.text) > 200 else response.text
+            print(f"Successfully fetched data. Content preview: {content_preview}")
+            
+            if self.cache is None:
+                return response.text
+            entry = self.cache.store(
+                url,
+                response.text,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified'),
+            )
+        
+        # A 304 or a byte-identical body means there is nothing new to parse and save,
+        # provided this database holds the series imported from that same body
+        if only_if_changed and entry['hash'] == self.imported_hash(parameter_code, region_code):
+            print(f"{url} unchanged since the last import, skipping")
+            return None
+        
+        return entry['body']
+    
+    @staticmethod
+    def discover_local_files(source_dir: str) -> List[Tuple[str, str, str]]:
+        """
+        Find MetOffice data files in a local mirror laid out like the website.
+        
+        Files are expected at <source_dir>/<parameter>/date/<region>.txt, the same
+        relative path build_url uses under METOFFICE_BASE_URL.
+        
+        Args:
+            source_dir: Root directory of the mirror
+            
+        Returns:
+            Sorted list of (parameter_code, region_code, path) tuples
+        """
+        files = []
+        for parameter_code in sorted(os.listdir(source_dir)):
+            date_dir = os.path.join(source_dir, parameter_code, 'date')
+            if not os.path.isdir(date_dir):
+                continue
+            for filename in sorted(os.listdir(date_dir)):
+                region_code, extension = os.path.splitext(filename)
+                if extension == '.txt':
+                    files.append((parameter_code, region_code, os.path.join(date_dir, filename)))
+        return files
+    
+    @staticmethod
+    def read_local_file(path: str) -> str:
+        """
+        Read a local MetOffice data file through a read-only memory map.
+        
+        The text is decoded straight from the mapped pages, without an intermediate
+        buffered read.
+        """
+        with open(path, 'rb') as handle:
+            if os.fstat(handle.fileno()).st_size == 0:
+                return ''
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return str(mapped, 'utf-8', 'replace')
+    
+    def imported_hash(self, parameter_code: str, region_code: str) -> Optional[str]:
+        """
+        Return the hash of the file the series was last imported from, or None if the
+        series has no data in the database or was written since by something else.
+        """
+        return self.imported_hashes([(parameter_code, region_code)])[(parameter_code, region_code)]
+    
+    @staticmethod
+    def imported_hashes(series: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Optional[str]]:
+        """
+        Return imported_hash for many (parameter_code, region_code) pairs with one query.
+        """
+        hashes = {pair: set() for pair in series}
+        rows = SeriesStatistics.objects.filter(
+            parameter__code__in={parameter_code for parameter_code, _ in series},
+            region__code__in={region_code for _, region_code in series},
+        ).values_list('parameter__code', 'region__code', 'source_hash')
+        for parameter_code, region_code, source_hash in rows:
+            if (parameter_code, region_code) in hashes:
+                hashes[(parameter_code, region_code)].add(source_hash)
+        return {pair: (values.pop() or None) if len(values) == 1 else None for pair, values in hashes.items()}
+    
+    def mark_imported(self, parameter_code: str, region_code: str) -> None:
+        """
+        Record on the series' summary rows that the last fetched file for a parameter and
+        region has been saved, so later fetches with only_if_changed can skip it until it
+        changes or the series is rewritten.
+        """
+        if self.cache is None:
+            return
+        entry = self.cache.get(self.build_url(parameter_code, region_code))
+        if entry is not None:
+            SeriesStatistics.objects.filter(region__code=region_code, parameter__code=parameter_code).update(
+                source_hash=entry['hash']
+            )
+    
     def parse_data(self, content: str) -> Tuple[Dict, List[Dict]]:
         """
         Parse the content of a MetOffice data file.
@@ -101,6 +362,26 @@ class MetOfficeParser:
             - metadata: Dictionary with metadata about the dataset
             - data: List of dictionaries with the parsed data points
         """
+        metadata, columns = self.parse_data_columns(content)
+        data = self.columns_to_records(columns)
+        print(f"Number of parsed data records: {len(data)}")
+        if data:
+            print(f"First parsed record: {data[0]}")
+        
+        return metadata, data
+    
+    def parse_data_columns(self, content: str) -> Tuple[Dict, Dict[str, np.ndarray]]:
+        """
+        Parse the content of a MetOffice data file into columnar arrays.
+        
+        Args:
+            content: The text content of the file
+            
+        Returns:
+            A tuple containing:
+            - metadata: Dictionary with metadata about the dataset
+            - columns: Dictionary of parallel numpy arrays (see _parse_data_columns)
+        """
         # Print for debugging
         print(f"Content length: {len(content)}")
         print(f"Content preview: {content[:500]}...")
@@ -136,12 +417,10 @@ class MetOfficeParser:
                 print(f"Second data line: {data_lines[1]}")
         
         # Process the data using pandas for better handling
-        data = self._parse_data_with_pandas('\n'.join(data_lines))
-        print(f"Number of parsed data records: {len(data)}")
-        if data:
-            print(f"First parsed record: {data[0]}")
+        columns = self._parse_data_columns('\n'.join(data_lines))
+        print(f"Number of parsed data points: {len(columns['value'])}")
         
-        return metadata, data
+        return metadata, columns
     
     def _parse_metadata(self, lines: List[str]) -> Dict:
         """Extract metadata from the header lines."""
@@ -204,7 +483,9 @@ class MetOfficeParser:
     
     def _parse_data_with_pandas(self, data_text: str) -> List[Dict]:
         """
-        Parse the data section using pandas for better handling of the fixed-width format.
+        Parse the data section into a list of data point dictionaries.
+        
+        Thin adapter over _parse_data_columns for callers that need one dict per value.
         
         Args:
             data_text: The text containing just the data rows
@@ -212,18 +493,33 @@ class MetOfficeParser:
         Returns:
             List of dictionaries with the parsed data points
         """
+        return self.columns_to_records(self._parse_data_columns(data_text))
+    
+    def _parse_data_columns(self, data_text: str) -> Dict[str, np.ndarray]:
+        """
+        Parse the data section using pandas for better handling of the fixed-width format.
+        
+        The wide year x period table is reshaped to long form in a single vectorized pass.
+        Monthly points come first (ordered by year, then month), followed by the annual
+        and seasonal points (ordered by period, then year). Missing values are dropped.
+        
+        Args:
+            data_text: The text containing just the data rows
+            
+        Returns:
+            Dictionary of parallel numpy arrays:
+            - year: int32 years
+            - period_type: int8 indexes into PERIOD_TYPES
+            - month: int8 month numbers, 0 where the point is not monthly
+            - value: float64 values
+        """
         print(f"Data text preview to parse: '{data_text[:200]}'")
         
         try:
             # For MetOffice data, we need to handle the fixed format specially
             lines = data_text.strip().split('\n')
             
-            # Define the expected column names for MetOffice data
-            column_names = ['year', 'jan', 'feb', 'mar', 'apr', 'may', 'jun', 
-                           'jul', 'aug', 'sep', 'oct', 'nov', 'dec', 'win', 
-                           'spr', 'sum', 'aut', 'ann']
-            
-            print(f"Using column names: {column_names}")
+            print(f"Using column names: {COLUMN_NAMES}")
             
             # Create a list to hold the processed rows
             rows = []
@@ -233,99 +529,109 @@ class MetOfficeParser:
                 parts = line.strip().split()
                 if len(parts) > 0 and parts[0].isdigit():  # Check if first item is a year
                     # Ensure we have enough columns
-                    while len(parts) < len(column_names):
+                    while len(parts) < len(COLUMN_NAMES):
                         parts.append('---')  # Pad with missing value markers
                     
                     # Truncate if we have too many columns
-                    if len(parts) > len(column_names):
-                        parts = parts[:len(column_names)]
+                    if len(parts) > len(COLUMN_NAMES):
+                        parts = parts[:len(COLUMN_NAMES)]
                     
                     rows.append(parts)
             
-            # Create a DataFrame from the processed rows
-            if rows:
-                df = pd.DataFrame(rows, columns=column_names)
-                
-                # Convert to numeric values, coercing errors to NaN
-                for col in df.columns:
-                    if col != 'year':  # Skip the year column
-                        df[col] = pd.to_numeric(df[col], errors='coerce')
-                
-                print(f"DataFrame shape: {df.shape}")
-                print("First 3 rows:")
-                print(df.head(3))
-                
-                # Initialize our result list
-                formatted_result = []
-                
-                # Process monthly data
-                monthly_columns = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 
-                                 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
-                
-                # Map month names to numbers
-                month_map = {
-                    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
-                    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
-                }
-                
-                # Process monthly data
-                monthly_count = 0
-                for _, row in df.iterrows():
-                    year = int(row['year'])
-                    for month in monthly_columns:
-                        if pd.notna(row[month]):
-                            formatted_result.append({
-                                'year': year,
-                                'period_type': 'monthly',
-                                'month': month_map[month],
-                                'value': float(row[month])
-                            })
-                            monthly_count += 1
-                
-                print(f"Processed {monthly_count} monthly records")
-                
-                # Process annual data if available
-                annual_count = 0
-                for _, row in df.iterrows():
-                    if pd.notna(row['ann']):
-                        formatted_result.append({
-                            'year': int(row['year']),
-                            'period_type': 'ann',
-                            'month': None,
-                            'value': float(row['ann'])
-                        })
-                        annual_count += 1
-                
-                print(f"Processed {annual_count} annual records")
-                
-                # Process seasonal data
-                seasonal_columns = {'win': 'win', 'spr': 'spr', 'sum': 'sum', 'aut': 'aut'}
-                seasonal_count = 0
-                
-                for season, code in seasonal_columns.items():
-                    for _, row in df.iterrows():
-                        if pd.notna(row[season]):
-                            formatted_result.append({
-                                'year': int(row['year']),
-                                'period_type': code,
-                                'month': None,
-                                'value': float(row[season])
-                            })
-                            seasonal_count += 1
-                
-                print(f"Processed {seasonal_count} seasonal records")
-                print(f"Total records processed: {len(formatted_result)}")
-                return formatted_result
-            else:
+            if not rows:
                 print("No valid data rows found")
-                return []
+                return empty_columns()
+            
+            # Create a DataFrame from the processed rows and convert to numeric values,
+            # coercing missing value markers to NaN
+            df = pd.DataFrame(rows, columns=COLUMN_NAMES)
+            years = df['year'].to_numpy(dtype=np.int32)
+            values = df[list(MONTHLY_COLUMNS)].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+            period_values = df[list(PERIOD_COLUMNS)].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+            
+            print(f"DataFrame shape: {df.shape}")
+            
+            n_years = len(years)
+            n_months = len(MONTHLY_COLUMNS)
+            n_periods = len(PERIOD_COLUMNS)
+            
+            # Monthly block is year-major (C order), period block is period-major (F order)
+            columns = {
+                'year': np.concatenate([
+                    np.repeat(years, n_months),
+                    np.tile(years, n_periods),
+                ]),
+                'period_type': np.concatenate([
+                    np.full(n_years * n_months, PERIOD_TYPES.index('monthly'), dtype=np.int8),
+                    np.repeat(
+                        np.array([PERIOD_TYPES.index(code) for code in PERIOD_COLUMNS], dtype=np.int8), n_years
+                    ),
+                ]),
+                'month': np.concatenate([
+                    np.tile(np.arange(1, n_months + 1, dtype=np.int8), n_years),
+                    np.zeros(n_years * n_periods, dtype=np.int8),
+                ]),
+                'value': np.concatenate([
+                    values.ravel(order='C'),
+                    period_values.ravel(order='F'),
+                ]),
+            }
+            
+            # Drop missing values from every column at once
+            mask = ~np.isnan(columns['value'])
+            columns = {name: column[mask] for name, column in columns.items()}
+            
+            monthly_count = int(np.count_nonzero(columns['month']))
+            annual_count = int(np.count_nonzero(columns['period_type'] == PERIOD_TYPES.index('ann')))
+            print(f"Processed {monthly_count} monthly records")
+            print(f"Processed {annual_count} annual records")
+            print(f"Processed {len(columns['value']) - monthly_count - annual_count} seasonal records")
+            print(f"Total records processed: {len(columns['value'])}")
+            return columns
                 
         except Exception as e:
             print(f"Error parsing data with pandas: {str(e)}")
             import traceback
             traceback.print_exc()
-            # Return empty list on error
-            return []
+            # Return empty columns on error
+            return empty_columns()
+    
+    @staticmethod
+    def columns_to_records(columns: Dict[str, np.ndarray]) -> List[Dict]:
+        """
+        Convert parsed columnar arrays into a list of data point dictionaries.
+        
+        Args:
+            columns: Dictionary of parallel numpy arrays as returned by _parse_data_columns
+            
+        Returns:
+            List of dictionaries with 'year', 'period_type', 'month' and 'value' keys
+        """
+        return [
+            {
+                'year': year,
+                'period_type': PERIOD_TYPES[period_code],
+                'month': month or None,
+                'value': value,
+            }
+            for year, period_code, month, value in zip(
+                columns['year'].tolist(),
+                columns['period_type'].tolist(),
+                columns['month'].tolist(),
+                columns['value'].tolist(),
+            )
+        ]
+    
+    @staticmethod
+    def records_to_columns(data: List[Dict]) -> Dict[str, np.ndarray]:
+        """Convert data point dictionaries back into parallel arrays (see columns_to_records)."""
+        period_codes = {code: index for index, code in enumerate(PERIOD_TYPES)}
+        return {
+            'year': np.array([item['year'] for item in data], dtype=np.int32),
+            'period_type': np.array([period_codes[item['period_type']] for item in data], dtype=np.int8),
+            'month': np.array([item['month'] or 0 for item in data], dtype=np.int8),
+            'value': np.array([item['value'] for item in data], dtype=np.float64),
+        }
     
     def save_to_database(self, parameter_code: str, region_code: str, metadata: Dict, data: List[Dict]) -> int:
         """
@@ -340,6 +646,177 @@ class MetOfficeParser:
         Returns:
             The number of records saved
         """
+        started = time.perf_counter()
+        region, parameter = self._get_series_objects(parameter_code, region_code, metadata)
+        
+        # Anomalies are computed for the whole series at once and written with the values
+        columns = self.records_to_columns(data)
+        anomalies = compute_anomalies(columns).tolist()
+        
+        # Build unsaved model instances for the whole series
+        rows = [
+            WeatherData(
+                region=region,
+                parameter=parameter,
+                year=item['year'],
+                period_type=item['period_type'],
+                month=item['month'],
+                value=item['value'],
+                anomaly=None if np.isnan(anomaly) else anomaly,
+            )
+            for item, anomaly in zip(data, anomalies)
+        ]
+        
+        # Write the whole series atomically in batched statements
+        with transaction.atomic():
+            self._bulk_upsert(region, parameter, rows)
+            refresh_series_statistics(region, parameter)
+            bump_series_version(region_code, parameter_code)
+        
+        # Count records by type for reporting
+        monthly_count = len([item for item in data if item['period_type'] == 'monthly'])
+        annual_count = len([item for item in data if item['period_type'] == 'ann'])
+        seasonal_count = len(data) - monthly_count - annual_count
+        
+        # Return total count
+        total_count = monthly_count + annual_count + seasonal_count
+        print(f"Successfully imported {total_count} records for {parameter_code} in {region_code} ({monthly_count} monthly, {annual_count} annual, {seasonal_count} seasonal)")
+        
+        metrics.observe('metoffice_import_duration_seconds', time.perf_counter() - started, stage='save', parameter=parameter_code, region=region_code)
+        metrics.inc('metoffice_rows_upserted_total', total_count, parameter=parameter_code, region=region_code)
+        return total_count
+    
+    def _bulk_upsert(self, region: Region, parameter: Parameter, rows: List[WeatherData]) -> None:
+        """
+        Insert or update the given rows of a single series in batches.
+        
+        Monthly rows are upserted with ``INSERT ... ON CONFLICT DO UPDATE`` keyed on the
+        unique_together columns. Seasonal and annual rows have a NULL month, and NULLs never
+        collide in a unique index, so those are matched against the existing rows of the
+        series in one query and split into a bulk update and a bulk insert instead.
+        
+        On PostgreSQL (unless METOFFICE_POSTGRES_COPY is off) all rows are COPYed into a
+        staging table and merged with a single statement instead, see utils.pg_loader.
+        
+        Args:
+            region: The region the rows belong to
+            parameter: The parameter the rows belong to
+            rows: Unsaved WeatherData instances for the series
+        """
+        if copy_load_available():
+            copy_upsert(rows)
+            return
+        
+        monthly_rows = [row for row in rows if row.month is not None]
+        period_rows = [row for row in rows if row.month is None]
+        
+        if monthly_rows:
+            WeatherData.objects.bulk_create(
+                monthly_rows,
+                batch_size=self.batch_size,
+                update_conflicts=True,
+                unique_fields=self.UNIQUE_FIELDS,
+                update_fields=['value', 'anomaly'],
+            )
+        
+        if period_rows:
+            existing_ids = {
+                (year, period_type): pk
+                for pk, year, period_type in WeatherData.objects.filter(
+                    region=region, parameter=parameter, month__isnull=True
+                ).values_list('id', 'year', 'period_type')
+            }
+            
+            to_update = []
+            to_create = []
+            for row in period_rows:
+                pk = existing_ids.get((row.year, row.period_type))
+                if pk is None:
+                    to_create.append(row)
+                else:
+                    row.pk = pk
+                    to_update.append(row)
+            
+            if to_update:
+                WeatherData.objects.bulk_update(to_update, ['value', 'anomaly'], batch_size=self.batch_size)
+            if to_create:
+                WeatherData.objects.bulk_create(to_create, batch_size=self.batch_size)
+    
+    def save_changes(self, parameter_code: str, region_code: str, metadata: Dict, columns: Dict[str, np.ndarray]) -> Dict[str, int]:
+        """
+        Save parsed data incrementally, writing only the rows that differ from the database.
+        
+        The existing values of the series are loaded in one query and diffed against the
+        parsed arrays. New points are inserted, changed values or anomalies updated and points
+        no longer present in the file deleted; identical rows are not touched.
+        
+        Args:
+            parameter_code: The code for the parameter
+            region_code: The code for the region
+            metadata: Dictionary with metadata about the dataset
+            columns: Dictionary of parallel numpy arrays as returned by parse_data_columns
+            
+        Returns:
+            Dictionary with the number of 'unchanged', 'inserted', 'updated' and 'deleted' rows
+        """
+        started = time.perf_counter()
+        region, parameter = self._get_series_objects(parameter_code, region_code, metadata)
+        anomalies = compute_anomalies(columns).tolist()
+        
+        with transaction.atomic():
+            # Map of (year, period_type, month) -> (id, value, anomaly) for the stored series
+            existing = {
+                (year, period_type, month): (pk, value, anomaly)
+                for pk, year, period_type, month, value, anomaly in WeatherData.objects.filter(
+                    region=region, parameter=parameter
+                ).values_list('id', 'year', 'period_type', 'month', 'value', 'anomaly')
+            }
+            
+            to_create = []
+            to_update = []
+            unchanged_count = 0
+            for item, anomaly in zip(self.columns_to_records(columns), anomalies):
+                item['anomaly'] = None if np.isnan(anomaly) else anomaly
+                key = (item['year'], item['period_type'], item['month'])
+                match = existing.pop(key, None)
+                if match is None:
+                    to_create.append(WeatherData(region=region, parameter=parameter, **item))
+                elif match[1:] != (item['value'], item['anomaly']):
+                    to_update.append(WeatherData(pk=match[0], value=item['value'], anomaly=item['anomaly']))
+                else:
+                    unchanged_count += 1
+            
+            # Whatever is left in the map is no longer present in the file
+            to_delete = [pk for pk, _, _ in existing.values()]
+            
+            if to_create:
+                WeatherData.objects.bulk_create(to_create, batch_size=self.batch_size)
+            if to_update:
+                WeatherData.objects.bulk_update(to_update, ['value', 'anomaly'], batch_size=self.batch_size)
+            for start in range(0, len(to_delete), self.batch_size):
+                WeatherData.objects.filter(id__in=to_delete[start:start + self.batch_size]).delete()
+            
+            # The import time is recorded even when nothing changed
+            refresh_series_statistics(region, parameter)
+            
+            # Only invalidate cached responses of the series if something was written
+            if to_create or to_update or to_delete:
+                bump_series_version(region_code, parameter_code)
+        
+        counts = {
+            'unchanged': unchanged_count,
+            'inserted': len(to_create),
+            'updated': len(to_update),
+            'deleted': len(to_delete),
+        }
+        print(f"Saved changes for {parameter_code} in {region_code}: {counts}")
+        
+        metrics.observe('metoffice_import_duration_seconds', time.perf_counter() - started, stage='save', parameter=parameter_code, region=region_code)
+        metrics.inc('metoffice_rows_upserted_total', counts['inserted'] + counts['updated'], parameter=parameter_code, region=region_code)
+        return counts
+    
+    def _get_series_objects(self, parameter_code: str, region_code: str, metadata: Dict) -> Tuple[Region, Parameter]:
+        """Get or create the region and parameter a series belongs to."""
         # Get or create the region
         region, _ = Region.objects.get_or_create(
             code=region_code,
@@ -354,34 +831,37 @@ class MetOfficeParser:
                 'unit': metadata.get('unit', '')
             }
         )
+        return region, parameter
+
+
+_local_parser = None
+
+
+def parse_local_file(path: str, as_columns: bool = False) -> Tuple[Dict, object, Dict[str, float]]:
+    """
+    Read and parse one local MetOffice file, for use in worker processes.
+    
+    Args:
+        path: Path of the data file
+        as_columns: Parse into columnar arrays (parse_data_columns) instead of records
         
-        # Count records by type for reporting
-        monthly_count = 0
-        annual_count = 0
-        seasonal_count = 0
-        
-        # Create or update the weather data records
-        for item in data:
-            # Create or update this record
-            weather_data, created = WeatherData.objects.update_or_create(
-                region=region,
-                parameter=parameter,
-                year=item['year'],
-                period_type=item['period_type'],
-                month=item['month'],
-                defaults={'value': item['value']}
-            )
-            
-            # Count by type
-            if item['period_type'] == 'monthly':
-                monthly_count += 1
-            elif item['period_type'] == 'ann':
-                annual_count += 1
-            else:
-                seasonal_count += 1
-        
-        # Return total count
-        total_count = monthly_count + annual_count + seasonal_count
-        print(f"Successfully imported {total_count} records for {parameter_code} in {region_code} ({monthly_count} monthly, {annual_count} annual, {seasonal_count} seasonal)")
-        
-        return total_count
\ No newline at end of file
+    Returns:
+        A tuple of the metadata, the parsed records or columns and the 'read' and
+        'parse' timings in seconds
+    """
+    global _local_parser
+    if _local_parser is None:
+        # Parsing never touches the network or the download cache
+        _local_parser = MetOfficeParser(cache_dir='')
+    
+    started = time.perf_counter()
+    content = MetOfficeParser.read_local_file(path)
+    timings = {'read': time.perf_counter() - started}
+    
+    started = time.perf_counter()
+    if as_columns:
+        metadata, data = _local_parser.parse_data_columns(content)
+    else:
+        metadata, data = _local_parser.parse_data(content)
+    timings['parse'] = time.perf_counter() - started
+    return metadata, data, timings
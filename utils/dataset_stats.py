@@ -0,0 +1,107 @@
+from typing import Dict
+
+from django.db import transaction
+from django.db.models import Count, Max, Min, Sum
+from django.utils import timezone
+
+from db.models import Region, Parameter, WeatherData, SeriesStatistics
+
+
+def refresh_series_statistics(region: Region, parameter: Parameter, imported: bool = True) -> None:
+    """
+    Recompute the summary rows of one series from its WeatherData rows.
+
+    Aggregates only the given series (one indexed query) and upserts one SeriesStatistics
+    row per period type, removing rows of period types the series no longer has. Call it
+    inside the transaction that wrote the series so the summary never disagrees with it.
+    The write clears source_hash, which MetOfficeParser.mark_imported sets again once an
+    import has saved the whole file.
+
+    Args:
+        region: The region of the series
+        parameter: The parameter of the series
+        imported: Whether the write was an import, which updates last_imported_at
+    """
+    now = timezone.now()
+    aggregates = (
+        WeatherData.objects.filter(region=region, parameter=parameter)
+        .order_by()
+        .values('period_type')
+        .annotate(row_count=Count('id'), min_year=Min('year'), max_year=Max('year'))
+    )
+    rows = [
+        SeriesStatistics(
+            region=region,
+            parameter=parameter,
+            period_type=aggregate['period_type'],
+            row_count=aggregate['row_count'],
+            min_year=aggregate['min_year'],
+            max_year=aggregate['max_year'],
+            last_imported_at=now if imported else None,
+            updated_at=now,
+        )
+        for aggregate in aggregates
+    ]
+
+    update_fields = ['row_count', 'min_year', 'max_year', 'source_hash', 'updated_at']
+    if imported:
+        update_fields.append('last_imported_at')
+
+    with transaction.atomic():
+        SeriesStatistics.objects.filter(region=region, parameter=parameter).exclude(
+            period_type__in=[row.period_type for row in rows]
+        ).delete()
+        if rows:
+            SeriesStatistics.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=['region', 'parameter', 'period_type'],
+                update_fields=update_fields,
+            )
+
+
+def refresh_all_statistics() -> int:
+    """
+    Rebuild the summary of every series from WeatherData, e.g. after a bulk load
+    that bypassed the import path.
+
+    Returns:
+        Number of series refreshed
+    """
+    series = set(WeatherData.objects.order_by().values_list('region_id', 'parameter_id').distinct())
+    summarised = set(SeriesStatistics.objects.order_by().values_list('region_id', 'parameter_id').distinct())
+    regions = Region.objects.in_bulk()
+    parameters = Parameter.objects.in_bulk()
+    with transaction.atomic():
+        for region_id, parameter_id in summarised - series:
+            SeriesStatistics.objects.filter(region_id=region_id, parameter_id=parameter_id).delete()
+        for region_id, parameter_id in series:
+            refresh_series_statistics(regions[region_id], parameters[parameter_id], imported=False)
+    return len(series)
+
+
+def get_dataset_summary() -> Dict:
+    """
+    Return dataset-wide statistics read from the precomputed summary table.
+
+    Returns:
+        Dictionary with 'regions_count', 'parameters_count', 'data_count', 'min_year',
+        'max_year', 'years_covered' and 'last_imported_at' (ISO 8601 or None)
+    """
+    summary = SeriesStatistics.objects.aggregate(
+        data_count=Sum('row_count'),
+        min_year=Min('min_year'),
+        max_year=Max('max_year'),
+        last_imported_at=Max('last_imported_at'),
+    )
+    min_year, max_year = summary['min_year'], summary['max_year']
+    last_imported_at = summary['last_imported_at']
+    return {
+        'regions_count': Region.objects.count(),
+        'parameters_count': Parameter.objects.count(),
+        'data_count': summary['data_count'] or 0,
+        'min_year': min_year,
+        'max_year': max_year,
+        'years_covered': max_year - min_year + 1 if min_year is not None else 0,
+        'last_imported_at': last_imported_at.isoformat() if last_imported_at else None,
+    }
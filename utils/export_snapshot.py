@@ -0,0 +1,153 @@
+import fcntl
+import gzip
+import hashlib
+import importlib.util
+import json
+import os
+import shutil
+import time
+from typing import Dict, Optional
+
+import numpy as np
+from django.conf import settings
+
+from db.models import WeatherData
+
+MANIFEST_NAME = 'manifest.json'
+
+# Downloadable artifacts: Parquet for analytics engines, and an uncompressed Arrow IPC file
+# clients can memory-map, stored alongside a gzipped copy for transfer
+ARTIFACTS = {
+    'parquet': {'extension': 'parquet', 'content_type': 'application/vnd.apache.parquet'},
+    'arrow': {'extension': 'arrow', 'content_type': 'application/vnd.apache.arrow.file'},
+}
+
+
+def arrow_available() -> bool:
+    """Whether pyarrow is installed, which export snapshots need."""
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def _dictionary(pa, values: list, index_type):
+    """Dictionary-encode a column of strings with the given index type."""
+    dictionary, indices = np.unique(np.array(values, dtype=object), return_inverse=True)
+    return pa.DictionaryArray.from_arrays(
+        pa.array(indices.astype(index_type)), pa.array(dictionary.tolist(), type=pa.string())
+    )
+
+
+def build_export_table():
+    """
+    Read every WeatherData row into a pyarrow Table with compact column types.
+
+    Region, parameter and period type codes are dictionary-encoded, year is int16, month
+    int8 (null for seasonal and annual points) and value and anomaly float32. Rows are
+    ordered by region, parameter, period type, year and month.
+    """
+    import pyarrow as pa
+
+    rows = list(
+        WeatherData.objects.order_by('region__code', 'parameter__code', 'period_type', 'year', 'month').values_list(
+            'region__code', 'parameter__code', 'year', 'period_type', 'month', 'value', 'anomaly'
+        )
+    )
+    region_codes, parameter_codes, years, period_types, months, values, anomalies = (
+        zip(*rows) if rows else ([],) * 7
+    )
+    return pa.table({
+        'region_code': _dictionary(pa, list(region_codes), np.int16),
+        'parameter_code': _dictionary(pa, list(parameter_codes), np.int8),
+        'year': pa.array(np.array(years, dtype=np.int16)),
+        'period_type': _dictionary(pa, list(period_types), np.int8),
+        'month': pa.array(list(months), type=pa.int8()),
+        'value': pa.array(np.array(values, dtype=np.float32)),
+        'anomaly': pa.array(list(anomalies), type=pa.float32()),
+    })
+
+
+def _publish(directory: str, artifact: str, tmp_path: str) -> Dict:
+    """Move a written artifact to its content-addressed name and describe it."""
+    digest = hashlib.sha256()
+    with open(tmp_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    sha256 = digest.hexdigest()
+    filename = f"weather-data-{sha256[:16]}.{ARTIFACTS[artifact]['extension']}"
+    os.replace(tmp_path, os.path.join(directory, filename))
+    return {'file': filename, 'sha256': sha256, 'size': os.path.getsize(os.path.join(directory, filename))}
+
+
+def build_export_snapshot(directory: Optional[str] = None) -> Optional[Dict]:
+    """
+    Write Parquet and Arrow IPC extracts of WeatherData for download.
+
+    Files are named after a hash of their content, and the Arrow file gets a gzipped
+    sibling so it can be served precompressed. The manifest naming the current files is
+    replaced atomically, then files of earlier snapshots are removed.
+
+    Args:
+        directory: Where to write the snapshot (defaults to settings.EXPORT_SNAPSHOT_DIR)
+
+    Returns:
+        The written manifest, or None if export snapshots are disabled
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    directory = settings.EXPORT_SNAPSHOT_DIR if directory is None else directory
+    if not directory:
+        return None
+    os.makedirs(directory, exist_ok=True)
+
+    # Serialise builders so one never removes files another is about to publish
+    with open(os.path.join(directory, '.lock'), 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+        table = build_export_table()
+        snapshot = f"{time.time_ns()}-{os.getpid()}"
+
+        parquet_path = os.path.join(directory, f"parquet-{snapshot}.tmp")
+        pq.write_table(table, parquet_path, compression='zstd')
+        # Uncompressed buffers keep the Arrow file memory-mappable; transfer is compressed by gzip instead
+        arrow_path = os.path.join(directory, f"arrow-{snapshot}.tmp")
+        feather.write_feather(table, arrow_path, compression='uncompressed')
+
+        artifacts = {
+            'parquet': _publish(directory, 'parquet', parquet_path),
+            'arrow': _publish(directory, 'arrow', arrow_path),
+        }
+        arrow_file = os.path.join(directory, artifacts['arrow']['file'])
+        gzip_path = os.path.join(directory, f"gzip-{snapshot}.tmp")
+        with open(arrow_file, 'rb') as source, gzip.open(gzip_path, 'wb', compresslevel=9) as target:
+            shutil.copyfileobj(source, target)
+        os.replace(gzip_path, f"{arrow_file}.gz")
+        artifacts['arrow']['gzip_file'] = f"{artifacts['arrow']['file']}.gz"
+
+        manifest = {'snapshot': snapshot, 'rows': table.num_rows, 'artifacts': artifacts}
+        tmp_path = os.path.join(directory, f"{MANIFEST_NAME}.{snapshot}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, os.path.join(directory, MANIFEST_NAME))
+
+        # Downloads already streaming an old file keep their open handle
+        current_files = {artifact['file'] for artifact in artifacts.values()} | {artifacts['arrow']['gzip_file']}
+        for filename in os.listdir(directory):
+            if filename.startswith('weather-data-') and filename not in current_files:
+                os.remove(os.path.join(directory, filename))
+
+    return manifest
+
+
+def get_export_manifest(directory: Optional[str] = None) -> Optional[Dict]:
+    """Return the manifest of the current export snapshot, or None if none has been built."""
+    directory = settings.EXPORT_SNAPSHOT_DIR if directory is None else directory
+    if not directory:
+        return None
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
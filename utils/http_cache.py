@@ -0,0 +1,86 @@
+import hashlib
+import json
+import os
+import tempfile
+from typing import Dict, Optional
+
+
+class HTTPFileCache:
+    """
+    On-disk cache of downloaded files keyed by URL.
+
+    Each entry keeps the response body together with its ETag, Last-Modified header and a
+    SHA-256 hash of the body, so a refresh can be sent as a conditional GET and a 304 (or
+    a 200 with an identical body) can be recognised as "nothing changed". Whether that body
+    has been imported is recorded in the database (SeriesStatistics.source_hash), not here,
+    so a cache kept across a fresh database never skips an import.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f"{key}.json"), os.path.join(self.directory, f"{key}.txt")
+
+    def _write_atomic(self, path: str, content: str) -> None:
+        # Write to a temporary file and rename so concurrent readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        Return the cached entry for a URL, or None if it is not cached.
+
+        The entry contains 'url', 'etag', 'last_modified', 'hash' and 'body'.
+        """
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                entry = json.load(f)
+            with open(body_path, encoding='utf-8') as f:
+                entry['body'] = f.read()
+        except (OSError, ValueError):
+            return None
+
+        # Ignore entries whose body no longer matches the recorded hash
+        if self.hash_content(entry['body']) != entry.get('hash'):
+            return None
+        return entry
+
+    def store(self, url: str, body: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> Dict:
+        """Store a freshly downloaded body and return the new entry."""
+        entry = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'hash': self.hash_content(body),
+        }
+        meta_path, body_path = self._paths(url)
+        self._write_atomic(body_path, body)
+        self._write_atomic(meta_path, json.dumps(entry))
+        entry['body'] = body
+        return entry
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict]) -> Dict[str, str]:
+        """Return the revalidation headers for a cached entry."""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    @staticmethod
+    def hash_content(body: str) -> str:
+        return hashlib.sha256(body.encode('utf-8')).hexdigest()
@@ -0,0 +1,236 @@
+import logging
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Tuple
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, close_old_connections, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from db.models import ImportJob
+from utils import metrics
+from utils.data_parser import MetOfficeParser
+from utils.export_snapshot import arrow_available, build_export_snapshot
+from utils.series_store import build_series_store
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_parser = None
+# Ids of the queued and running jobs this process owns and heart-beats
+_owned_jobs = set()
+_rebuild_timer = None
+_lock = threading.Lock()
+
+
+def start_import_workers() -> ThreadPoolExecutor:
+    """
+    Start this process's bounded pool of import workers and its job heartbeat, once.
+
+    Called by the gunicorn post_worker_init hook (config/gunicorn.py), so every worker
+    adopts jobs orphaned by a recycled or crashed worker, and lazily on the first enqueue.
+
+    Returns:
+        The import worker pool
+    """
+    global _executor, _parser
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.IMPORT_JOB_WORKERS, thread_name_prefix='import-job')
+            # One parser shared by every worker so downloads reuse its pooled HTTP session
+            _parser = MetOfficeParser(pool_size=max(settings.IMPORT_JOB_WORKERS, 10))
+            threading.Thread(target=_heartbeat_loop, name='import-job-heartbeat', daemon=True).start()
+        return _executor
+
+
+def _submit(job_id: int) -> None:
+    """Run a queued job on this process's workers, heart-beating it until it finishes."""
+    executor = start_import_workers()
+    with _lock:
+        _owned_jobs.add(job_id)
+    executor.submit(run_import_job, job_id)
+
+
+def _heartbeat_loop() -> None:
+    """
+    Every IMPORT_JOB_HEARTBEAT_INTERVAL seconds, refresh updated_at of the jobs this process
+    owns and adopt jobs whose owner stopped heart-beating. Runs for the life of the process.
+    """
+    while True:
+        try:
+            with _lock:
+                owned = list(_owned_jobs)
+            if owned:
+                ImportJob.objects.filter(id__in=owned, state__in=ImportJob.ACTIVE_STATES).update(updated_at=timezone.now())
+            recover_import_jobs()
+        except DatabaseError:
+            # E.g. SQLite locked by an import's write transaction; the next beat retries
+            logger.warning("Import job heartbeat failed", exc_info=True)
+        finally:
+            connection.close()
+        time.sleep(settings.IMPORT_JOB_HEARTBEAT_INTERVAL)
+
+
+def recover_import_jobs() -> int:
+    """
+    Requeue, on this process, the active jobs whose owner stopped heart-beating.
+
+    An owner stops when its worker is recycled (--max-requests) or crashes, leaving the job
+    queued or running forever and blocking new imports of the series. Each orphan is claimed
+    with a conditional update, so only one process adopts it. Jobs already started
+    IMPORT_JOB_MAX_ATTEMPTS times are failed instead, so a job that kills its worker is not
+    retried forever.
+
+    Returns:
+        Number of jobs requeued
+    """
+    now = timezone.now()
+    orphans = ImportJob.objects.filter(
+        state__in=ImportJob.ACTIVE_STATES,
+        updated_at__lt=now - timedelta(seconds=settings.IMPORT_JOB_STALE_AFTER),
+    )
+    orphans.filter(attempts__gte=settings.IMPORT_JOB_MAX_ATTEMPTS).update(
+        state=ImportJob.STATE_FAILED, finished_at=now, error="Abandoned by its worker"
+    )
+
+    requeued = 0
+    for job_id, updated_at in orphans.values_list('id', 'updated_at'):
+        claimed = ImportJob.objects.filter(
+            id=job_id, state__in=ImportJob.ACTIVE_STATES, updated_at=updated_at
+        ).update(state=ImportJob.STATE_QUEUED, updated_at=now)
+        if claimed:
+            logger.warning("Requeuing orphaned import job %s", job_id)
+            _submit(job_id)
+            requeued += 1
+    return requeued
+
+
+def enqueue_import(parameter_code: str, region_code: str) -> Tuple[ImportJob, bool]:
+    """
+    Queue a background import of one series, coalescing with an active job for the same series.
+
+    Args:
+        parameter_code: The code for the parameter (e.g., 'Tmax')
+        region_code: The code for the region (e.g., 'UK')
+
+    Returns:
+        A tuple of the job and whether a new job was created (False if an existing
+        queued or running job for the series was returned instead)
+    """
+    # Make sure this process heart-beats its jobs and adopts orphaned ones, such as an
+    # active job of this series left behind by a recycled worker
+    start_import_workers()
+    active_jobs = ImportJob.objects.filter(
+        parameter_code=parameter_code, region_code=region_code, state__in=ImportJob.ACTIVE_STATES
+    )
+
+    existing = active_jobs.first()
+    if existing is not None:
+        return existing, False
+
+    try:
+        with transaction.atomic():
+            job = ImportJob.objects.create(parameter_code=parameter_code, region_code=region_code)
+    except IntegrityError:
+        # Another request created the active job for this series in the meantime
+        existing = active_jobs.first()
+        if existing is None:
+            raise
+        return existing, False
+
+    transaction.on_commit(lambda: _submit(job.id))
+    return job, True
+
+
+def run_import_job(job_id: int) -> None:
+    """
+    Run a queued import job: fetch, parse and save its series, recording per-stage timings.
+
+    Runs on a worker thread, so it manages its own database connection.
+    """
+    close_old_connections()
+    try:
+        # Another process may have adopted the job if this one's heartbeat lapsed
+        started_at = timezone.now()
+        claimed = ImportJob.objects.filter(id=job_id, state=ImportJob.STATE_QUEUED).update(
+            state=ImportJob.STATE_RUNNING, started_at=started_at, updated_at=started_at, attempts=F('attempts') + 1
+        )
+        if not claimed:
+            return
+        job = ImportJob.objects.get(id=job_id)
+
+        timings = {}
+        try:
+            started = time.perf_counter()
+            content = _parser.fetch_data(job.parameter_code, job.region_code)
+            timings['fetch'] = round(time.perf_counter() - started, 3)
+
+            started = time.perf_counter()
+            metadata, data = _parser.parse_data(content)
+            timings['parse'] = round(time.perf_counter() - started, 3)
+            metrics.observe(
+                'metoffice_import_duration_seconds', timings['parse'],
+                stage='parse', parameter=job.parameter_code, region=job.region_code,
+            )
+
+            started = time.perf_counter()
+            job.records_written = _parser.save_to_database(job.parameter_code, job.region_code, metadata, data)
+            _parser.mark_imported(job.parameter_code, job.region_code)
+            timings['save'] = round(time.perf_counter() - started, 3)
+
+            job.state = ImportJob.STATE_SUCCEEDED
+        except Exception as e:
+            traceback.print_exc()
+            job.state = ImportJob.STATE_FAILED
+            job.error = str(e)
+
+        job.timings = timings
+        job.finished_at = timezone.now()
+        job.save()
+        
+        if job.state == ImportJob.STATE_SUCCEEDED:
+            _schedule_rebuild()
+    finally:
+        with _lock:
+            _owned_jobs.discard(job_id)
+        connection.close()
+
+
+def _schedule_rebuild() -> None:
+    """
+    Rebuild the series store and export snapshot IMPORT_JOB_REBUILD_DELAY seconds after
+    an import succeeds, off the import worker.
+
+    Jobs finishing within that window share one rebuild, so a burst of single-series imports
+    does not rebuild the whole dataset once per series. Until it runs, reads of the imported
+    series fall back to the database. A delay of 0 leaves rebuilding to the
+    build_series_store and build_export_snapshot commands.
+    """
+    global _rebuild_timer
+    if settings.IMPORT_JOB_REBUILD_DELAY <= 0:
+        return
+    with _lock:
+        if _rebuild_timer is None:
+            _rebuild_timer = threading.Timer(settings.IMPORT_JOB_REBUILD_DELAY, _rebuild_snapshots)
+            _rebuild_timer.daemon = True
+            _rebuild_timer.start()
+
+
+def _rebuild_snapshots() -> None:
+    """Rebuild the series store and export snapshot; runs on the rebuild timer's thread."""
+    global _rebuild_timer
+    with _lock:
+        # Imports finishing from here on schedule another rebuild
+        _rebuild_timer = None
+    try:
+        build_series_store()
+        if arrow_available():
+            build_export_snapshot()
+    except Exception:
+        logger.exception("Rebuilding snapshots after imports failed")
+    finally:
+        connection.close()
@@ -0,0 +1,221 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+
+import django
+import requests
+from django.db import connections
+
+from utils import metrics
+from utils.data_parser import MetOfficeParser, parse_local_file
+from utils.http_cache import HTTPFileCache
+
+logger = logging.getLogger(__name__)
+
+
+class ImportPipeline:
+    """
+    Concurrent fetch -> parse -> save pipeline for importing many MetOffice series.
+
+    Files are downloaded by a bounded pool of fetcher threads sharing the parser's pooled
+    HTTP session. Downloaded content is handed through queues to a single parse thread and
+    then to a single database writer, which runs on the calling thread so that all database
+    access goes through one connection; fetcher threads never touch the database.
+
+    A failed fetch is rescheduled on a timer instead of sleeping inside the worker, so a
+    file that is backing off never holds a pool slot the other files could use.
+
+    With only_if_changed set, series whose file is unchanged since the last import skip the
+    parse and save stages entirely; the hashes of the imported files are read from the
+    database once, before any fetch starts. With incremental set, series are saved with
+    MetOfficeParser.save_changes so only rows that differ from the database are written.
+
+    run_local imports a local mirror of the dataset instead, parsing files in worker
+    processes and saving them through the same writer.
+    """
+
+    def __init__(
+        self, parser: MetOfficeParser, concurrency: int = 4, only_if_changed: bool = False, incremental: bool = False
+    ):
+        self.parser = parser
+        self.concurrency = concurrency
+        self.only_if_changed = only_if_changed
+        self.incremental = incremental
+
+    def run(self, series: List[Tuple[str, str]], on_result: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """
+        Import every (parameter_code, region_code) pair in the given list.
+
+        Args:
+            series: The (parameter_code, region_code) pairs to import
+            on_result: Optional callback invoked on the calling thread as each series finishes
+
+        Returns:
+            One result dictionary per series, in completion order, with the keys
+            'parameter', 'region', 'records', 'data', 'counts', 'skipped', 'error' and 'timings'.
+            'data' holds parsed columns and 'counts' the save_changes counts in incremental
+            mode; otherwise 'data' is the list of parsed records and 'counts' is None
+        """
+        if not series:
+            return []
+
+        # Read on this thread, so the fetcher threads never open database connections
+        imported = {}
+        if self.only_if_changed and self.parser.cache is not None:
+            imported = self.parser.imported_hashes(series)
+
+        parse_queue = queue.Queue()
+        # Bounded so parsing cannot run arbitrarily far ahead of the database writer
+        write_queue = queue.Queue(maxsize=self.concurrency * 2)
+        executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='metoffice-fetch')
+
+        def resubmit(*args):
+            try:
+                executor.submit(fetch, *args)
+            except RuntimeError:
+                # The pipeline was shut down while this file was backing off
+                pass
+
+        def fetch(parameter_code, region_code, attempt, started):
+            try:
+                content = self.parser.fetch_once(parameter_code, region_code)
+            except Exception as e:
+                if attempt < self.parser.max_retries and self._is_retryable(e):
+                    metrics.inc('metoffice_fetch_retries_total', parameter=parameter_code, region=region_code)
+                    wait_time = self.parser.retry_wait_time(attempt)
+                    logger.warning(
+                        "Fetching %s/%s failed (%s), retrying in %s seconds", parameter_code, region_code, e, wait_time
+                    )
+                    timer = threading.Timer(
+                        wait_time, resubmit, args=(parameter_code, region_code, attempt + 1, started)
+                    )
+                    timer.daemon = True
+                    timer.start()
+                    return
+                parse_queue.put((parameter_code, region_code, None, e, {'fetch': time.perf_counter() - started}))
+                return
+            # A 304 or a byte-identical body of the file the series was imported from
+            imported_hash = imported.get((parameter_code, region_code))
+            if imported_hash is not None and HTTPFileCache.hash_content(content) == imported_hash:
+                logger.info("%s/%s unchanged since the last import, skipping", parameter_code, region_code)
+                content = None
+            parse_queue.put((parameter_code, region_code, content, None, {'fetch': time.perf_counter() - started}))
+
+        def parse():
+            for _ in range(len(series)):
+                parameter_code, region_code, content, error, timings = parse_queue.get()
+                metadata, data = {}, []
+                if error is None and content is not None:
+                    started = time.perf_counter()
+                    try:
+                        if self.incremental:
+                            metadata, data = self.parser.parse_data_columns(content)
+                        else:
+                            metadata, data = self.parser.parse_data(content)
+                    except Exception as e:
+                        error = e
+                    timings['parse'] = time.perf_counter() - started
+                write_queue.put((parameter_code, region_code, metadata, data, content is None, error, timings))
+
+        parse_thread = threading.Thread(target=parse, name='metoffice-parse', daemon=True)
+        parse_thread.start()
+        for parameter_code, region_code in series:
+            executor.submit(fetch, parameter_code, region_code, 1, time.perf_counter())
+
+        results = []
+        try:
+            for _ in range(len(series)):
+                result = self._save(*write_queue.get())
+                results.append(result)
+                if on_result:
+                    on_result(result)
+        finally:
+            # Every fetch has completed on the normal path; on error, drop whatever is still queued
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return results
+
+    def run_local(
+        self, files: List[Tuple[str, str, str]], on_result: Optional[Callable[[Dict], None]] = None
+    ) -> List[Dict]:
+        """
+        Import every (parameter_code, region_code, path) file of a local mirror.
+
+        Parsing is CPU-bound Python, so files are read and parsed by a pool of `concurrency`
+        worker processes while the calling thread saves each series as soon as it is parsed.
+        Local files have no download cache entry, so every file is imported.
+
+        Args:
+            files: The files to import, as returned by MetOfficeParser.discover_local_files
+            on_result: Optional callback invoked on the calling thread as each series finishes
+
+        Returns:
+            One result dictionary per series, in completion order, shaped like those of run
+        """
+        if not files:
+            return []
+
+        # Forked workers must not inherit open database connections
+        connections.close_all()
+        results = []
+        # Workers set up Django themselves where processes are spawned rather than forked
+        with ProcessPoolExecutor(max_workers=self.concurrency, initializer=django.setup) as executor:
+            futures = {
+                executor.submit(parse_local_file, path, self.incremental): (parameter_code, region_code)
+                for parameter_code, region_code, path in files
+            }
+            for future in as_completed(futures):
+                parameter_code, region_code = futures[future]
+                metadata, data, error, timings = {}, [], None, {}
+                try:
+                    metadata, data, timings = future.result()
+                except Exception as e:
+                    error = e
+                result = self._save(parameter_code, region_code, metadata, data, False, error, timings, mark=False)
+                results.append(result)
+                if on_result:
+                    on_result(result)
+
+        return results
+
+    def _save(
+        self, parameter_code: str, region_code: str, metadata: Dict, data, skipped: bool,
+        error: Optional[Exception], timings: Dict[str, float], mark: bool = True,
+    ) -> Dict:
+        """Save one parsed series on the calling thread and return its result dictionary."""
+        records = 0
+        counts = None
+        if 'parse' in timings:
+            metrics.observe('metoffice_import_duration_seconds', timings['parse'], stage='parse', parameter=parameter_code, region=region_code)
+        if error is None and not skipped:
+            started = time.perf_counter()
+            try:
+                if self.incremental:
+                    counts = self.parser.save_changes(parameter_code, region_code, metadata, data)
+                    records = counts['inserted'] + counts['updated'] + counts['unchanged']
+                else:
+                    records = self.parser.save_to_database(parameter_code, region_code, metadata, data)
+                if mark:
+                    self.parser.mark_imported(parameter_code, region_code)
+            except Exception as e:
+                error = e
+            timings['save'] = time.perf_counter() - started
+
+        return {
+            'parameter': parameter_code,
+            'region': region_code,
+            'records': records,
+            'data': data,
+            'counts': counts,
+            'skipped': skipped and error is None,
+            'error': error,
+            'timings': timings,
+        }
+
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        """Only network and HTTP errors are worth retrying, not programming errors."""
+        return isinstance(error, requests.RequestException)
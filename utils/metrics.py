@@ -0,0 +1,292 @@
+import atexit
+import bisect
+import fcntl
+import glob
+import hmac
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Tuple
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+
+# Upper bounds of the histogram buckets; every histogram also has a +Inf bucket
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+IMPORT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Every metric the service records: name -> (type, help, histogram buckets)
+METRICS = {
+    'http_request_duration_seconds': ('histogram', "API request latency by route", LATENCY_BUCKETS),
+    'http_response_size_bytes': ('histogram', "Size of non-streaming API responses by route", SIZE_BUCKETS),
+    'cache_requests_total': ('counter', "Lookups of the response, aggregate, trend and series store caches", None),
+    'metoffice_import_duration_seconds': ('histogram', "Fetch, parse and save duration per series", IMPORT_BUCKETS),
+    'metoffice_download_bytes_total': ('counter', "Bytes downloaded from the MetOffice", None),
+    'metoffice_fetch_retries_total': ('counter', "Retried MetOffice downloads", None),
+    'metoffice_rows_upserted_total': ('counter', "Weather data rows inserted or updated by imports", None),
+}
+
+AGGREGATE_NAME = 'aggregate.json'
+
+_local = threading.local()
+_shards = []
+_shards_lock = threading.Lock()
+_flusher = None
+_worker_name = None
+# Held while flushing; once retired, a process never writes its file again
+_flush_lock = threading.Lock()
+_retired = False
+
+
+def _shard() -> Dict:
+    """
+    Return the calling thread's private samples.
+
+    Each thread only ever writes its own shard, so recording needs no lock; shards are
+    merged when metrics are collected. The lock below is only taken once per thread.
+    """
+    shard = getattr(_local, 'shard', None)
+    if shard is None:
+        shard = _local.shard = {}
+        with _shards_lock:
+            _shards.append(shard)
+        _start_flusher()
+    return shard
+
+
+def _key(name: str, labels: Dict) -> Tuple:
+    return (name, tuple(sorted(labels.items())))
+
+
+def inc(name: str, value: float = 1, **labels) -> None:
+    """Add to a counter."""
+    shard = _shard()
+    key = _key(name, labels)
+    shard[key] = shard.get(key, 0) + value
+
+
+def observe(name: str, value: float, **labels) -> None:
+    """Record one observation in a histogram."""
+    shard = _shard()
+    key = _key(name, labels)
+    sample = shard.get(key)
+    if sample is None:
+        # Per-bucket counts (not cumulative) with the +Inf bucket last, then sum and count
+        sample = shard[key] = [0] * (len(METRICS[name][2]) + 1) + [0.0, 0]
+    buckets = METRICS[name][2]
+    sample[bisect.bisect_left(buckets, value)] += 1
+    sample[-2] += value
+    sample[-1] += 1
+
+
+def _merge(samples: Dict, key: Tuple, value) -> None:
+    current = samples.get(key)
+    if current is None:
+        samples[key] = list(value) if isinstance(value, list) else value
+    elif isinstance(value, list):
+        samples[key] = [a + b for a, b in zip(current, value)]
+    else:
+        samples[key] = current + value
+
+
+def process_samples() -> Dict:
+    """Merge the shards of every thread of this process."""
+    samples = {}
+    for shard in list(_shards):
+        # Copying the items is a single step under the GIL, so writers never break iteration
+        for key, value in list(shard.items()):
+            _merge(samples, key, value)
+    return samples
+
+
+def _worker_path() -> str:
+    """
+    Return this process's file in METRICS_DIR, named after its pid and start time so a
+    process that reuses the pid of an exited one never overwrites that one's samples.
+    """
+    global _worker_name
+    if _worker_name is None:
+        _worker_name = f"worker-{os.getpid()}-{time.time_ns()}.json"
+    return os.path.join(settings.METRICS_DIR, _worker_name)
+
+
+@contextmanager
+def _directory_lock(operation: int):
+    """Lock METRICS_DIR against retire_worker (LOCK_EX) or collect (LOCK_SH) in other processes."""
+    with open(os.path.join(settings.METRICS_DIR, '.lock'), 'w') as lock_file:
+        fcntl.flock(lock_file, operation)
+        yield
+
+
+def _read_samples(path: str) -> Dict:
+    with open(path) as f:
+        return {(name, tuple(tuple(label) for label in labels)): value for name, labels, value in json.load(f)}
+
+
+def _write_samples(path: str, samples: Dict) -> None:
+    with open(f"{path}.tmp", 'w') as f:
+        json.dump([[name, labels, value] for (name, labels), value in samples.items()], f)
+    os.replace(f"{path}.tmp", path)
+
+
+def flush(final: bool = False) -> None:
+    """
+    Write this process's samples to its per-worker file in METRICS_DIR.
+
+    Args:
+        final: Stop flushing after this write, before the file is retired at exit
+    """
+    global _retired
+    if not settings.METRICS_DIR:
+        return
+    with _flush_lock:
+        if _retired:
+            return
+        os.makedirs(settings.METRICS_DIR, exist_ok=True)
+        _write_samples(_worker_path(), process_samples())
+        _retired = final
+
+
+def retire_worker(pid: int) -> None:
+    """
+    Fold the samples of an exited process into METRICS_DIR's aggregate file and remove its file.
+
+    Runs for every process at exit and for gunicorn workers in the master's child_exit hook
+    (config/gunicorn.py), which also covers workers that were killed. METRICS_DIR so holds
+    one file per live process plus the aggregate, and counters never go backwards.
+
+    Args:
+        pid: Process id of the exited process
+    """
+    if not settings.METRICS_DIR or not os.path.isdir(settings.METRICS_DIR):
+        return
+    with _directory_lock(fcntl.LOCK_EX):
+        paths = glob.glob(os.path.join(settings.METRICS_DIR, f"worker-{pid}-*.json"))
+        if not paths:
+            return
+        aggregate_path = os.path.join(settings.METRICS_DIR, AGGREGATE_NAME)
+        samples = _read_samples(aggregate_path) if os.path.exists(aggregate_path) else {}
+        for path in paths:
+            try:
+                worker_samples = _read_samples(path)
+            except ValueError:
+                worker_samples = {}
+            for key, value in worker_samples.items():
+                _merge(samples, key, value)
+        _write_samples(aggregate_path, samples)
+        for path in paths:
+            os.remove(path)
+
+
+def _exit() -> None:
+    flush(final=True)
+    retire_worker(os.getpid())
+
+
+def _start_flusher() -> None:
+    """Start the background thread that periodically flushes this process's samples."""
+    global _flusher
+    with _shards_lock:
+        if _flusher is not None or not settings.METRICS_DIR:
+            return
+
+        def run():
+            while True:
+                time.sleep(settings.METRICS_FLUSH_INTERVAL)
+                try:
+                    flush()
+                except OSError:
+                    pass
+
+        _flusher = threading.Thread(target=run, name='metrics-flush', daemon=True)
+        _flusher.start()
+    atexit.register(_exit)
+
+
+def _reset_after_fork() -> None:
+    # A forked worker starts with empty samples of its own, its own file and its own flusher
+    global _local, _shards, _shards_lock, _flusher, _worker_name, _flush_lock, _retired
+    _local = threading.local()
+    _shards = []
+    _shards_lock = threading.Lock()
+    _flusher = None
+    _worker_name = None
+    _flush_lock = threading.Lock()
+    _retired = False
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def collect() -> Dict:
+    """
+    Merge the samples of every process: this process's live samples, the files the other
+    live processes flushed to METRICS_DIR and the aggregate of exited ones.
+    """
+    samples = process_samples()
+    if not settings.METRICS_DIR or not os.path.isdir(settings.METRICS_DIR):
+        return samples
+    own_name = _worker_name
+    # Shared lock, so a worker being retired is counted exactly once
+    with _directory_lock(fcntl.LOCK_SH):
+        for filename in os.listdir(settings.METRICS_DIR):
+            # Worker files and the aggregate; skips the lock and half-written .tmp files
+            if filename == own_name or not filename.endswith('.json'):
+                continue
+            try:
+                file_samples = _read_samples(os.path.join(settings.METRICS_DIR, filename))
+            except (OSError, ValueError):
+                continue
+            for key, value in file_samples.items():
+                _merge(samples, key, value)
+    return samples
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels, extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in labels]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def render_prometheus(samples: Dict) -> str:
+    """Render samples in the Prometheus text exposition format."""
+    lines = []
+    for name, (metric_type, help_text, buckets) in METRICS.items():
+        series = sorted((labels, value) for (sample_name, labels), value in samples.items() if sample_name == name)
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for labels, value in series:
+            if metric_type == 'counter':
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+                continue
+            cumulative = 0
+            for bound, count in zip((*buckets, '+Inf'), value[:-2]):
+                cumulative += count
+                le = f'le="{bound}"'
+                lines.append(f"{name}_bucket{_format_labels(labels, le)} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {value[-2]}")
+            lines.append(f"{name}_count{_format_labels(labels)} {value[-1]}")
+    return '\n'.join(lines) + '\n'
+
+
+def metrics_view(request):
+    """
+    Expose the metrics of every worker for Prometheus to scrape.
+
+    Requires an `Authorization: Bearer <METRICS_TOKEN>` header, and answers 404 while
+    METRICS_TOKEN is unset, so the endpoint is off unless a token is configured.
+    """
+    if not settings.METRICS_TOKEN:
+        raise Http404
+    scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+    if scheme.lower() != 'bearer' or not hmac.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+        return HttpResponse(status=401, headers={'WWW-Authenticate': 'Bearer'})
+    return HttpResponse(render_prometheus(collect()), content_type='text/plain; version=0.0.4; charset=utf-8')
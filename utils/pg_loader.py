@@ -0,0 +1,77 @@
+import csv
+import io
+import uuid
+from typing import List
+
+from django.conf import settings
+from django.db import connection
+
+from db.models import WeatherData
+
+# Unlogged table imports are COPYed into before the merge; created by migration 0005 on PostgreSQL
+STAGING_TABLE = 'db_weatherdata_staging'
+STAGING_COLUMNS = ['load_id', 'region_id', 'parameter_id', 'year', 'period_type', 'month', 'value', 'anomaly']
+
+# Expression unique index the merge's ON CONFLICT targets; unlike unique_together it treats
+# the NULL month of seasonal and annual rows as equal, so every row can be upserted at once;
+# built by migration 0010 on PostgreSQL
+MERGE_CONFLICT_TARGET = '(region_id, parameter_id, year, period_type, (COALESCE(month, 0)))'
+
+
+def copy_load_available() -> bool:
+    """Whether imports should use the PostgreSQL COPY load path."""
+    return connection.vendor == 'postgresql' and settings.METOFFICE_POSTGRES_COPY
+
+
+def _copy_from(cursor, sql: str, buffer: io.StringIO) -> None:
+    # Django wraps the driver cursor; psycopg2 exposes copy_expert and psycopg 3 copy()
+    raw_cursor = cursor.cursor
+    if hasattr(raw_cursor, 'copy_expert'):
+        raw_cursor.copy_expert(sql, buffer)
+    else:
+        with raw_cursor.copy(sql) as copy:
+            copy.write(buffer.getvalue())
+
+
+def copy_upsert(rows: List[WeatherData]) -> int:
+    """
+    Upsert WeatherData rows with COPY into the unlogged staging table and one
+    INSERT ... ON CONFLICT DO UPDATE merge.
+
+    Rows are tagged with a load id, so concurrent imports share the staging table without
+    seeing each other's rows. Rows whose value and anomaly are unchanged are not rewritten.
+    Must run inside the import's transaction.
+
+    Args:
+        rows: Unsaved WeatherData instances with region_id and parameter_id set
+
+    Returns:
+        The number of rows inserted or updated
+    """
+    load_id = str(uuid.uuid4())
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        # csv writes None as an empty unquoted field, which COPY loads as NULL
+        writer.writerow([
+            load_id, row.region_id, row.parameter_id, row.year, row.period_type, row.month, row.value, row.anomaly
+        ])
+    buffer.seek(0)
+
+    table = WeatherData._meta.db_table
+    with connection.cursor() as cursor:
+        _copy_from(cursor, f"COPY {STAGING_TABLE} ({', '.join(STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        cursor.execute(
+            f"""
+            INSERT INTO {table} (region_id, parameter_id, year, period_type, month, value, anomaly)
+            SELECT region_id, parameter_id, year, period_type, month, value, anomaly
+            FROM {STAGING_TABLE} WHERE load_id = %s
+            ON CONFLICT {MERGE_CONFLICT_TARGET} DO UPDATE
+            SET value = EXCLUDED.value, anomaly = EXCLUDED.anomaly
+            WHERE ({table}.value, {table}.anomaly) IS DISTINCT FROM (EXCLUDED.value, EXCLUDED.anomaly)
+            """,
+            [load_id],
+        )
+        written = cursor.rowcount
+        cursor.execute(f"DELETE FROM {STAGING_TABLE} WHERE load_id = %s", [load_id])
+    return written
@@ -0,0 +1,126 @@
+from typing import Dict, Optional
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+
+from db.models import WeatherData
+from utils import metrics
+from utils.data_parser import MONTHLY_COLUMNS, PERIOD_COLUMNS
+from utils.series_cache import get_series_version
+
+# Periods a range can be aggregated over: a month (by its MetOffice column name), a season or annual
+PERIODS = (*MONTHLY_COLUMNS, *PERIOD_COLUMNS)
+
+
+def _period_of(period_type: str, month: Optional[int]) -> str:
+    return MONTHLY_COLUMNS[month - 1] if period_type == WeatherData.PERIOD_MONTHLY else period_type
+
+
+class SeriesAggregates:
+    """
+    Prefix sums of count, value and value² per period of one series (region and parameter).
+
+    Each period holds dense arrays over the years from its first to its last year, with a
+    leading zero, so the count, sum, mean and variance of any year range are a constant
+    number of array lookups. Years without a value (gaps in the MetOffice file) add nothing
+    to any of the sums.
+    """
+
+    def __init__(self, prefixes: Dict[str, Dict]):
+        self.prefixes = prefixes
+
+    @classmethod
+    def from_rows(cls, rows) -> 'SeriesAggregates':
+        """
+        Build the prefix sums from (period_type, month, year, value) rows of one series.
+        """
+        by_period = {}
+        for period_type, month, year, value in rows:
+            years, values = by_period.setdefault(_period_of(period_type, month), ([], []))
+            years.append(year)
+            values.append(value)
+
+        prefixes = {}
+        for period, (years, values) in by_period.items():
+            years = np.array(years, dtype=np.int64)
+            values = np.array(values, dtype=np.float64)
+            first_year = int(years.min())
+            offsets = years - first_year
+            size = int(offsets.max()) + 1
+
+            present = ~np.isnan(values)
+            counts = np.bincount(offsets[present], minlength=size)
+            sums = np.bincount(offsets[present], weights=values[present], minlength=size)
+            squares = np.bincount(offsets[present], weights=values[present] ** 2, minlength=size)
+            prefixes[period] = {
+                'first_year': first_year,
+                'count': np.concatenate([[0], np.cumsum(counts)]),
+                'sum': np.concatenate([[0.0], np.cumsum(sums)]),
+                'square': np.concatenate([[0.0], np.cumsum(squares)]),
+            }
+        return cls(prefixes)
+
+    def aggregate(self, period: str, start_year: int, end_year: int) -> Dict:
+        """
+        Aggregate one period over the inclusive year range.
+
+        Returns:
+            Dictionary with 'count', 'sum', 'mean' and 'variance' (sample variance); the
+            mean is None without values and the variance None with fewer than two
+        """
+        prefix = self.prefixes.get(period)
+        count, total, square = 0, 0.0, 0.0
+        if prefix is not None:
+            last = len(prefix['count']) - 1
+            start = min(max(start_year - prefix['first_year'], 0), last)
+            end = min(max(end_year - prefix['first_year'] + 1, 0), last)
+            if end > start:
+                count = int(prefix['count'][end] - prefix['count'][start])
+                total = float(prefix['sum'][end] - prefix['sum'][start])
+                square = float(prefix['square'][end] - prefix['square'][start])
+
+        mean = total / count if count else None
+        variance = None
+        if count > 1:
+            # Clamp the rounding noise of nearly constant ranges, which can dip below zero
+            variance = max((square - total * total / count) / (count - 1), 0.0)
+        return {
+            'count': count,
+            'sum': round(total, 4),
+            'mean': round(mean, 4) if mean is not None else None,
+            'variance': round(variance, 4) if variance is not None else None,
+        }
+
+
+def build_series_aggregates(region_code: str, parameter_code: str, version: int) -> SeriesAggregates:
+    """
+    Build the prefix sums of a series with one query and cache them under the given version.
+
+    Writes move the series to a new version, so only a changed series is rebuilt, by the
+    first read that misses it.
+    """
+    rows = WeatherData.objects.filter(region__code=region_code, parameter__code=parameter_code).order_by().values_list(
+        'period_type', 'month', 'year', 'value'
+    )
+    aggregates = SeriesAggregates.from_rows(rows)
+    cache.set(f"series-aggregates:{region_code}:{parameter_code}:{version}", aggregates, settings.SERIES_CACHE_TIMEOUT)
+    return aggregates
+
+
+def get_series_aggregates(region_code: str, parameter_code: str, version: Optional[int] = None) -> SeriesAggregates:
+    """
+    Return the prefix sums of a series, building them on a miss.
+
+    Args:
+        region_code: The code for the region
+        parameter_code: The code for the parameter
+        version: The current version of the series, if already read (see get_series_versions)
+    """
+    if version is None:
+        version = get_series_version(region_code, parameter_code)
+    aggregates = cache.get(f"series-aggregates:{region_code}:{parameter_code}:{version}")
+    metrics.inc('cache_requests_total', cache='series-aggregates', result='miss' if aggregates is None else 'hit')
+    if aggregates is None:
+        aggregates = build_series_aggregates(region_code, parameter_code, version)
+    return aggregates
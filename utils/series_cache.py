@@ -0,0 +1,180 @@
+import functools
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import patch_vary_headers
+from rest_framework import status
+from rest_framework.response import Response
+
+from db.models import DatasetVersion
+from utils import metrics
+
+
+# Version of a dataset that has never been bumped; bumps use time.time_ns(), always greater
+UNVERSIONED = 0
+
+
+def series_dataset(region_code: str, parameter_code: str) -> str:
+    """Return the dataset name under which a series (region and parameter) is versioned."""
+    return f"series:{region_code}:{parameter_code}"
+
+
+def get_dataset_versions(datasets) -> dict:
+    """
+    Return the current versions of many datasets with one query.
+
+    Versions are DatasetVersion rows, so every worker process and management command
+    reads the same ones. Reads never write: a dataset without a row (never bumped, or a
+    made-up name from a URL) has version UNVERSIONED, and rows are only created by
+    bump_dataset_version.
+
+    Args:
+        datasets: Iterable of dataset names (e.g. 'regions' or series_dataset names)
+
+    Returns:
+        Dictionary mapping each dataset name to its version
+    """
+    datasets = list(datasets)
+    versions = dict(DatasetVersion.objects.filter(name__in=datasets).values_list('name', 'version'))
+    return {dataset: versions.get(dataset, UNVERSIONED) for dataset in datasets}
+
+
+def get_dataset_version(dataset: str) -> int:
+    """Return the current version of a dataset (e.g. 'regions' or a series_dataset name)."""
+    return get_dataset_versions([dataset])[dataset]
+
+
+def bump_dataset_version(dataset: str) -> None:
+    """
+    Invalidate every cached response and ETag of a dataset by moving it to a new version.
+
+    The version row is written in the caller's transaction, so every process sees the
+    new version exactly when the write commits, and never if it rolls back.
+    """
+    DatasetVersion.objects.bulk_create(
+        [DatasetVersion(name=dataset, version=time.time_ns())],
+        update_conflicts=True,
+        unique_fields=['name'],
+        update_fields=['version', 'updated_at'],
+    )
+
+
+def get_series_version(region_code: str, parameter_code: str) -> int:
+    """Return the current dataset version of a series."""
+    return get_dataset_version(series_dataset(region_code, parameter_code))
+
+
+def get_series_versions(series) -> dict:
+    """
+    Return the current versions of many series with one query.
+
+    Args:
+        series: Iterable of (region_code, parameter_code) pairs
+
+    Returns:
+        Dictionary mapping each pair to its version
+    """
+    datasets = {series_dataset(region_code, parameter_code): (region_code, parameter_code)
+                for region_code, parameter_code in series}
+    versions = get_dataset_versions(datasets)
+    return {pair: versions[dataset] for dataset, pair in datasets.items()}
+
+
+def bump_series_version(region_code: str, parameter_code: str) -> None:
+    """Invalidate every cached response and ETag of a series."""
+    bump_dataset_version(series_dataset(region_code, parameter_code))
+
+
+def _request_digest(request) -> str:
+    # The host is included because paginated responses embed absolute next/previous links,
+    # and the negotiated format because the same URL can be rendered in several formats
+    query = '&'.join(f"{name}={value}" for name, value in sorted(request.query_params.lists()))
+    renderer = getattr(request, 'accepted_renderer', None)
+    representation = f"{request.get_host()}{request.path}?{query}#{getattr(renderer, 'format', '')}"
+    return hashlib.sha256(representation.encode('utf-8')).hexdigest()[:32]
+
+
+def build_etag(dataset: str, version: int, request) -> str:
+    """Build a strong ETag for a request from the version of the dataset it reads."""
+    digest = hashlib.sha256(f"{dataset}:{version}:{_request_digest(request)}".encode('utf-8')).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def etag_matches(request, etag: str) -> bool:
+    """Return True if the request's If-None-Match header matches the given ETag."""
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    # If-None-Match uses weak comparison, so a W/ prefix added by a proxy still matches
+    candidates = [candidate.strip().removeprefix('W/') for candidate in header.split(',')]
+    return etag in candidates
+
+
+def with_validators(response, etag: str):
+    """Attach the ETag and revalidation Cache-Control headers to a response."""
+    response['ETag'] = etag
+    response['Cache-Control'] = settings.API_CACHE_CONTROL
+    patch_vary_headers(response, ['Accept'])
+    return response
+
+
+def conditional_response(request, dataset: str, build_response):
+    """
+    Answer a read request with a 304 if the client's ETag is current, otherwise build it.
+
+    The ETag is derived from the dataset version only, so a 304 costs one indexed
+    DatasetVersion lookup and no queryset is evaluated. The version is shared by every
+    process, so a worker never answers 304 for a representation another one replaced.
+
+    Args:
+        request: The DRF request
+        dataset: Name of the dataset the response reads
+        build_response: Callable returning the full response
+    """
+    etag = build_etag(dataset, get_dataset_version(dataset), request)
+    if etag_matches(request, etag):
+        return with_validators(Response(status=status.HTTP_304_NOT_MODIFIED), etag)
+
+    response = build_response()
+    if response.status_code == 200:
+        with_validators(response, etag)
+    return response
+
+
+def cache_series_response(endpoint: str):
+    """
+    Cache successful responses of a series action keyed on the series version, and
+    answer conditional requests for them with 304 Not Modified.
+
+    Cached responses cost a single query, the DatasetVersion lookup of the series;
+    they go stale only when a write bumps the version of that series.
+    """
+    def decorator(view_method):
+        @functools.wraps(view_method)
+        def wrapper(self, request, region_code=None, parameter_code=None, **kwargs):
+            dataset = series_dataset(region_code, parameter_code)
+            version = get_dataset_version(dataset)
+            etag = build_etag(dataset, version, request)
+            if etag_matches(request, etag):
+                metrics.inc('cache_requests_total', cache='series-response', result='not-modified')
+                return with_validators(Response(status=status.HTTP_304_NOT_MODIFIED), etag)
+
+            key = f"series-response:{endpoint}:{region_code}:{parameter_code}:{version}:{_request_digest(request)}"
+            data = cache.get(key)
+            metrics.inc('cache_requests_total', cache='series-response', result='miss' if data is None else 'hit')
+            if data is not None:
+                return with_validators(Response(data), etag)
+
+            response = view_method(self, request, region_code=region_code, parameter_code=parameter_code, **kwargs)
+            if response.status_code == 200:
+                cache.set(key, response.data, settings.SERIES_CACHE_TIMEOUT)
+                with_validators(response, etag)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,279 @@
+import fcntl
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+
+from db.models import WeatherData
+from utils.data_parser import PERIOD_TYPES
+from utils.series_cache import get_series_version, get_series_versions
+
+MANIFEST_NAME = 'manifest.json'
+COLUMNS = {
+    'id': np.int64,
+    'year': np.int16,
+    'period_type': np.int8,
+    'month': np.int8,
+    'value': np.float32,
+    'anomaly': np.float32,
+}
+
+# Rank of each PERIOD_TYPES index when ordered by period_type code, as the ORM does
+PERIOD_SORT_RANK = np.argsort(np.argsort(np.array(PERIOD_TYPES))).astype(np.int8)
+
+
+def _series_key(region_code: str, parameter_code: str) -> str:
+    return f"{region_code}/{parameter_code}"
+
+
+def build_series_store(directory: Optional[str] = None) -> Optional[Dict]:
+    """
+    Write a columnar snapshot of WeatherData for the memory-mapped series store.
+
+    Rows are sorted by region, parameter, period type, year and month, and each column is
+    written as its own .npy file. The manifest maps every (region, parameter, period_type)
+    to its contiguous [start, end) slice and records the series versions (DatasetVersion
+    rows, shared by every process) the snapshot was built from; it is replaced atomically,
+    so readers always see a complete snapshot.
+
+    Args:
+        directory: Where to write the store (defaults to settings.SERIES_STORE_DIR)
+
+    Returns:
+        The written manifest, or None if the store is disabled
+    """
+    directory = settings.SERIES_STORE_DIR if directory is None else directory
+    if not directory:
+        return None
+    os.makedirs(directory, exist_ok=True)
+
+    # Serialise builders so one never removes files another is about to publish
+    with open(os.path.join(directory, '.lock'), 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+        series_codes = WeatherData.objects.order_by().values_list('region__code', 'parameter__code').distinct()
+        # Read versions before the rows: a write in between leaves the snapshot labelled with
+        # the older version, so readers fall back to the database rather than serve stale data
+        versions = {
+            _series_key(region_code, parameter_code): version
+            for (region_code, parameter_code), version in get_series_versions(series_codes).items()
+        }
+
+        rows = list(
+            WeatherData.objects.order_by().values_list(
+                'region__code', 'parameter__code', 'period_type', 'year', 'month', 'id', 'value', 'anomaly'
+            )
+        )
+        rows.sort(key=lambda row: (row[0], row[1], row[2], row[3], row[4] or 0))
+
+        columns = {
+            'id': np.array([row[5] for row in rows], dtype=COLUMNS['id']),
+            'year': np.array([row[3] for row in rows], dtype=COLUMNS['year']),
+            'period_type': np.array([PERIOD_TYPES.index(row[2]) for row in rows], dtype=COLUMNS['period_type']),
+            'month': np.array([row[4] or 0 for row in rows], dtype=COLUMNS['month']),
+            'value': np.array([row[6] for row in rows], dtype=COLUMNS['value']),
+            'anomaly': np.array([np.nan if row[7] is None else row[7] for row in rows], dtype=COLUMNS['anomaly']),
+        }
+
+        series = {}
+        start = 0
+        for index in range(1, len(rows) + 1):
+            if index == len(rows) or rows[index][:3] != rows[start][:3]:
+                region_code, parameter_code, period_type = rows[start][:3]
+                key = _series_key(region_code, parameter_code)
+                series.setdefault(key, {})[period_type] = [start, index]
+                start = index
+
+        snapshot = f"{time.time_ns()}-{os.getpid()}"
+        files = {}
+        for name, column in columns.items():
+            files[name] = f"{name}-{snapshot}.npy"
+            np.save(os.path.join(directory, files[name]), column)
+
+        manifest = {
+            'snapshot': snapshot,
+            'rows': len(rows),
+            'files': files,
+            'series': series,
+            'versions': versions,
+        }
+        tmp_path = os.path.join(directory, f"{MANIFEST_NAME}.{snapshot}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, os.path.join(directory, MANIFEST_NAME))
+
+        # Remove previous snapshots; processes still mapping them keep their pages until they reload
+        current_files = set(files.values())
+        for filename in os.listdir(directory):
+            if filename.endswith('.npy') and filename not in current_files:
+                os.remove(os.path.join(directory, filename))
+
+    return manifest
+
+
+class SeriesRows:
+    """
+    A lazily materialised, ordered selection of rows from the series store.
+
+    Supports len() and slicing, so it can be handed to DRF pagination like a queryset;
+    only the rows of the requested page are converted to dictionaries.
+    """
+
+    def __init__(self, store: 'SeriesStore', indexes: np.ndarray, region_code: str, parameter_code: str):
+        self.store = store
+        self.indexes = indexes
+        self.region_code = region_code
+        self.parameter_code = parameter_code
+
+    def __len__(self):
+        return len(self.indexes)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return self.to_records(self.indexes[item])
+        return self.to_records(self.indexes[item:item + 1])[0]
+
+    def to_records(self, indexes: np.ndarray) -> List[Dict]:
+        """Convert store rows to dictionaries shaped like WeatherDataListSerializer output."""
+        row_ids = self.store.columns['id'][indexes].tolist()
+        _, _, period_types, years, months, values, anomalies = self.to_columns(indexes)
+        return [
+            {
+                'id': row_id,
+                'region_code': self.region_code,
+                'parameter_code': self.parameter_code,
+                'year': year,
+                'period_type': period_type,
+                'month': month,
+                'value': value,
+                'anomaly': anomaly,
+            }
+            for row_id, period_type, year, month, value, anomaly in zip(
+                row_ids, period_types, years, months, values, anomalies
+            )
+        ]
+
+    def to_columns(self, indexes: Optional[np.ndarray] = None) -> Tuple[List, ...]:
+        """
+        Return the selected rows as parallel lists of region code, parameter code,
+        period type, year, month (None if not monthly), value and anomaly (None if missing).
+        """
+        indexes = self.indexes if indexes is None else indexes
+        columns = self.store.columns
+        # Round-trip float32 through its shortest repr so 12.41 is returned as 12.41
+        values = columns['value'][indexes].astype(str).astype(np.float64).tolist()
+        anomalies = columns['anomaly'][indexes]
+        anomaly_values = [
+            None if missing else anomaly
+            for anomaly, missing in zip(anomalies.astype(str).astype(np.float64).tolist(), np.isnan(anomalies).tolist())
+        ]
+        return (
+            [self.region_code] * len(indexes),
+            [self.parameter_code] * len(indexes),
+            [PERIOD_TYPES[period_code] for period_code in columns['period_type'][indexes].tolist()],
+            columns['year'][indexes].tolist(),
+            [month or None for month in columns['month'][indexes].tolist()],
+            values,
+            anomaly_values,
+        )
+
+
+class SeriesStore:
+    """
+    Read-only view of a series store snapshot, memory-mapped so every worker process
+    shares the same physical pages.
+    """
+
+    def __init__(self, directory: str, manifest: Dict):
+        self.directory = directory
+        self.manifest = manifest
+        self.columns = {
+            name: np.load(os.path.join(directory, filename), mmap_mode='r')
+            for name, filename in manifest['files'].items()
+        }
+
+    def get_series(
+        self,
+        region_code: str,
+        parameter_code: str,
+        period_types: Optional[List[str]] = None,
+        start_year: Optional[int] = None,
+        end_year: Optional[int] = None,
+    ) -> Optional[SeriesRows]:
+        """
+        Select the rows of a series, ordered like WeatherData (-year, period_type, -month).
+
+        Args:
+            region_code: The code for the region
+            parameter_code: The code for the parameter
+            period_types: Period types to include (all if None)
+            start_year: Inclusive lower bound on the year
+            end_year: Inclusive upper bound on the year
+
+        Returns:
+            The selected rows, or None if the snapshot does not hold the current
+            version of the series and the database must be used instead
+        """
+        key = _series_key(region_code, parameter_code)
+        version = self.manifest['versions'].get(key)
+        if version is None or version != get_series_version(region_code, parameter_code):
+            return None
+
+        years = self.columns['year']
+        selected = []
+        for period_type, (start, end) in self.manifest['series'][key].items():
+            if period_types is not None and period_type not in period_types:
+                continue
+            # Years are sorted within each slice, so year bounds are two binary searches
+            if start_year is not None:
+                start = start + int(np.searchsorted(years[start:end], start_year, side='left'))
+            if end_year is not None:
+                end = start + int(np.searchsorted(years[start:end], end_year, side='right'))
+            selected.append(np.arange(start, end))
+
+        indexes = np.concatenate(selected) if selected else np.empty(0, dtype=np.int64)
+        order = np.lexsort((
+            -self.columns['month'][indexes].astype(np.int16),
+            PERIOD_SORT_RANK[self.columns['period_type'][indexes]],
+            -self.columns['year'][indexes].astype(np.int32),
+        ))
+        return SeriesRows(self, indexes[order], region_code, parameter_code)
+
+
+_store = None
+_store_mtime = None
+_store_lock = threading.Lock()
+
+
+def get_series_store() -> Optional[SeriesStore]:
+    """
+    Return this process's view of the series store, remapping it when a new snapshot
+    has been published. Returns None if the store is disabled or has not been built.
+    """
+    global _store, _store_mtime
+    directory = settings.SERIES_STORE_DIR
+    if not directory:
+        return None
+
+    manifest_path = os.path.join(directory, MANIFEST_NAME)
+    try:
+        mtime = os.stat(manifest_path).st_mtime_ns
+    except OSError:
+        return None
+    if mtime == _store_mtime:
+        return _store
+
+    with _store_lock:
+        if mtime != _store_mtime:
+            try:
+                with open(manifest_path) as f:
+                    _store = SeriesStore(directory, json.load(f))
+            except (OSError, ValueError):
+                # A newer snapshot replaced this one mid-load; its new manifest triggers a reload
+                _store = None
+            _store_mtime = mtime
+    return _store
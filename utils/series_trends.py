@@ -0,0 +1,244 @@
+import hashlib
+import json
+import math
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from db.models import WeatherData, SeriesStatistics
+from utils import metrics
+from utils.data_parser import MONTHLY_COLUMNS
+from utils.series_cache import get_series_versions
+
+# Fewest points a series needs in the window for a trend to be reported
+MIN_TREND_POINTS = 3
+
+# Upper bound on pairwise slopes held in memory at once by the robust estimators
+ROBUST_CHUNK_ELEMENTS = 4_000_000
+
+
+def build_trend_matrix(rows) -> Tuple[List[Tuple[str, str, str]], np.ndarray, np.ndarray]:
+    """
+    Arrange (region_code, parameter_code, period_type, month, year, value) rows into a
+    series x year matrix.
+
+    Returns:
+        A tuple of the (region_code, parameter_code, period) key of every matrix row, the
+        years of the columns and the float64 matrix, NaN where a series has no value
+    """
+    keys = {}
+    row_indexes = []
+    years = []
+    values = []
+    for region_code, parameter_code, period_type, month, year, value in rows:
+        period = MONTHLY_COLUMNS[month - 1] if period_type == WeatherData.PERIOD_MONTHLY else period_type
+        row_indexes.append(keys.setdefault((region_code, parameter_code, period), len(keys)))
+        years.append(year)
+        values.append(value)
+
+    if not keys:
+        return [], np.empty(0, dtype=np.int64), np.empty((0, 0))
+
+    years = np.array(years, dtype=np.int64)
+    first_year = int(years.min())
+    columns = np.arange(first_year, int(years.max()) + 1)
+    matrix = np.full((len(keys), len(columns)), np.nan)
+    matrix[np.array(row_indexes), years - first_year] = values
+    return list(keys), columns, matrix
+
+
+def least_squares(years: np.ndarray, matrix: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Fit value = slope * year + intercept to every row of the matrix at once, ignoring NaNs.
+
+    Returns:
+        Dictionary of per-row arrays 'n', 'slope', 'intercept' and 'r_squared' (NaN where
+        a row has fewer than MIN_TREND_POINTS values or no variance)
+    """
+    present = ~np.isnan(matrix)
+    n = present.sum(axis=1)
+    x = np.where(present, years.astype(np.float64), 0.0)
+    y = np.where(present, matrix, 0.0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_x = x.sum(axis=1) / n
+        mean_y = y.sum(axis=1) / n
+        dx = np.where(present, x - mean_x[:, None], 0.0)
+        dy = np.where(present, y - mean_y[:, None], 0.0)
+        sxx = (dx * dx).sum(axis=1)
+        sxy = (dx * dy).sum(axis=1)
+        syy = (dy * dy).sum(axis=1)
+
+        slope = sxy / sxx
+        intercept = mean_y - slope * mean_x
+        r_squared = np.where(syy > 0, sxy * sxy / (sxx * syy), np.nan)
+
+    too_short = n < MIN_TREND_POINTS
+    return {
+        'n': n,
+        'slope': np.where(too_short, np.nan, slope),
+        'intercept': np.where(too_short, np.nan, intercept),
+        'r_squared': np.where(too_short, np.nan, r_squared),
+    }
+
+
+def robust_trends(years: np.ndarray, matrix: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Theil-Sen slope and Mann-Kendall test for every row of the matrix, ignoring NaNs.
+
+    Pairwise differences are computed for blocks of rows at a time, so memory stays
+    bounded by ROBUST_CHUNK_ELEMENTS however many series are selected. The Mann-Kendall
+    variance uses the no-ties formula and the p-value its two-sided normal approximation.
+
+    Returns:
+        Dictionary of per-row arrays 'theil_sen_slope', 'mann_kendall_tau' and
+        'mann_kendall_p' (NaN where a row has fewer than MIN_TREND_POINTS values)
+    """
+    first, second = np.triu_indices(len(years), k=1)
+    year_steps = (years[second] - years[first]).astype(np.float64)
+    chunk = max(1, ROBUST_CHUNK_ELEMENTS // max(len(first), 1))
+
+    theil_sen = np.full(len(matrix), np.nan)
+    tau = np.full(len(matrix), np.nan)
+    p_value = np.full(len(matrix), np.nan)
+    for start in range(0, len(matrix), chunk):
+        block = matrix[start:start + chunk]
+        differences = block[:, second] - block[:, first]
+        valid = ~np.isnan(differences)
+        pairs = valid.sum(axis=1)
+        n = (~np.isnan(block)).sum(axis=1)
+        usable = n >= MIN_TREND_POINTS
+        if not usable.any():
+            continue
+
+        with np.errstate(invalid='ignore'):
+            slopes = np.nanmedian(differences[usable] / year_steps, axis=1)
+        score = np.where(valid, np.sign(differences), 0.0).sum(axis=1)
+        variance = n * (n - 1) * (2 * n + 5) / 18.0
+        # Continuity-corrected normal score of S
+        z = np.where(score > 0, score - 1, np.where(score < 0, score + 1, 0.0)) / np.sqrt(np.maximum(variance, 1))
+
+        indexes = np.arange(start, start + len(block))[usable]
+        theil_sen[indexes] = slopes
+        tau[indexes] = score[usable] / pairs[usable]
+        p_value[indexes] = [math.erfc(abs(value) / math.sqrt(2)) for value in z[usable].tolist()]
+
+    return {'theil_sen_slope': theil_sen, 'mann_kendall_tau': tau, 'mann_kendall_p': p_value}
+
+
+def compute_trends(rows, robust: bool = False) -> List[Dict]:
+    """
+    Compute the trend of every series in the rows with one batched computation.
+
+    Args:
+        rows: (region_code, parameter_code, period_type, month, year, value) tuples
+        robust: Also compute the Theil-Sen slope and the Mann-Kendall test
+
+    Returns:
+        One dictionary per series with its codes, period, number of points, first and last
+        year, slope (per year and per decade), intercept and r_squared, plus the robust
+        statistics if requested; statistics are None when they cannot be computed
+    """
+    keys, years, matrix = build_trend_matrix(rows)
+    if not keys:
+        return []
+
+    statistics = least_squares(years, matrix)
+    if robust:
+        statistics.update(robust_trends(years, matrix))
+
+    present = ~np.isnan(matrix)
+    first_years = np.where(present.any(axis=1), years[present.argmax(axis=1)], 0).tolist()
+    last_years = np.where(present.any(axis=1), years[len(years) - 1 - present[:, ::-1].argmax(axis=1)], 0).tolist()
+
+    def number(value, digits=6):
+        return None if math.isnan(value) else round(value, digits)
+
+    columns = {name: column.tolist() for name, column in statistics.items()}
+    results = []
+    for index, (region_code, parameter_code, period) in enumerate(keys):
+        slope = columns['slope'][index]
+        result = {
+            'region_code': region_code,
+            'parameter_code': parameter_code,
+            'period': period,
+            'n': int(columns['n'][index]),
+            'start_year': first_years[index],
+            'end_year': last_years[index],
+            'slope': number(slope),
+            'slope_per_decade': number(slope * 10),
+            'intercept': number(columns['intercept'][index], 4),
+            'r_squared': number(columns['r_squared'][index]),
+        }
+        if robust:
+            result['theil_sen_slope'] = number(columns['theil_sen_slope'][index])
+            result['mann_kendall_tau'] = number(columns['mann_kendall_tau'][index])
+            result['mann_kendall_p'] = number(columns['mann_kendall_p'][index])
+        results.append(result)
+    return results
+
+
+def get_trends(
+    regions: List[str],
+    parameters: List[str],
+    periods: List[str],
+    start_year: Optional[int] = None,
+    end_year: Optional[int] = None,
+    robust: bool = False,
+) -> List[Dict]:
+    """
+    Return the trends of the selected series, computing them on a cache miss.
+
+    Results are cached under the versions of every selected series, so an import of
+    any one of them moves the selection to a new key.
+
+    Args:
+        regions: Region codes to include (all if empty)
+        parameters: Parameter codes to include (all if empty)
+        periods: Month names (jan..dec), season codes or 'ann'
+        start_year: Inclusive lower bound of the window
+        end_year: Inclusive upper bound of the window
+        robust: Also compute the Theil-Sen slope and the Mann-Kendall test
+    """
+    # The summary table lists the imported series without scanning weather data
+    series = SeriesStatistics.objects.order_by()
+    if regions:
+        series = series.filter(region__code__in=regions)
+    if parameters:
+        series = series.filter(parameter__code__in=parameters)
+    versions = get_series_versions(series.values_list('region__code', 'parameter__code').distinct())
+
+    selection = json.dumps([
+        sorted(periods), start_year, end_year, robust,
+        sorted(f"{region_code}/{parameter_code}:{version}" for (region_code, parameter_code), version in versions.items()),
+    ])
+    key = f"series-trends:{hashlib.sha256(selection.encode('utf-8')).hexdigest()}"
+    results = cache.get(key)
+    metrics.inc('cache_requests_total', cache='series-trends', result='miss' if results is None else 'hit')
+    if results is not None:
+        return results
+
+    months = [MONTHLY_COLUMNS.index(period) + 1 for period in periods if period in MONTHLY_COLUMNS]
+    period_filter = Q(period_type__in=[period for period in periods if period not in MONTHLY_COLUMNS])
+    if months:
+        period_filter |= Q(period_type=WeatherData.PERIOD_MONTHLY, month__in=months)
+
+    queryset = WeatherData.objects.filter(period_filter)
+    if regions:
+        queryset = queryset.filter(region__code__in=regions)
+    if parameters:
+        queryset = queryset.filter(parameter__code__in=parameters)
+    if start_year is not None:
+        queryset = queryset.filter(year__gte=start_year)
+    if end_year is not None:
+        queryset = queryset.filter(year__lte=end_year)
+
+    rows = queryset.order_by('region__code', 'parameter__code', 'period_type', 'month').values_list(
+        'region__code', 'parameter__code', 'period_type', 'month', 'year', 'value'
+    )
+    results = compute_trends(rows, robust=robust)
+    cache.set(key, results, settings.SERIES_CACHE_TIMEOUT)
+    return results
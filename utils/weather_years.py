@@ -0,0 +1,103 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from db.models import Region, Parameter, WeatherData, WeatherYear
+from utils.data_parser import MetOfficeParser, PERIOD_TYPES, WIDE_COLUMNS, columns_to_wide, wide_to_columns
+from utils.series_store import PERIOD_SORT_RANK
+
+
+def save_weather_years(region: Region, parameter: Parameter, columns: Dict[str, np.ndarray], batch_size: int = 1000) -> None:
+    """
+    Write a series to the wide WeatherYear layout, one row per year.
+
+    Args:
+        region: The region of the series
+        parameter: The parameter of the series
+        columns: Parsed columns of the series (see MetOfficeParser.records_to_columns)
+        batch_size: Rows written per INSERT statement
+    """
+    years, matrix = columns_to_wide(columns)
+    rows = [
+        WeatherYear(
+            region=region,
+            parameter=parameter,
+            year=year,
+            **{name: None if np.isnan(value) else value for name, value in zip(WIDE_COLUMNS, values)}
+        )
+        for year, values in zip(years.tolist(), matrix.tolist())
+    ]
+    WeatherYear.objects.bulk_create(
+        rows,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=['region', 'parameter', 'year'],
+        update_fields=list(WIDE_COLUMNS),
+    )
+
+
+def build_weather_years(region: Region, parameter: Parameter, batch_size: int = 1000) -> None:
+    """
+    Pivot the WeatherData rows of a series into WeatherYear rows.
+
+    WeatherYear is not kept in step with WeatherData by imports or API writes; it is
+    built on demand by benchmark_storage_layout, inside a transaction it rolls back.
+
+    Args:
+        region: The region of the series
+        parameter: The parameter of the series
+        batch_size: Rows written per INSERT statement
+    """
+    points = WeatherData.objects.filter(region=region, parameter=parameter).order_by().values(
+        'year', 'period_type', 'month', 'value'
+    )
+    save_weather_years(region, parameter, MetOfficeParser.records_to_columns(list(points)), batch_size)
+
+
+def get_year_points(
+    region_code: str,
+    parameter_code: str,
+    period_types: Optional[List[str]] = None,
+    start_year: Optional[int] = None,
+    end_year: Optional[int] = None,
+) -> List[Tuple[int, str, Optional[int], float]]:
+    """
+    Read a series from the wide WeatherYear layout as (year, period_type, month, value) points.
+
+    Rows are unpivoted to one point per month or period and ordered like WeatherData
+    (-year, period_type, -month). The wide layout stores values only, so it is used for
+    storage comparisons (see benchmark_storage_layout) rather than by the API.
+
+    Args:
+        region_code: The code for the region
+        parameter_code: The code for the parameter
+        period_types: Period types to include (all if None)
+        start_year: Inclusive lower bound on the year
+        end_year: Inclusive upper bound on the year
+    """
+    rows = WeatherYear.objects.filter(region__code=region_code, parameter__code=parameter_code)
+    if start_year is not None:
+        rows = rows.filter(year__gte=start_year)
+    if end_year is not None:
+        rows = rows.filter(year__lte=end_year)
+    table = np.array(list(rows.values_list('year', *WIDE_COLUMNS)), dtype=np.float64).reshape(-1, len(WIDE_COLUMNS) + 1)
+    columns = wide_to_columns(table[:, 0].astype(np.int32), table[:, 1:])
+
+    indexes = np.arange(len(columns['value']))
+    if period_types is not None:
+        indexes = np.flatnonzero(np.isin(columns['period_type'], [PERIOD_TYPES.index(code) for code in period_types]))
+    order = indexes[np.lexsort((
+        -columns['month'][indexes].astype(np.int16),
+        PERIOD_SORT_RANK[columns['period_type'][indexes]],
+        -columns['year'][indexes],
+    ))]
+
+    return [
+        (year, PERIOD_TYPES[period_code], month or None, value)
+        for year, period_code, month, value in zip(
+            columns['year'][order].tolist(),
+            columns['period_type'][order].tolist(),
+            columns['month'][order].tolist(),
+            columns['value'][order].tolist(),
+        )
+    ]
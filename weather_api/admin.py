@@ -2,7 +2,7 @@ from django.contrib import admin
 
 # Register your models here.
 from django.contrib import admin
-from db.models import Region, Parameter, WeatherData
+from db.models import Region, Parameter, WeatherData, ImportJob, SeriesStatistics
 
 @admin.register(Region)
 class RegionAdmin(admin.ModelAdmin):
@@ -22,3 +22,15 @@ class WeatherDataAdmin(admin.ModelAdmin):
     list_filter = ('region', 'parameter', 'year')
     search_fields = ('region__name', 'parameter__name')
     ordering = ('-year', '-month')
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = ('parameter_code', 'region_code', 'state', 'records_written', 'created_at', 'finished_at')
+    list_filter = ('state', 'parameter_code', 'region_code')
+    ordering = ('-created_at',)
+
+@admin.register(SeriesStatistics)
+class SeriesStatisticsAdmin(admin.ModelAdmin):
+    list_display = ('region', 'parameter', 'period_type', 'row_count', 'min_year', 'max_year', 'last_imported_at')
+    list_filter = ('region', 'parameter', 'period_type')
+    ordering = ('region', 'parameter', 'period_type')
@@ -0,0 +1,122 @@
+import base64
+import json
+from collections import OrderedDict
+from functools import reduce
+from operator import or_
+
+from django.db.models import Model, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+# Key of the (region, parameter, year, period_type, month) composite index on WeatherData
+KEYSET_FIELDS = ['region_id', 'parameter_id', 'year', 'period_type', 'month']
+
+
+class WeatherDataPagination(PageNumberPagination):
+    """
+    Page-number pagination with an opt-in keyset (cursor) mode.
+
+    By default this behaves exactly like PageNumberPagination. With `?pagination=cursor`
+    (or a `cursor` from a previous page) rows are ordered by the composite index key and
+    each page continues after the last row of the previous one, so there is no COUNT(*)
+    and no OFFSET scan; page N costs the same as page 1. Cursor pages contain only
+    'next' and 'results', and ignore any `ordering` parameter.
+    """
+    cursor_query_param = 'cursor'
+    mode_query_param = 'pagination'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def keyset_requested(self, request) -> bool:
+        """Whether the request opted in to keyset pagination."""
+        return (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or self.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.keyset_requested(request)
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        self.request = request
+        queryset = queryset.order_by(*KEYSET_FIELDS)
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded:
+            queryset = queryset.filter(self.after(self.decode_cursor(encoded)))
+
+        # One extra row tells whether there is a next page without counting
+        rows = list(queryset[:page_size + 1])
+        page = rows[:page_size]
+        self.next_key = self.row_key(page[-1]) if len(rows) > page_size else None
+        return page
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if self.next_key is None:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_key))
+
+    @staticmethod
+    def row_key(row):
+        """
+        Return the KEYSET_FIELDS values of a row.
+
+        Model instances and dictionaries are read by field name; tuples from values_list()
+        must end with the KEYSET_FIELDS columns.
+        """
+        if isinstance(row, Model):
+            return [getattr(row, field) for field in KEYSET_FIELDS]
+        if isinstance(row, dict):
+            return [row[field] for field in KEYSET_FIELDS]
+        return list(row[-len(KEYSET_FIELDS):])
+
+    @staticmethod
+    def after(key) -> Q:
+        """
+        Build the filter for rows strictly after `key` in KEYSET_FIELDS order.
+
+        Within one (region, parameter, year, period_type) month is either always null
+        (seasonal and annual rows, one row each) or never null (monthly rows), so a null
+        month means no further row shares the prefix.
+        """
+        *prefix_values, month = key
+        prefix_fields = KEYSET_FIELDS[:-1]
+        clauses = []
+        for position, field in enumerate(prefix_fields):
+            equal = dict(zip(prefix_fields[:position], prefix_values[:position], strict=True))
+            clauses.append(Q(**equal, **{f"{field}__gt": prefix_values[position]}))
+        if month is not None:
+            clauses.append(Q(**dict(zip(prefix_fields, prefix_values, strict=True)), month__gt=month))
+        return reduce(or_, clauses)
+
+    def encode_cursor(self, key) -> str:
+        return base64.urlsafe_b64encode(json.dumps(key, separators=(',', ':')).encode('utf-8')).decode('ascii')
+
+    def decode_cursor(self, encoded: str):
+        try:
+            key = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            region_id, parameter_id, year, period_type, month = key
+            if not (
+                isinstance(region_id, int) and isinstance(parameter_id, int) and isinstance(year, int)
+                and isinstance(period_type, str) and (month is None or isinstance(month, int))
+            ):
+                raise ValueError
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message) from None
+        return key
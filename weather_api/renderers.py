@@ -0,0 +1,68 @@
+from rest_framework.compat import LONG_SEPARATORS, SHORT_SEPARATORS
+from rest_framework.renderers import JSONRenderer
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Drop-in JSONRenderer that reuses one configured encoder instead of building a new
+    one for every response.
+
+    Output is byte-identical to JSONRenderer; indented output (?format=json with an
+    indent media type parameter, or the browsable API) goes through JSONRenderer itself.
+    """
+    _encoder = None
+
+    def get_encoder(self):
+        if self._encoder is None:
+            separators = SHORT_SEPARATORS if self.compact else LONG_SEPARATORS
+            type(self)._encoder = self.encoder_class(
+                ensure_ascii=self.ensure_ascii, allow_nan=not self.strict, separators=separators
+            )
+        return self._encoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = self.get_encoder().encode(data)
+        # Escape \u2028 and \u2029 like JSONRenderer so the output stays a strict javascript subset
+        return ret.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029').encode()
+
+
+class ColumnarJSONRenderer(FastJSONRenderer):
+    """
+    JSON renderer for the compact columnar representation of weather data.
+
+    Selected with ?format=columnar or an Accept header of its media type. Views check
+    for it and build parallel arrays instead of one serialized object per row.
+    """
+    media_type = 'application/vnd.weather.columnar+json'
+    format = 'columnar'
+
+
+class NDJSONRenderer(FastJSONRenderer):
+    """
+    Newline-delimited JSON: one compact object per line.
+
+    The export action streams its rows itself and only relies on this renderer for
+    content negotiation (?format=ndjson) and for rendering error responses.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        render = super().render
+        return b''.join(render(item) + b'\n' for item in (data if isinstance(data, list) else [data]))
+
+
+class CSVRenderer(NDJSONRenderer):
+    """
+    CSV content negotiation (?format=csv) for the export action, which streams the rows
+    itself. Error responses have no tabular shape and are rendered as a JSON line.
+    """
+    media_type = 'text/csv'
+    format = 'csv'
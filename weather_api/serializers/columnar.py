@@ -0,0 +1,82 @@
+from itertools import groupby
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# Column order expected by build_columnar, suitable for QuerySet.values_list(*COLUMNAR_FIELDS)
+COLUMNAR_FIELDS = ['region__code', 'parameter__code', 'period_type', 'year', 'month', 'value', 'anomaly']
+
+# Column order expected by build_series_batch
+BATCH_FIELDS = ['region__code', 'region__name', 'parameter__code', 'period_type', 'year', 'month', 'value', 'anomaly']
+
+# Categorical fields that collapse to a single value when every row shares it
+SHARED_FIELDS = [('region_code', 'region_codes'), ('parameter_code', 'parameter_codes'), ('period_type', 'period_types')]
+
+
+def build_columnar(rows: Iterable[Tuple]) -> Dict:
+    """
+    Build the columnar representation of weather data rows.
+
+    Region, parameter and period type are emitted once (as 'region_code', 'parameter_code'
+    and 'period_type') when every row shares them, and otherwise as parallel arrays named
+    'region_codes', 'parameter_codes' and 'period_types'. Years, months, values and
+    anomalies are always parallel arrays.
+
+    Args:
+        rows: Tuples ordered like COLUMNAR_FIELDS, e.g. from values_list(*COLUMNAR_FIELDS)
+
+    Returns:
+        Dictionary with the shared metadata, 'count' and the parallel arrays
+    """
+    columns = list(zip(*rows)) or [()] * len(COLUMNAR_FIELDS)
+    return columnar_payload(*columns)
+
+
+def columnar_payload(
+    region_codes: Sequence,
+    parameter_codes: Sequence,
+    period_types: Sequence,
+    years: Sequence,
+    months: Sequence,
+    values: Sequence,
+    anomalies: Sequence,
+) -> Dict:
+    """Assemble the columnar representation from parallel column sequences (see build_columnar)."""
+    payload = {'count': len(years)}
+    for (single_name, plural_name), column in zip(SHARED_FIELDS, [region_codes, parameter_codes, period_types]):
+        distinct = set(column)
+        if len(distinct) == 1:
+            payload[single_name] = next(iter(distinct))
+        else:
+            payload[plural_name] = list(column)
+
+    payload['years'] = list(years)
+    payload['months'] = list(months)
+    payload['values'] = list(values)
+    payload['anomalies'] = list(anomalies)
+    return payload
+
+
+def build_series_batch(rows: Iterable[Tuple]) -> List[Dict]:
+    """
+    Group weather data rows into one columnar entry per series.
+
+    Args:
+        rows: Tuples ordered like BATCH_FIELDS and sorted by region, parameter and period type
+
+    Returns:
+        List of dictionaries with 'region_code', 'region_name', 'parameter_code',
+        'period_type' and parallel 'years', 'months', 'values' and 'anomalies' arrays
+    """
+    series = []
+    for (region_code, region_name, parameter_code, period_type), group in groupby(rows, key=lambda row: row[:4]):
+        _, _, _, _, years, months, values, anomalies = zip(*group)
+        series.append({
+            'region_code': region_code,
+            'region_name': region_name,
+            'parameter_code': parameter_code,
+            'period_type': period_type,
+            'years': list(years),
+            'months': list(months),
+            'values': list(values),
+            'anomalies': list(anomalies),
+        })
+    return series
@@ -0,0 +1,69 @@
+import csv
+import io
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from weather_api.renderers import FastJSONRenderer
+
+# Columns fetched for list responses, suitable for QuerySet.values_list(*LIST_FIELDS)
+LIST_FIELDS = ['id', 'region__code', 'parameter__code', 'year', 'period_type', 'month', 'value', 'anomaly']
+
+# Output keys, in the order WeatherDataListSerializer emits them
+LIST_KEYS = ('id', 'region_code', 'parameter_code', 'year', 'period_type', 'month', 'value', 'anomaly')
+
+
+def encode_rows(rows: Iterable[Tuple]) -> List[Dict]:
+    """
+    Encode values_list rows as WeatherDataListSerializer would, without a serializer.
+
+    Every field of WeatherDataListSerializer is a plain column (the codes are joined in
+    the query), so a row maps straight to a dictionary. Rows may carry extra trailing
+    columns, e.g. keyset pagination keys; they are ignored.
+
+    Args:
+        rows: Tuples starting with the LIST_FIELDS columns
+
+    Returns:
+        List of dictionaries identical to WeatherDataListSerializer(..., many=True).data
+    """
+    keys = LIST_KEYS
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def _batches(rows: Iterable[Tuple], size: int) -> Iterator[List[Tuple]]:
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def stream_ndjson(rows: Iterable[Tuple], chunk_rows: int) -> Iterator[str]:
+    """
+    Encode values_list rows as newline-delimited JSON objects keyed like encode_rows.
+
+    Rows are consumed lazily and encoded chunk_rows at a time, one string per chunk, so
+    memory stays bounded by the chunk size however many rows are exported.
+    """
+    encoder = FastJSONRenderer().get_encoder()
+    keys = LIST_KEYS
+    for batch in _batches(rows, chunk_rows):
+        yield ''.join(encoder.encode(dict(zip(keys, row))) + '\n' for row in batch)
+
+
+def stream_csv(rows: Iterable[Tuple], chunk_rows: int) -> Iterator[str]:
+    """
+    Encode values_list rows as CSV with a LIST_KEYS header row, chunk_rows rows per string.
+
+    None (the month of seasonal and annual points, a missing anomaly) becomes an empty field.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(LIST_KEYS)
+    yield buffer.getvalue()
+    for batch in _batches(rows, chunk_rows):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(row[:len(LIST_KEYS)] for row in batch)
+        yield buffer.getvalue()
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from db.models import Region, Parameter, WeatherData
+from db.models import Region, Parameter, WeatherData, ImportJob
 
 
 class RegionSerializer(serializers.ModelSerializer):
@@ -84,3 +84,13 @@ class WeatherDataCreateSerializer(serializers.ModelSerializer):
             parameter=parameter,
             **validated_data
         )
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    """Serializer for the status of a background import job"""
+    class Meta:
+        model = ImportJob
+        fields = [
+            'id', 'parameter_code', 'region_code', 'state', 'created_at', 'started_at', 'finished_at',
+            'timings', 'records_written', 'attempts', 'error'
+        ]
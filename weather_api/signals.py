@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from db.models import Parameter, Region
+from utils.series_cache import bump_dataset_version
+
+
+@receiver([post_save, post_delete], sender=Region)
+def bump_regions_version(sender, **kwargs):
+    """Invalidate region ETags whenever a region is created, edited or deleted"""
+    bump_dataset_version('regions')
+
+
+@receiver([post_save, post_delete], sender=Parameter)
+def bump_parameters_version(sender, **kwargs):
+    """Invalidate parameter ETags whenever a parameter is created, edited or deleted"""
+    bump_dataset_version('parameters')
@@ -0,0 +1,72 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from db.models import Region, Parameter, WeatherData
+from utils.dataset_stats import refresh_series_statistics
+from utils.series_cache import bump_series_version
+
+URL = '/api/v1/weather-data/aggregates/'
+
+
+@override_settings(SERIES_STORE_DIR='')
+class AggregatesTests(TestCase):
+    """Year-range aggregates are answered from prefix sums built lazily per series version."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.parameter = Parameter.objects.create(code='Tmax', name='Max temp', unit='degC')
+        for code, offset in [('UK', 0.0), ('England', 1.0)]:
+            region = Region.objects.create(code=code, name=code)
+            # 2001 is missing, as gaps in MetOffice files are
+            for year, value in [(2000, 10.0), (2002, 12.0), (2003, 14.0)]:
+                WeatherData.objects.create(
+                    region=region, parameter=self.parameter, year=year, period_type='ann', value=value + offset
+                )
+            WeatherData.objects.create(
+                region=region, parameter=self.parameter, year=2000, period_type='monthly', month=1, value=3.0
+            )
+            refresh_series_statistics(region, self.parameter)
+
+    def get(self, query):
+        response = self.client.get(URL + query)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_range_matches_hand_computed_values(self):
+        data = self.get('?periods=ann&ranges=2000-2002,1990-1995&regions=UK')
+        self.assertEqual(data['count'], 2)
+        # 10 and 12: mean 11, sample variance ((10 - 11)² + (12 - 11)²) / 1 = 2
+        self.assertEqual(
+            data['results'][0],
+            {'region_code': 'UK', 'parameter_code': 'Tmax', 'period': 'ann', 'start_year': 2000, 'end_year': 2002,
+             'count': 2, 'sum': 22.0, 'mean': 11.0, 'variance': 2.0},
+        )
+        # A range outside the series has no values
+        self.assertEqual(
+            {key: data['results'][1][key] for key in ['count', 'sum', 'mean', 'variance']},
+            {'count': 0, 'sum': 0.0, 'mean': None, 'variance': None},
+        )
+
+    def test_month_of_a_single_value_has_no_variance(self):
+        result = self.get('?periods=jan&ranges=2000-2003&regions=England')['results'][0]
+        self.assertEqual((result['count'], result['mean'], result['variance']), (1, 3.0, None))
+
+    def test_versions_of_all_series_are_read_at_once(self):
+        self.get('?periods=ann&ranges=2000-2003')
+        # The series list and one version lookup; prefix sums come from the cache
+        with self.assertNumQueries(2):
+            data = self.get('?periods=ann,spr&ranges=2000-2003')
+        self.assertEqual(data['count'], 4)
+
+    def test_a_write_rebuilds_only_on_the_next_read(self):
+        self.assertEqual(self.get('?periods=ann&ranges=2000-2003&regions=UK')['results'][0]['sum'], 36.0)
+        WeatherData.objects.filter(region__code='UK', year=2003).update(value=20.0)
+        bump_series_version('UK', 'Tmax')
+        self.assertEqual(self.get('?periods=ann&ranges=2000-2003&regions=UK')['results'][0]['sum'], 42.0)
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get(URL + '?periods=foo&ranges=2000-2001').status_code, 400)
+        self.assertEqual(self.client.get(URL + '?periods=ann&ranges=2001-2000').status_code, 400)
+        self.assertEqual(self.client.get(URL + '?periods=ann').status_code, 400)
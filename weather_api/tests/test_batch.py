@@ -0,0 +1,64 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from db.models import Region, Parameter, WeatherData
+
+URL = '/api/v1/weather-data/batch/'
+
+
+class BatchTests(TestCase):
+    """The batch endpoint answers many series with one query, one columnar entry per series."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        tmax = Parameter.objects.create(code='Tmax', name='Max temp', unit='degC')
+        rainfall = Parameter.objects.create(code='Rainfall', name='Rainfall', unit='mm')
+        for code, name, offset in [('UK', 'United Kingdom', 0.0), ('England', 'England', 1.0)]:
+            region = Region.objects.create(code=code, name=name)
+            for year in range(2000, 2004):
+                WeatherData.objects.create(
+                    region=region, parameter=tmax, year=year, period_type='ann', value=year - 1990 + offset
+                )
+                WeatherData.objects.create(
+                    region=region, parameter=rainfall, year=year, period_type='ann', value=100.0 + offset
+                )
+            WeatherData.objects.create(region=region, parameter=tmax, year=2003, period_type='win', value=1.0)
+
+    def get(self, query):
+        response = self.client.get(URL + query)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_one_entry_per_series(self):
+        with self.assertNumQueries(1):
+            data = self.get('?regions=UK,England&parameters=Tmax&period_types=ann&start_year=2001&end_year=2002')
+        self.assertEqual(data['count'], 2)
+        # Ordered by region name
+        self.assertEqual(
+            data['series'][0],
+            {'region_code': 'England', 'region_name': 'England', 'parameter_code': 'Tmax', 'period_type': 'ann',
+             'years': [2001, 2002], 'months': [None, None], 'values': [12.0, 13.0], 'anomalies': [None, None]},
+        )
+        self.assertEqual(data['series'][1]['region_name'], 'United Kingdom')
+        self.assertEqual(data['series'][1]['values'], [11.0, 12.0])
+
+    def test_omitted_filters_select_everything(self):
+        data = self.get('?regions=UK')
+        self.assertEqual(
+            [(entry['parameter_code'], entry['period_type']) for entry in data['series']],
+            [('Rainfall', 'ann'), ('Tmax', 'ann'), ('Tmax', 'win')],
+        )
+
+    def test_last_n_years_keeps_the_latest_years_of_the_selection(self):
+        data = self.get('?regions=UK&parameters=Tmax&period_types=ann&end_year=2002&last_n_years=2')
+        self.assertEqual(data['series'][0]['years'], [2001, 2002])
+
+    def test_empty_selection(self):
+        self.assertEqual(self.get('?regions=Wales'), {'count': 0, 'series': []})
+        self.assertEqual(self.get('?regions=UK&last_n_years=2&start_year=2050'), {'count': 0, 'series': []})
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get(URL + '?period_types=ann,foo').status_code, 400)
+        self.assertEqual(self.client.get(URL + '?last_n_years=ten').status_code, 400)
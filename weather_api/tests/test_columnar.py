@@ -0,0 +1,68 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from db.models import Region, Parameter, WeatherData
+
+COLUMNAR = 'application/vnd.weather.columnar+json'
+
+
+@override_settings(SERIES_STORE_DIR='')
+class ColumnarFormatTests(TestCase):
+    """?format=columnar returns shared metadata once and the rows as parallel arrays."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        parameter = Parameter.objects.create(code='Tmax', name='Max temp', unit='degC')
+        uk = Region.objects.create(code='UK', name='UK')
+        england = Region.objects.create(code='England', name='England')
+        for region, year, period_type, value, anomaly in [
+            (uk, 2000, 'ann', 10.0, None),
+            (uk, 2001, 'ann', 11.0, 0.5),
+            (uk, 2000, 'win', 2.0, None),
+            (england, 2000, 'ann', 9.0, None),
+        ]:
+            WeatherData.objects.create(
+                region=region, parameter=parameter, year=year, period_type=period_type, value=value, anomaly=anomaly
+            )
+
+    def get(self, url, **extra):
+        response = self.client.get(url, **extra)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_series_shares_metadata(self):
+        self.assertEqual(
+            self.get('/api/v1/weather-data/annual/UK/Tmax/?format=columnar'),
+            {'count': 2, 'region_code': 'UK', 'parameter_code': 'Tmax', 'period_type': 'ann',
+             'years': [2001, 2000], 'months': [None, None], 'values': [11.0, 10.0], 'anomalies': [0.5, None]},
+        )
+
+    def test_accept_header_selects_the_format(self):
+        response = self.client.get('/api/v1/weather-data/annual/UK/Tmax/', HTTP_ACCEPT=COLUMNAR)
+        self.assertTrue(response['Content-Type'].startswith(COLUMNAR))
+        self.assertEqual(response.json()['years'], [2001, 2000])
+
+    def test_mixed_periods_become_an_array(self):
+        data = self.get('/api/v1/weather-data/by-region-parameter/UK/Tmax/?format=columnar&end_year=2000')
+        self.assertEqual(data['period_types'], ['ann', 'win'])
+        self.assertNotIn('period_type', data)
+        self.assertEqual((data['region_code'], data['values']), ('UK', [10.0, 2.0]))
+
+    def test_list_of_one_series_is_unpaginated(self):
+        data = self.get('/api/v1/weather-data/?format=columnar&region__code=England&parameter__code=Tmax')
+        self.assertEqual((data['count'], data['region_code'], data['values']), (1, 'England', [9.0]))
+
+    def test_list_of_many_series_is_paginated(self):
+        data = self.get('/api/v1/weather-data/?format=columnar&period_type=ann&year=2000')
+        self.assertEqual(data['count'], 2)
+        self.assertEqual(sorted(data['results']['region_codes']), ['England', 'UK'])
+        self.assertEqual(data['results']['period_type'], 'ann')
+
+    def test_empty_series(self):
+        self.assertEqual(
+            self.get('/api/v1/weather-data/annual/UK/Rainfall/?format=columnar'),
+            {'count': 0, 'region_codes': [], 'parameter_codes': [], 'period_types': [],
+             'years': [], 'months': [], 'values': [], 'anomalies': []},
+        )
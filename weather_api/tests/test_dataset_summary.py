@@ -0,0 +1,76 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from db.models import Region, Parameter, WeatherData, SeriesStatistics
+from utils.dataset_stats import refresh_series_statistics
+
+SUMMARY_URL = '/api/v1/weather-data/summary/'
+STATS_URL = '/api/v1/webapp/api/stats/'
+
+
+class DatasetSummaryTests(TestCase):
+    """The summary action and stats_api read the precomputed series statistics."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.parameter = Parameter.objects.create(code='Tmax', name='Max temp', unit='degC')
+        self.uk = Region.objects.create(code='UK', name='UK')
+        Region.objects.create(code='England', name='England')
+
+    def add_series(self, years, imported=True):
+        for year in years:
+            WeatherData.objects.create(region=self.uk, parameter=self.parameter, year=year, period_type='ann', value=1.0)
+            WeatherData.objects.create(
+                region=self.uk, parameter=self.parameter, year=year, period_type='monthly', month=1, value=1.0
+            )
+        refresh_series_statistics(self.uk, self.parameter, imported=imported)
+
+    def summary(self):
+        response = self.client.get(SUMMARY_URL)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_empty_dataset(self):
+        self.assertEqual(
+            self.summary(),
+            {'regions_count': 2, 'parameters_count': 1, 'data_count': 0, 'min_year': None, 'max_year': None,
+             'years_covered': 0, 'last_imported_at': None},
+        )
+
+    def test_summary_of_imported_series(self):
+        # 1990 and 2000..2002: the years covered span the gap
+        self.add_series([1990, 2000, 2001, 2002])
+        self.assertEqual(SeriesStatistics.objects.count(), 2)
+        # The summary aggregate and the region and parameter counts, never a scan of weather data
+        with self.assertNumQueries(3):
+            summary = self.summary()
+        self.assertEqual(
+            {key: summary[key] for key in ['data_count', 'min_year', 'max_year', 'years_covered']},
+            {'data_count': 8, 'min_year': 1990, 'max_year': 2002, 'years_covered': 13},
+        )
+        self.assertIsNotNone(summary['last_imported_at'])
+
+    def test_api_writes_refresh_the_summary_but_not_the_import_time(self):
+        self.add_series([2000], imported=False)
+        response = self.client.post('/api/v1/weather-data/', {
+            'region_code': 'UK', 'parameter_code': 'Tmax', 'year': 2010, 'period_type': 'monthly', 'month': 3, 'value': 2.0,
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        summary = self.summary()
+        self.assertEqual((summary['data_count'], summary['max_year']), (3, 2010))
+        self.assertIsNone(summary['last_imported_at'])
+
+        row = WeatherData.objects.get(year=2010)
+        self.assertEqual(self.client.delete(f'/api/v1/weather-data/{row.id}/').status_code, 204)
+        self.assertEqual(self.summary()['max_year'], 2000)
+
+    def test_stats_api(self):
+        self.add_series([2000, 2001])
+        stats = self.client.get(STATS_URL).json()
+        self.assertEqual(
+            {key: stats[key] for key in ['regions_count', 'parameters_count', 'data_count', 'years_covered']},
+            {'regions_count': 2, 'parameters_count': 1, 'data_count': 4, 'years_covered': 2},
+        )
+        self.assertEqual(stats['last_updated'], self.summary()['last_imported_at'])
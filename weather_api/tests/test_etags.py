@@ -0,0 +1,52 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from db.models import Region, Parameter, WeatherData
+from utils.series_cache import bump_series_version
+
+
+@override_settings(SERIES_STORE_DIR='')
+class ETagTests(TestCase):
+    """
+    A client revalidating with If-None-Match must get the new representation as soon as
+    any process (another worker, an import command) has changed the dataset.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.region = Region.objects.create(code='UK', name='United Kingdom')
+        self.parameter = Parameter.objects.create(code='Tmax', name='Max temp', unit='degC')
+        WeatherData.objects.create(region=self.region, parameter=self.parameter, year=2020, period_type='ann', value=12.5)
+
+    def in_another_process(self):
+        return mock.patch('utils.series_cache.cache', LocMemCache('another-process', {}))
+
+    def test_unchanged_series_is_not_modified(self):
+        url = '/api/v1/weather-data/annual/UK/Tmax/'
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_series_etag_changes_after_a_write_elsewhere(self):
+        url = '/api/v1/weather-data/annual/UK/Tmax/'
+        etag = self.client.get(url)['ETag']
+        with self.in_another_process():
+            bump_series_version('UK', 'Tmax')
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_regions_etag_changes_after_a_write_elsewhere(self):
+        url = '/api/v1/regions/'
+        etag = self.client.get(url)['ETag']
+        with self.in_another_process():
+            Region.objects.create(code='Scotland', name='Scotland')
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 2)
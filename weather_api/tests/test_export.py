@@ -0,0 +1,72 @@
+import csv
+import gzip
+import io
+import json
+
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from db.models import Region, Parameter, WeatherData
+
+URL = '/api/v1/weather-data/export/'
+
+
+@override_settings(EXPORT_CHUNK_SIZE=2)
+class ExportTests(TestCase):
+    """The export action streams every matching row as NDJSON or CSV, in chunks."""
+
+    def setUp(self):
+        self.client = APIClient()
+        parameter = Parameter.objects.create(code='Tmax', name='Max temp', unit='degC')
+        uk = Region.objects.create(code='UK', name='UK')
+        england = Region.objects.create(code='England', name='England')
+        self.rows = [
+            WeatherData.objects.create(region=uk, parameter=parameter, year=2001, period_type='ann', value=11.0, anomaly=0.5),
+            WeatherData.objects.create(region=uk, parameter=parameter, year=2000, period_type='ann', value=10.0),
+            WeatherData.objects.create(region=uk, parameter=parameter, year=2000, period_type='monthly', month=1, value=3.0),
+            WeatherData.objects.create(region=england, parameter=parameter, year=2000, period_type='ann', value=9.0),
+        ]
+
+    def export(self, query='', **extra):
+        response = self.client.get(URL + query, **extra)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content)
+
+    def test_ndjson(self):
+        response, content = self.export('?region__code=UK')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        self.assertIn('weather-data.ndjson', response['Content-Disposition'])
+        lines = content.decode('utf-8').splitlines()
+        # Default ordering: newest year first, then period type and month
+        self.assertEqual([json.loads(line)['id'] for line in lines], [row.id for row in self.rows[:3]])
+        self.assertEqual(
+            json.loads(lines[0]),
+            {'id': self.rows[0].id, 'region_code': 'UK', 'parameter_code': 'Tmax', 'year': 2001,
+             'period_type': 'ann', 'month': None, 'value': 11.0, 'anomaly': 0.5},
+        )
+
+    def test_csv(self):
+        response, content = self.export('?format=csv&period_type=ann&ordering=value')
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        rows = list(csv.reader(io.StringIO(content.decode('utf-8'))))
+        self.assertEqual(rows[0], ['id', 'region_code', 'parameter_code', 'year', 'period_type', 'month', 'value', 'anomaly'])
+        self.assertEqual([row[1] for row in rows[1:]], ['England', 'UK', 'UK'])
+        # None becomes an empty field
+        self.assertEqual(rows[1][5:], ['', '9.0', ''])
+
+    def test_gzip(self):
+        response, content = self.export('?region__code=England', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(json.loads(gzip.decompress(content))['value'], 9.0)
+
+    def test_export_is_one_query(self):
+        with self.assertNumQueries(1):
+            _, content = self.export()
+        self.assertEqual(len(content.splitlines()), 4)
+
+    def test_empty_export(self):
+        self.assertEqual(self.export('?region__code=Wales')[1], b'')
+        _, content = self.export('?format=csv&region__code=Wales')
+        self.assertEqual(content.decode('utf-8').splitlines(), ['id,region_code,parameter_code,year,period_type,month,value,anomaly'])
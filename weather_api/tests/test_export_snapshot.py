@@ -0,0 +1,109 @@
+import gzip
+import hashlib
+import io
+import shutil
+import tempfile
+import unittest
+
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from db.models import Region, Parameter, WeatherData
+from utils.export_snapshot import arrow_available, build_export_snapshot
+
+URL = '/api/v1/weather-data/snapshot/'
+
+
+@unittest.skipUnless(arrow_available(), 'pyarrow is not installed')
+class ExportSnapshotTests(TestCase):
+    """Parquet and Arrow snapshots are served with their content hash as a strong ETag."""
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        settings_override = override_settings(EXPORT_SNAPSHOT_DIR=directory)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.client = APIClient()
+
+        self.region = Region.objects.create(code='UK', name='UK')
+        self.parameter = Parameter.objects.create(code='Tmax', name='Max temp', unit='degC')
+        WeatherData.objects.create(region=self.region, parameter=self.parameter, year=2000, period_type='ann', value=10.5)
+        WeatherData.objects.create(
+            region=self.region, parameter=self.parameter, year=2000, period_type='monthly', month=1, value=3.0, anomaly=-0.5
+        )
+
+    def download(self, artifact, **extra):
+        response = self.client.get(f'{URL}{artifact}/', **extra)
+        self.assertEqual(response.status_code, 200)
+        return response, b''.join(response.streaming_content)
+
+    def test_missing_snapshot(self):
+        self.assertEqual(self.client.get(f'{URL}parquet/').status_code, 404)
+
+    def test_parquet_round_trip(self):
+        import pyarrow.parquet as pq
+
+        build_export_snapshot()
+        response, content = self.download('parquet')
+        self.assertEqual(response['ETag'], f'"{hashlib.sha256(content).hexdigest()}"')
+        self.assertEqual(response['Content-Type'], 'application/vnd.apache.parquet')
+
+        table = pq.read_table(io.BytesIO(content))
+        self.assertEqual(str(table.schema.field('year').type), 'int16')
+        self.assertEqual(str(table.schema.field('value').type), 'float')
+        # Ordered by period type: 'ann' before 'monthly'
+        self.assertEqual(
+            table.to_pylist(),
+            [
+                {'region_code': 'UK', 'parameter_code': 'Tmax', 'year': 2000, 'period_type': 'ann', 'month': None,
+                 'value': 10.5, 'anomaly': None},
+                {'region_code': 'UK', 'parameter_code': 'Tmax', 'year': 2000, 'period_type': 'monthly', 'month': 1,
+                 'value': 3.0, 'anomaly': -0.5},
+            ],
+        )
+
+    def test_not_modified(self):
+        build_export_snapshot()
+        etag = self.download('parquet')[0]['ETag']
+        for header in [etag, f'W/{etag}', f'"other", {etag}']:
+            with self.subTest(if_none_match=header):
+                response = self.client.get(f'{URL}parquet/', HTTP_IF_NONE_MATCH=header)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response['ETag'], etag)
+                self.assertEqual(response.content, b'')
+
+    def test_a_new_snapshot_changes_the_etag(self):
+        build_export_snapshot()
+        etag = self.download('parquet')[0]['ETag']
+        WeatherData.objects.filter(period_type='ann').update(value=11.5)
+        build_export_snapshot()
+        response = self.client.get(f'{URL}parquet/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_arrow_is_served_precompressed(self):
+        import pyarrow.feather as feather
+
+        build_export_snapshot()
+        plain_response, plain = self.download('arrow')
+        gzip_response, compressed = self.download('arrow', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(gzip_response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', gzip_response['Vary'])
+        self.assertEqual(gzip.decompress(compressed), plain)
+        self.assertEqual(gzip_response['ETag'], plain_response['ETag'][:-1] + '-gzip"')
+        self.assertEqual(feather.read_table(io.BytesIO(plain)).num_rows, 2)
+
+        # Each encoding revalidates against its own ETag
+        response = self.client.get(f'{URL}arrow/', HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=plain_response['ETag'])
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(f'{URL}arrow/', HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=gzip_response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_empty_dataset(self):
+        import pyarrow.parquet as pq
+
+        WeatherData.objects.all().delete()
+        self.assertEqual(build_export_snapshot()['rows'], 0)
+        table = pq.read_table(io.BytesIO(self.download('parquet')[1]))
+        self.assertEqual((table.num_rows, table.column_names[0]), (0, 'region_code'))
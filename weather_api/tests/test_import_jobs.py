@@ -0,0 +1,53 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from db.models import ImportJob
+from utils import import_jobs
+
+
+@override_settings(IMPORT_JOB_STALE_AFTER=300, IMPORT_JOB_MAX_ATTEMPTS=3)
+class ImportJobRecoveryTests(TestCase):
+    """Jobs left behind by a recycled or crashed worker are requeued by another process."""
+
+    def setUp(self):
+        patcher = mock.patch.object(import_jobs, '_submit')
+        self.submit = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create_job(self, state, seconds_since_heartbeat, attempts=1):
+        job = ImportJob.objects.create(parameter_code='Tmax', region_code='UK', state=state, attempts=attempts)
+        ImportJob.objects.filter(id=job.id).update(updated_at=timezone.now() - timedelta(seconds=seconds_since_heartbeat))
+        return job
+
+    def test_orphaned_running_job_is_requeued(self):
+        job = self.create_job(ImportJob.STATE_RUNNING, 600)
+
+        self.assertEqual(import_jobs.recover_import_jobs(), 1)
+        self.submit.assert_called_once_with(job.id)
+        self.assertEqual(ImportJob.objects.get(id=job.id).state, ImportJob.STATE_QUEUED)
+
+    def test_job_with_a_recent_heartbeat_is_left_alone(self):
+        self.create_job(ImportJob.STATE_RUNNING, 60)
+
+        self.assertEqual(import_jobs.recover_import_jobs(), 0)
+        self.submit.assert_not_called()
+
+    def test_job_out_of_attempts_is_failed(self):
+        job = self.create_job(ImportJob.STATE_RUNNING, 600, attempts=3)
+
+        self.assertEqual(import_jobs.recover_import_jobs(), 0)
+        job.refresh_from_db()
+        self.assertEqual(job.state, ImportJob.STATE_FAILED)
+        self.assertEqual(job.error, "Abandoned by its worker")
+
+    def test_job_adopted_elsewhere_is_not_run_twice(self):
+        # The owner's heartbeat lapsed and another process already started the job
+        job = self.create_job(ImportJob.STATE_RUNNING, 0)
+
+        with mock.patch('utils.import_jobs.connection'):
+            import_jobs.run_import_job(job.id)
+        job.refresh_from_db()
+        self.assertEqual((job.state, job.attempts), (ImportJob.STATE_RUNNING, 1))
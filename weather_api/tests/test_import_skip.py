@@ -0,0 +1,61 @@
+import shutil
+import tempfile
+from unittest import mock
+
+from django.test import TestCase
+
+from db.models import Region, Parameter, SeriesStatistics, WeatherData
+from utils.data_parser import MetOfficeParser
+from utils.dataset_stats import refresh_series_statistics
+from utils.http_cache import HTTPFileCache
+from utils.import_pipeline import ImportPipeline
+
+
+class ImportSkipTests(TestCase):
+    """Unchanged downloads are only skipped when the database holds the imported series."""
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.parser = MetOfficeParser(cache_dir=directory)
+        self.region = Region.objects.create(code='UK', name='United Kingdom')
+        self.parameter = Parameter.objects.create(code='Tmax', name='Max temp', unit='degC')
+        # A body downloaded earlier, e.g. by an import into another database
+        self.parser.cache.store(self.parser.build_url('Tmax', 'UK'), 'body', etag='"v1"')
+
+    def fetch(self):
+        response = mock.Mock(status_code=304, content=b'')
+        with mock.patch.object(self.parser.session, 'get', return_value=response):
+            return self.parser.fetch_once('Tmax', 'UK', only_if_changed=True)
+
+    def import_series(self):
+        WeatherData.objects.create(region=self.region, parameter=self.parameter, year=2020, period_type='ann', value=1.0)
+        refresh_series_statistics(self.region, self.parameter)
+        self.parser.mark_imported('Tmax', 'UK')
+
+    def test_fresh_database_imports_cached_body(self):
+        self.assertEqual(self.fetch(), 'body')
+
+    def test_imported_body_is_skipped(self):
+        self.import_series()
+        self.assertEqual(SeriesStatistics.objects.get().source_hash, HTTPFileCache.hash_content('body'))
+        self.assertIsNone(self.fetch())
+
+    def test_other_writes_clear_the_imported_hash(self):
+        self.import_series()
+        refresh_series_statistics(self.region, self.parameter, imported=False)
+        self.assertEqual(self.fetch(), 'body')
+
+    def test_pipeline_reads_imported_hashes_before_fetching(self):
+        self.import_series()
+        self.parser.cache.store(self.parser.build_url('Tmax', 'England'), 'other body')
+        pipeline = ImportPipeline(self.parser, concurrency=2, only_if_changed=True)
+
+        response = mock.Mock(status_code=304, content=b'')
+        # Fetcher threads must not look anything up in the database
+        with mock.patch.object(self.parser.session, 'get', return_value=response), \
+                mock.patch.object(self.parser, 'imported_hash', side_effect=AssertionError):
+            results = pipeline.run([('Tmax', 'UK'), ('Tmax', 'England')])
+
+        skipped = {result['region']: result['skipped'] for result in results}
+        self.assertEqual(skipped, {'UK': True, 'England': False})
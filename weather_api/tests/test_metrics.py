@@ -0,0 +1,63 @@
+import json
+import os
+import shutil
+import tempfile
+
+from django.test import SimpleTestCase, override_settings
+
+from utils import metrics
+
+
+class MetricsRetirementTests(SimpleTestCase):
+    """Samples of exited workers are kept in one aggregate file instead of a file per worker."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        settings_override = override_settings(METRICS_DIR=self.directory)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def write_worker(self, name, value):
+        with open(os.path.join(self.directory, name), 'w') as f:
+            json.dump([['metoffice_fetch_retries_total', [['region', 'UK']], value]], f)
+
+    def retries(self):
+        return metrics.collect().get(('metoffice_fetch_retries_total', (('region', 'UK'),)), 0)
+
+    def test_retired_workers_keep_their_counts(self):
+        before = self.retries()
+        # Two processes that had the same pid, and a live worker
+        self.write_worker('worker-123-1.json', 5)
+        self.write_worker('worker-123-2.json', 2)
+        self.write_worker('worker-456-3.json', 1)
+        self.assertEqual(self.retries(), before + 8)
+
+        metrics.retire_worker(123)
+        metrics.retire_worker(123)
+
+        self.assertEqual(self.retries(), before + 8)
+        self.assertEqual(
+            sorted(name for name in os.listdir(self.directory) if name.endswith('.json')),
+            [metrics.AGGREGATE_NAME, 'worker-456-3.json'],
+        )
+
+        metrics.retire_worker(456)
+        self.assertEqual(self.retries(), before + 8)
+
+
+class MetricsEndpointTests(SimpleTestCase):
+    """/metrics is off unless a token is configured, and then needs that token."""
+
+    def test_disabled_without_a_token(self):
+        with override_settings(METRICS_TOKEN=''):
+            self.assertEqual(self.client.get('/metrics').status_code, 404)
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_requires_the_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer wrong').status_code, 401)
+
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'# TYPE http_request_duration_seconds histogram', response.content)
@@ -0,0 +1,79 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from db.models import Region, Parameter, WeatherData
+from weather_api.pagination import WeatherDataPagination
+
+PERIODS = [('ann', None), ('win', None), ('spr', None), ('sum', None), ('aut', None)] + [
+    ('monthly', month) for month in range(1, 13)
+]
+SERIES_URLS = [
+    '/api/v1/weather-data/by-region-parameter/UK/Tmax/',
+    '/api/v1/weather-data/seasonal/UK/Tmax/',
+    '/api/v1/weather-data/annual/UK/Tmax/',
+]
+
+
+@override_settings(SERIES_STORE_DIR='')
+class QueryCountTests(TestCase):
+    """List and series pages cost a fixed number of queries, whatever the page size or position."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        parameter = Parameter.objects.create(code='Tmax', name='Max temp', unit='degC')
+        for code in ['UK', 'England']:
+            region = Region.objects.create(code=code, name=code)
+            WeatherData.objects.bulk_create([
+                WeatherData(region=region, parameter=parameter, year=year, period_type=period_type, month=month, value=1.0)
+                for year in range(1900, 1960)
+                for period_type, month in PERIODS
+            ])
+
+    def page_size(self, size):
+        return mock.patch.object(WeatherDataPagination, 'page_size', size)
+
+    def get(self, url, queries):
+        with self.assertNumQueries(queries):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_list_pages(self):
+        for size in [10, 100, 1000]:
+            with self.subTest(page_size=size), self.page_size(size):
+                # COUNT(*) and the page
+                self.assertEqual(len(self.get('/api/v1/weather-data/', 2)['results']), size)
+                self.assertEqual(len(self.get('/api/v1/weather-data/?page=2', 2)['results']), size)
+
+    def test_list_cursor_pages(self):
+        for size in [10, 100, 1000]:
+            with self.subTest(page_size=size), self.page_size(size):
+                # The page alone, with one extra row to detect the next page
+                page = self.get('/api/v1/weather-data/?pagination=cursor', 1)
+                self.assertEqual(len(page['results']), size)
+                self.assertEqual(len(self.get(page['next'], 1)['results']), size)
+
+    def test_series_pages(self):
+        for size in [10, 25]:
+            for url in SERIES_URLS:
+                cache.clear()
+                with self.subTest(url=url, page_size=size), self.page_size(size):
+                    # The series version, COUNT(*) and the page
+                    self.assertEqual(len(self.get(url, 3)['results']), size)
+                    self.assertEqual(len(self.get(f'{url}?page=2', 3)['results']), size)
+                    # A cached page only reads the series version
+                    self.get(url, 1)
+
+    def test_series_cursor_pages(self):
+        for size in [10, 25]:
+            for url in SERIES_URLS:
+                cache.clear()
+                with self.subTest(url=url, page_size=size), self.page_size(size):
+                    # The series version and the page
+                    page = self.get(f'{url}?pagination=cursor', 2)
+                    self.assertEqual(len(page['results']), size)
+                    self.assertEqual(len(self.get(page['next'], 2)['results']), size)
@@ -0,0 +1,69 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from db.models import DatasetVersion, Region, Parameter, WeatherData
+from utils.series_cache import UNVERSIONED, bump_series_version, get_series_version
+
+
+@override_settings(SERIES_STORE_DIR='')
+class SeriesVersionTests(TestCase):
+    """
+    Series versions must be shared by every process. Another gunicorn worker or an
+    import command has its own local-memory cache, stood in for by a separate one.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.region = Region.objects.create(code='UK', name='United Kingdom')
+        self.parameter = Parameter.objects.create(code='Tmax', name='Max temp', unit='degC')
+        self.point = WeatherData.objects.create(
+            region=self.region, parameter=self.parameter, year=2020, period_type='ann', value=12.5
+        )
+        self.url = '/api/v1/weather-data/annual/UK/Tmax/'
+
+    def test_version_survives_another_process(self):
+        version = get_series_version('UK', 'Tmax')
+        cache.clear()
+        self.assertEqual(get_series_version('UK', 'Tmax'), version)
+
+    def in_another_process(self):
+        return mock.patch('utils.series_cache.cache', LocMemCache('another-process', {}))
+
+    def test_bump_is_seen_by_another_process(self):
+        version = get_series_version('UK', 'Tmax')
+        with self.in_another_process():
+            bump_series_version('UK', 'Tmax')
+        self.assertNotEqual(get_series_version('UK', 'Tmax'), version)
+
+    def test_rolled_back_bump_keeps_the_version(self):
+        version = get_series_version('UK', 'Tmax')
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            bump_series_version('UK', 'Tmax')
+            raise RuntimeError
+        self.assertEqual(get_series_version('UK', 'Tmax'), version)
+
+    def test_cached_response_is_not_served_after_a_write_elsewhere(self):
+        self.assertEqual(self.client.get(self.url).json()['results'][0]['value'], 12.5)
+
+        # Another process (an import or API write) changes the series; this worker's
+        # cache still holds the old response under the old version
+        with self.in_another_process():
+            WeatherData.objects.filter(pk=self.point.pk).update(value=13.5)
+            bump_series_version('UK', 'Tmax')
+
+        self.assertEqual(self.client.get(self.url).json()['results'][0]['value'], 13.5)
+
+    def test_reads_do_not_create_versions(self):
+        self.client.get(self.url)
+        self.client.get(f"/api/v1/weather-data/annual/{'X' * 200}/Tmax/")
+
+        self.assertFalse(DatasetVersion.objects.filter(name__startswith='series:').exists())
+        self.assertEqual(get_series_version('UK', 'Tmax'), UNVERSIONED)
+        bump_series_version('UK', 'Tmax')
+        self.assertGreater(get_series_version('UK', 'Tmax'), UNVERSIONED)
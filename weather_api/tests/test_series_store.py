@@ -0,0 +1,55 @@
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import TestCase, override_settings
+
+from db.models import Region, Parameter, WeatherData
+from utils.series_cache import bump_series_version
+from utils.series_store import build_series_store, get_series_store
+
+
+class SeriesStoreTests(TestCase):
+    """
+    The store is built by one process (the import command or an import job) and read by
+    every gunicorn worker, each with its own local-memory cache.
+    """
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        settings_override = override_settings(SERIES_STORE_DIR=directory)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        # Forget any snapshot mapped by an earlier test
+        patcher = mock.patch.multiple('utils.series_store', _store=None, _store_mtime=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        cache.clear()
+
+        region = Region.objects.create(code='UK', name='United Kingdom')
+        parameter = Parameter.objects.create(code='Tmax', name='Max temp', unit='degC')
+        WeatherData.objects.bulk_create([
+            WeatherData(region=region, parameter=parameter, year=year, period_type='ann', value=10.0 + year % 10)
+            for year in range(2000, 2010)
+        ])
+
+    def build_in_another_process(self):
+        with mock.patch('utils.series_cache.cache', LocMemCache('builder-process', {})):
+            build_series_store()
+
+    def test_store_built_elsewhere_is_served(self):
+        self.build_in_another_process()
+        cache.clear()
+
+        rows = get_series_store().get_series('UK', 'Tmax', start_year=2005)
+        self.assertIsNotNone(rows)
+        self.assertEqual([row['year'] for row in rows[:]], [2009, 2008, 2007, 2006, 2005])
+
+    def test_store_is_not_served_after_a_write(self):
+        self.build_in_another_process()
+        bump_series_version('UK', 'Tmax')
+
+        self.assertIsNone(get_series_store().get_series('UK', 'Tmax'))
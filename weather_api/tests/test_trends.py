@@ -0,0 +1,85 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from db.models import Region, Parameter, WeatherData
+from utils.dataset_stats import refresh_series_statistics
+from utils.series_cache import bump_series_version
+
+URL = '/api/v1/weather-data/trends/'
+
+
+@override_settings(SERIES_STORE_DIR='')
+class TrendsTests(TestCase):
+    """Trends of many series are fitted in one batch and match hand-computed statistics."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        parameter = Parameter.objects.create(code='Tmax', name='Max temp', unit='degC')
+        uk = Region.objects.create(code='UK', name='UK')
+        england = Region.objects.create(code='England', name='England')
+        for year, value in zip(range(2000, 2005), [1.0, 3.0, 2.0, 5.0, 4.0], strict=True):
+            WeatherData.objects.create(region=uk, parameter=parameter, year=year, period_type='ann', value=value)
+        for year, value in zip(range(2000, 2003), [1.0, 2.0, 3.0], strict=True):
+            WeatherData.objects.create(
+                region=uk, parameter=parameter, year=year, period_type='monthly', month=1, value=value
+            )
+        # Too few points for a trend
+        for year in [2000, 2004]:
+            WeatherData.objects.create(region=england, parameter=parameter, year=year, period_type='ann', value=1.0)
+        for region in [uk, england]:
+            refresh_series_statistics(region, parameter)
+
+    def get(self, query):
+        response = self.client.get(URL + query)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_least_squares_matches_hand_computed_values(self):
+        data = self.get('?regions=UK')
+        self.assertEqual(data['count'], 1)
+        # x - 2002 = -2..2, y - 3 = -2, 0, -1, 2, 1: Sxy = 8, Sxx = 10, Syy = 10
+        self.assertEqual(
+            data['results'][0],
+            {'region_code': 'UK', 'parameter_code': 'Tmax', 'period': 'ann', 'n': 5, 'start_year': 2000,
+             'end_year': 2004, 'slope': 0.8, 'slope_per_decade': 8.0, 'intercept': -1598.6, 'r_squared': 0.64},
+        )
+
+    def test_robust_statistics_match_hand_computed_values(self):
+        result = self.get('?regions=UK&robust=true')['results'][0]
+        # Pairwise slopes -1, -1, 1/3, 0.5, 0.75, 1, 1, 4/3, 2, 3 have median 0.875
+        self.assertEqual(result['theil_sen_slope'], 0.875)
+        # 8 increasing and 2 decreasing pairs: S = 6, Var(S) = 5 * 4 * 15 / 18, z = (6 - 1) / sqrt(Var(S))
+        self.assertEqual(result['mann_kendall_tau'], 0.6)
+        self.assertEqual(result['mann_kendall_p'], 0.220671)
+
+    def test_months_and_year_window(self):
+        data = self.get('?regions=UK&periods=jan,ann&start_year=2001&end_year=2003&robust=true')
+        results = {result['period']: result for result in data['results']}
+        self.assertEqual(sorted(results), ['ann', 'jan'])
+        # 3, 2, 5 over 2001..2003
+        self.assertEqual((results['ann']['n'], results['ann']['slope'], results['ann']['theil_sen_slope']), (3, 1.0, 1.0))
+        # Two January values are left in the window
+        self.assertEqual((results['jan']['n'], results['jan']['slope'], results['jan']['mann_kendall_tau']), (2, None, None))
+
+    def test_short_and_missing_series(self):
+        result = self.get('?regions=England&robust=true')['results'][0]
+        self.assertEqual((result['n'], result['start_year'], result['end_year']), (2, 2000, 2004))
+        self.assertEqual(
+            {key: result[key] for key in ['slope', 'intercept', 'r_squared', 'theil_sen_slope', 'mann_kendall_p']},
+            dict.fromkeys(['slope', 'intercept', 'r_squared', 'theil_sen_slope', 'mann_kendall_p']),
+        )
+        self.assertEqual(self.get('?regions=Wales'), {'count': 0, 'results': []})
+
+    def test_results_are_cached_until_a_series_changes(self):
+        self.assertEqual(self.get('?regions=UK')['results'][0]['slope'], 0.8)
+        WeatherData.objects.filter(region__code='UK', period_type='ann', year=2004).update(value=6.0)
+        self.assertEqual(self.get('?regions=UK')['results'][0]['slope'], 0.8)
+        bump_series_version('UK', 'Tmax')
+        # Sxy = 8 + 2 * 2 = 12
+        self.assertEqual(self.get('?regions=UK')['results'][0]['slope'], 1.2)
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get(URL + '?periods=foo').status_code, 400)
+        self.assertEqual(self.client.get(URL + '?start_year=soon').status_code, 400)
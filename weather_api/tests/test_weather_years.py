@@ -0,0 +1,53 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from db.models import Region, Parameter, WeatherData, WeatherYear
+from utils.weather_years import build_weather_years, get_year_points
+
+
+@override_settings(SERIES_STORE_DIR='')
+class WeatherYearTests(TestCase):
+    """WeatherYear is an offline copy built for benchmark_storage_layout, never written by the API."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.region = Region.objects.create(code='UK', name='United Kingdom')
+        self.parameter = Parameter.objects.create(code='Tmax', name='Max temp', unit='degC')
+
+    def create_point(self, year, period_type, month, value):
+        return WeatherData.objects.create(
+            region=self.region, parameter=self.parameter, year=year, period_type=period_type, month=month, value=value
+        )
+
+    def test_built_layout_reads_back_the_same_points(self):
+        self.create_point(2020, 'monthly', 1, 4.5)
+        self.create_point(2020, 'monthly', 2, 5.5)
+        self.create_point(2020, 'ann', None, 12.5)
+        self.create_point(2021, 'win', None, 3.0)
+
+        build_weather_years(self.region, self.parameter)
+
+        self.assertEqual(WeatherYear.objects.count(), 2)
+        expected = list(
+            WeatherData.objects.filter(region=self.region, parameter=self.parameter).values_list(
+                'year', 'period_type', 'month', 'value'
+            )
+        )
+        self.assertEqual(get_year_points('UK', 'Tmax'), expected)
+        self.assertEqual(get_year_points('UK', 'Tmax', period_types=['ann']), [(2020, 'ann', None, 12.5)])
+
+    def test_api_writes_leave_weather_years_alone(self):
+        response = self.client.post('/api/v1/weather-data/', {
+            'region_code': 'UK', 'parameter_code': 'Tmax', 'year': 2020, 'period_type': 'monthly', 'month': 3, 'value': 9.5,
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(WeatherYear.objects.exists())
+
+    def test_series_reads_keep_row_ids_and_stored_anomalies(self):
+        point = WeatherData.objects.create(
+            region=self.region, parameter=self.parameter, year=2020, period_type='ann', value=12.5, anomaly=0.75
+        )
+        row = self.client.get('/api/v1/weather-data/annual/UK/Tmax/').json()['results'][0]
+        self.assertEqual((row['id'], row['anomaly']), (point.pk, 0.75))
@@ -4,7 +4,8 @@ from weather_api.views.weather import (
     RegionViewSet, 
     ParameterViewSet, 
     WeatherDataViewSet,
-    ImportWeatherDataView
+    ImportWeatherDataView,
+    ImportJobDetailView
 )
 
 # Create a router and register our viewsets with it
@@ -17,6 +18,7 @@ router.register(r'weather-data', WeatherDataViewSet)
 urlpatterns = [
     path('', include(router.urls)),
     path('import-data/', ImportWeatherDataView.as_view(), name='import-data'),
+    path('import-jobs/<int:pk>/', ImportJobDetailView.as_view(), name='import-job-detail'),
     path('weather-data/by-region-parameter/<str:region_code>/<str:parameter_code>/', 
          WeatherDataViewSet.as_view({'get': 'by_region_parameter'}), 
          name='weather-data-by-region-parameter'),
@@ -1,35 +1,92 @@
+import os
 from rest_framework import viewsets, status, filters
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from rest_framework.generics import RetrieveAPIView
+from django.urls import reverse
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.renderers import JSONRenderer, BrowsableAPIRenderer
+from rest_framework.renderers import BrowsableAPIRenderer
+from django.conf import settings
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence
+from django.db import transaction
+from django.db.models import Subquery, Value
 
-from db.models import Region, Parameter, WeatherData
+from db.models import Region, Parameter, WeatherData, ImportJob, SeriesStatistics
 from weather_api.serializers.weather import (
     RegionSerializer, 
     ParameterSerializer, 
     WeatherDataSerializer,
     WeatherDataListSerializer,
-    WeatherDataCreateSerializer
+    WeatherDataCreateSerializer,
+    ImportJobSerializer
 )
-from utils.data_parser import MetOfficeParser
+from weather_api.serializers.columnar import (
+    BATCH_FIELDS,
+    COLUMNAR_FIELDS,
+    build_columnar,
+    build_series_batch,
+    columnar_payload
+)
+from weather_api.serializers.rows import LIST_FIELDS, encode_rows, stream_csv, stream_ndjson
+from weather_api.pagination import KEYSET_FIELDS, WeatherDataPagination
+from weather_api.renderers import ColumnarJSONRenderer, CSVRenderer, FastJSONRenderer, NDJSONRenderer
+from utils.dataset_stats import get_dataset_summary, refresh_series_statistics
+from utils.export_snapshot import ARTIFACTS, get_export_manifest
+from utils import metrics
+from utils.import_jobs import enqueue_import
+from utils.series_aggregates import PERIODS, get_series_aggregates
+from utils.series_trends import get_trends
+from utils.series_cache import (
+    bump_series_version,
+    cache_series_response,
+    conditional_response,
+    etag_matches,
+    get_series_versions,
+    with_validators
+)
+from utils.series_store import get_series_store
+
 
+def _list_param(request, name):
+    """Return the values of a comma-separated (or repeated) query parameter."""
+    return [code for value in request.query_params.getlist(name) for code in value.split(',') if code]
 
-class RegionViewSet(viewsets.ModelViewSet):
+
+class DatasetETagMixin:
+    """
+    Adds strong ETags and 304 Not Modified responses to list and retrieve, derived
+    from the version of the dataset named by `etag_dataset`.
+    """
+    etag_dataset = None
+    
+    def list(self, request, *args, **kwargs):
+        parent_list = super().list
+        return conditional_response(request, self.etag_dataset, lambda: parent_list(request, *args, **kwargs))
+    
+    def retrieve(self, request, *args, **kwargs):
+        parent_retrieve = super().retrieve
+        return conditional_response(request, self.etag_dataset, lambda: parent_retrieve(request, *args, **kwargs))
+
+
+class RegionViewSet(DatasetETagMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows regions to be viewed or edited.
     """
+    etag_dataset = 'regions'
     queryset = Region.objects.all()
     serializer_class = RegionSerializer
     filter_backends = [filters.SearchFilter]
     search_fields = ['code', 'name']
 
 
-class ParameterViewSet(viewsets.ModelViewSet):
+class ParameterViewSet(DatasetETagMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows weather parameters to be viewed or edited.
     """
+    etag_dataset = 'parameters'
     queryset = Parameter.objects.all()
     serializer_class = ParameterSerializer
     filter_backends = [filters.SearchFilter]
@@ -44,8 +101,10 @@ class WeatherDataViewSet(viewsets.ModelViewSet):
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['region__code', 'parameter__code', 'year', 'period_type', 'month']
     ordering_fields = ['year', 'period_type', 'month', 'value']
-    ordering = ['-year', 'period_type', '-month']
-    renderer_classes = [JSONRenderer, BrowsableAPIRenderer]
+    # id breaks ties between series so pages never overlap or skip rows
+    ordering = ['-year', 'period_type', '-month', 'id']
+    pagination_class = WeatherDataPagination
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer, ColumnarJSONRenderer]
     
     def get_serializer_class(self):
         if self.action == 'list':
@@ -54,13 +113,119 @@ class WeatherDataViewSet(viewsets.ModelViewSet):
             return WeatherDataCreateSerializer
         return WeatherDataSerializer
     
+    def _columnar_requested(self, request):
+        """Whether the client asked for the columnar format (?format=columnar or Accept header)"""
+        return request.accepted_renderer.format == ColumnarJSONRenderer.format
+    
+    def list(self, request, *args, **kwargs):
+        """
+        List weather data, optionally in the columnar format.
+        
+        Columnar responses are unpaginated when filtered down to a single series
+        (both region__code and parameter__code given) and paginated otherwise.
+        """
+        if not self._columnar_requested(request):
+            return self._list_response(self.filter_queryset(self.get_queryset()))
+        
+        queryset = self.filter_queryset(self.get_queryset()).values_list(*COLUMNAR_FIELDS)
+        if request.query_params.get('region__code') and request.query_params.get('parameter__code'):
+            return Response(build_columnar(queryset))
+        
+        if self.paginator.keyset_requested(request):
+            # Keyset pages read the cursor from trailing key columns, dropped before rendering
+            page = self.paginate_queryset(queryset.values_list(*COLUMNAR_FIELDS, *KEYSET_FIELDS))
+            return self.get_paginated_response(build_columnar(row[:len(COLUMNAR_FIELDS)] for row in page))
+        
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(build_columnar(page))
+        return Response(build_columnar(queryset))
+    
+    def _list_response(self, queryset):
+        """
+        Paginate and encode a queryset like WeatherDataListSerializer, with a fixed query count per page.
+        
+        The region and parameter codes are joined in SQL and rows are encoded straight
+        from values_list(), so the query count does not grow with the page size.
+        """
+        # Keyset pagination reads its cursor from the trailing key columns
+        rows = queryset.values_list(*LIST_FIELDS, *KEYSET_FIELDS)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(encode_rows(page))
+        return Response(encode_rows(rows))
+    
+    @transaction.atomic
+    def perform_create(self, serializer):
+        instance = serializer.save()
+        refresh_series_statistics(instance.region, instance.parameter, imported=False)
+        bump_series_version(instance.region.code, instance.parameter.code)
+    
+    @transaction.atomic
+    def perform_update(self, serializer):
+        # The row may move to another series, so both the old and new series change
+        previous_series = (serializer.instance.region, serializer.instance.parameter)
+        instance = serializer.save()
+        for region, parameter in [previous_series, (instance.region, instance.parameter)]:
+            refresh_series_statistics(region, parameter, imported=False)
+            bump_series_version(region.code, parameter.code)
+    
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        region, parameter = instance.region, instance.parameter
+        instance.delete()
+        refresh_series_statistics(region, parameter, imported=False)
+        bump_series_version(region.code, parameter.code)
+    
+    def _series_from_store(self, request, region_code, parameter_code, period_types=None):
+        """
+        Answer a series action from the memory-mapped series store.
+        
+        Returns None if the store is disabled or does not hold the current version
+        of the series, in which case the caller falls back to the database.
+        """
+        store = get_series_store()
+        # Keyset pages are filtered in SQL on the composite index, so they always use the database
+        if store is None or self.paginator.keyset_requested(request):
+            return None
+        
+        start_year = request.query_params.get('start_year')
+        end_year = request.query_params.get('end_year')
+        rows = store.get_series(
+            region_code,
+            parameter_code,
+            period_types=period_types,
+            start_year=int(start_year) if start_year else None,
+            end_year=int(end_year) if end_year else None,
+        )
+        metrics.inc('cache_requests_total', cache='series-store', result='miss' if rows is None else 'hit')
+        if rows is None:
+            return None
+        
+        # A single series is bounded, so the columnar format returns it whole
+        if self._columnar_requested(request):
+            return Response(columnar_payload(*rows.to_columns()))
+        
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(page)
+        return Response(rows[:])
+    
     @action(detail=False, methods=['get'], url_path='by-region-parameter/(?P<region_code>[^/.]+)/(?P<parameter_code>[^/.]+)')
+    @cache_series_response('by-region-parameter')
     def by_region_parameter(self, request, region_code=None, parameter_code=None):
         """
         Retrieve weather data for a specific region and parameter.
         
         Optionally filter by start_year, end_year, and period_type query parameters.
         """
+        period_type = request.query_params.get('period_type')
+        response = self._series_from_store(
+            request, region_code, parameter_code, period_types=[period_type] if period_type else None
+        )
+        if response is not None:
+            return response
+        
         queryset = self.queryset.filter(
             region__code=region_code,
             parameter__code=parameter_code
@@ -79,23 +244,25 @@ class WeatherDataViewSet(viewsets.ModelViewSet):
         period_type = request.query_params.get('period_type')
         if period_type:
             queryset = queryset.filter(period_type=period_type)
+        
+        # A single series is bounded, so the columnar format returns it whole
+        if self._columnar_requested(request):
+            return Response(build_columnar(queryset.values_list(*COLUMNAR_FIELDS)))
             
-        # Apply pagination
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = WeatherDataListSerializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-            
-        serializer = WeatherDataListSerializer(queryset, many=True)
-        return Response(serializer.data)
+        return self._list_response(queryset)
         
     @action(detail=False, methods=['get'], url_path='seasonal/(?P<region_code>[^/.]+)/(?P<parameter_code>[^/.]+)')
+    @cache_series_response('seasonal')
     def seasonal_data(self, request, region_code=None, parameter_code=None):
         """
         Retrieve seasonal weather data for a specific region and parameter.
         
         Optionally filter by start_year and end_year query parameters.
         """
+        response = self._series_from_store(request, region_code, parameter_code, period_types=['win', 'spr', 'sum', 'aut'])
+        if response is not None:
+            return response
+        
         queryset = self.queryset.filter(
             region__code=region_code,
             parameter__code=parameter_code,
@@ -110,23 +277,25 @@ class WeatherDataViewSet(viewsets.ModelViewSet):
         end_year = request.query_params.get('end_year')
         if end_year:
             queryset = queryset.filter(year__lte=int(end_year))
+        
+        # A single series is bounded, so the columnar format returns it whole
+        if self._columnar_requested(request):
+            return Response(build_columnar(queryset.values_list(*COLUMNAR_FIELDS)))
             
-        # Apply pagination
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = WeatherDataListSerializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-            
-        serializer = WeatherDataListSerializer(queryset, many=True)
-        return Response(serializer.data)
+        return self._list_response(queryset)
         
     @action(detail=False, methods=['get'], url_path='annual/(?P<region_code>[^/.]+)/(?P<parameter_code>[^/.]+)')
+    @cache_series_response('annual')
     def annual_data(self, request, region_code=None, parameter_code=None):
         """
         Retrieve annual weather data for a specific region and parameter.
         
         Optionally filter by start_year and end_year query parameters.
         """
+        response = self._series_from_store(request, region_code, parameter_code, period_types=['ann'])
+        if response is not None:
+            return response
+        
         queryset = self.queryset.filter(
             region__code=region_code,
             parameter__code=parameter_code,
@@ -141,15 +310,237 @@ class WeatherDataViewSet(viewsets.ModelViewSet):
         end_year = request.query_params.get('end_year')
         if end_year:
             queryset = queryset.filter(year__lte=int(end_year))
+        
+        # A single series is bounded, so the columnar format returns it whole
+        if self._columnar_requested(request):
+            return Response(build_columnar(queryset.values_list(*COLUMNAR_FIELDS)))
             
-        # Apply pagination
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = WeatherDataListSerializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-            
-        serializer = WeatherDataListSerializer(queryset, many=True)
-        return Response(serializer.data)
+        return self._list_response(queryset)
+    
+    @action(detail=False, methods=['get'], url_path='summary')
+    def summary(self, request):
+        """
+        Dataset-wide statistics for the dashboard (counts, year range, last import),
+        read from the precomputed series statistics rather than counted from weather data.
+        """
+        return Response(get_dataset_summary())
+    
+    @action(detail=False, methods=['get'], url_path='batch')
+    def batch(self, request):
+        """
+        Retrieve many series in one request and one query, grouped per series.
+        
+        Accepts comma-separated `regions`, `parameters` and `period_types` (each optional,
+        all when omitted), and either `start_year`/`end_year` or `last_n_years`, which
+        keeps the most recent N years of the selection.
+        """
+        regions = _list_param(request, 'regions')
+        parameters = _list_param(request, 'parameters')
+        period_types = _list_param(request, 'period_types')
+        
+        valid_period_types = [code for code, _ in WeatherData.PERIOD_CHOICES]
+        invalid = [code for code in period_types if code not in valid_period_types]
+        if invalid:
+            return Response(
+                {"error": f"Invalid period_types {invalid}, expected any of {valid_period_types}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            start_year = int(request.query_params['start_year']) if request.query_params.get('start_year') else None
+            end_year = int(request.query_params['end_year']) if request.query_params.get('end_year') else None
+            last_n_years = int(request.query_params['last_n_years']) if request.query_params.get('last_n_years') else None
+        except ValueError:
+            return Response(
+                {"error": "start_year, end_year and last_n_years must be integers"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        queryset = WeatherData.objects.all()
+        if regions:
+            queryset = queryset.filter(region__code__in=regions)
+        if parameters:
+            queryset = queryset.filter(parameter__code__in=parameters)
+        if period_types:
+            queryset = queryset.filter(period_type__in=period_types)
+        if start_year is not None:
+            queryset = queryset.filter(year__gte=start_year)
+        if end_year is not None:
+            queryset = queryset.filter(year__lte=end_year)
+        if last_n_years is not None:
+            # Latest year of the selection as a subquery, so this stays a single SQL query
+            latest_year = queryset.order_by('-year').values('year')[:1]
+            queryset = queryset.filter(year__gt=Subquery(latest_year) - Value(last_n_years))
+        
+        rows = queryset.order_by('region__name', 'parameter__code', 'period_type', 'year', 'month').values_list(*BATCH_FIELDS)
+        series = build_series_batch(rows)
+        return Response({'count': len(series), 'series': series})
+
+    
+    @action(detail=False, methods=['get'], url_path='aggregates')
+    def aggregates(self, request):
+        """
+        Count, sum, mean and sample variance of values over year ranges.
+        
+        Takes comma-separated `periods` (month names jan..dec, win, spr, sum, aut or ann)
+        and `ranges` (inclusive START-END years, e.g. 1900-1950,1991-2020), plus optional
+        `regions` and `parameters` (all when omitted). Every combination is answered
+        from per-series prefix sums in constant time.
+        """
+        periods = _list_param(request, 'periods')
+        invalid = [period for period in periods if period not in PERIODS]
+        if not periods or invalid:
+            return Response(
+                {"error": f"periods must be any of {list(PERIODS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        ranges = []
+        for year_range in _list_param(request, 'ranges'):
+            start_year, _, end_year = year_range.partition('-')
+            if not (start_year.isdigit() and end_year.isdigit()) or int(start_year) > int(end_year):
+                return Response(
+                    {"error": f"Invalid range '{year_range}', expected START-END years such as 1991-2020"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            ranges.append((int(start_year), int(end_year)))
+        if not ranges:
+            return Response({"error": "ranges is required"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # The summary table lists the imported series without scanning weather data
+        series = SeriesStatistics.objects.order_by('region__code', 'parameter__code')
+        regions = _list_param(request, 'regions')
+        parameters = _list_param(request, 'parameters')
+        if regions:
+            series = series.filter(region__code__in=regions)
+        if parameters:
+            series = series.filter(parameter__code__in=parameters)
+        
+        series = list(series.values_list('region__code', 'parameter__code').distinct())
+        versions = get_series_versions(series)
+        results = []
+        for region_code, parameter_code in series:
+            aggregates = get_series_aggregates(region_code, parameter_code, versions[(region_code, parameter_code)])
+            for period in periods:
+                for start_year, end_year in ranges:
+                    results.append({
+                        'region_code': region_code,
+                        'parameter_code': parameter_code,
+                        'period': period,
+                        'start_year': start_year,
+                        'end_year': end_year,
+                        **aggregates.aggregate(period, start_year, end_year),
+                    })
+        return Response({'count': len(results), 'results': results})
+
+    
+    @action(detail=False, methods=['get'], url_path='trends')
+    def trends(self, request):
+        """
+        Least-squares trend (slope per year and per decade, intercept, r²) of many series.
+        
+        Takes optional comma-separated `regions`, `parameters` (all when omitted) and
+        `periods` (month names jan..dec, win, spr, sum, aut or ann; defaults to ann),
+        an optional `start_year`/`end_year` window, and `robust=true` to add the
+        Theil-Sen slope and the Mann-Kendall test. All selected series are fitted in one
+        batched computation; results are cached until one of the series changes.
+        """
+        periods = _list_param(request, 'periods') or [WeatherData.PERIOD_ANNUAL]
+        invalid = [period for period in periods if period not in PERIODS]
+        if invalid:
+            return Response(
+                {"error": f"periods must be any of {list(PERIODS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            start_year = int(request.query_params['start_year']) if request.query_params.get('start_year') else None
+            end_year = int(request.query_params['end_year']) if request.query_params.get('end_year') else None
+        except ValueError:
+            return Response({"error": "start_year and end_year must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+        robust = request.query_params.get('robust', '').lower() in ('1', 'true', 'yes')
+        
+        results = get_trends(
+            _list_param(request, 'regions'),
+            _list_param(request, 'parameters'),
+            periods,
+            start_year=start_year,
+            end_year=end_year,
+            robust=robust,
+        )
+        return Response({'count': len(results), 'results': results})
+
+    
+    @action(detail=False, methods=['get'], url_path='export', renderer_classes=[NDJSONRenderer, CSVRenderer])
+    def export(self, request):
+        """
+        Stream every matching row as NDJSON (default, ?format=ndjson) or CSV (?format=csv).
+        
+        Accepts the list filters and ordering. Rows are read through a server-side cursor
+        and encoded in chunks of EXPORT_CHUNK_SIZE, so memory stays flat however large
+        the export; the response is gzipped on the fly for clients that accept it.
+        """
+        queryset = self.filter_queryset(self.get_queryset()).values_list(*LIST_FIELDS)
+        chunk_size = settings.EXPORT_CHUNK_SIZE
+        rows = queryset.iterator(chunk_size=chunk_size)
+        
+        if request.accepted_renderer.format == CSVRenderer.format:
+            content, filename = stream_csv(rows, chunk_size), 'weather-data.csv'
+        else:
+            content, filename = stream_ndjson(rows, chunk_size), 'weather-data.ndjson'
+        content = (chunk.encode('utf-8') for chunk in content)
+        
+        gzipped = 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '')
+        response = StreamingHttpResponse(
+            compress_sequence(content) if gzipped else content,
+            content_type=f"{request.accepted_renderer.media_type}; charset=utf-8",
+        )
+        if gzipped:
+            response['Content-Encoding'] = 'gzip'
+        patch_vary_headers(response, ('Accept-Encoding',))
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    
+    @action(detail=False, methods=['get'], url_path='snapshot/(?P<artifact>parquet|arrow)', renderer_classes=[FastJSONRenderer])
+    def snapshot(self, request, artifact=None):
+        """
+        Download the latest Parquet or Arrow extract of the whole dataset.
+        
+        Extracts are built after imports (see build_export_snapshot) and named after their
+        content hash, which is also the ETag. The memory-mappable Arrow file is served
+        precompressed to clients that accept gzip.
+        """
+        manifest = get_export_manifest()
+        if manifest is None:
+            return Response(
+                {"error": "No export snapshot has been built yet; run the build_export_snapshot command"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        entry = manifest['artifacts'][artifact]
+        filename = entry['file']
+        etag = f'"{entry["sha256"]}"'
+        gzipped = 'gzip_file' in entry and 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if gzipped:
+            # Each encoding is a distinct representation and needs its own strong ETag
+            filename, etag = entry['gzip_file'], f'"{entry["sha256"]}-gzip"'
+        
+        if etag_matches(request, etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            try:
+                handle = open(os.path.join(settings.EXPORT_SNAPSHOT_DIR, filename), 'rb')
+            except FileNotFoundError:
+                # Replaced by a newer snapshot since the manifest was read
+                return Response({"error": "Snapshot is being rebuilt, retry shortly"}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+            response = FileResponse(
+                handle, as_attachment=True, filename=entry['file'], content_type=ARTIFACTS[artifact]['content_type']
+            )
+            if gzipped:
+                response['Content-Encoding'] = 'gzip'
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return with_validators(response, etag)
 
 
 class ImportWeatherDataView(APIView):
@@ -158,37 +549,42 @@ class ImportWeatherDataView(APIView):
     """
     def post(self, request):
         """
-        Import weather data from the MetOffice for a given parameter and region.
+        Queue an import of weather data from the MetOffice for a given parameter and region.
+
+        Returns 202 with the id of the import job. Requests for a series that already has
+        a queued or running job are coalesced into that job.
         """
         parameter_code = request.data.get('parameter_code')
         region_code = request.data.get('region_code')
-        
+
         if not parameter_code or not region_code:
             return Response(
                 {"error": "Both parameter_code and region_code are required"}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
-        parser = MetOfficeParser()
-        
-        try:
-            # Fetch the data
-            content = parser.fetch_data(parameter_code, region_code)
-            
-            # Parse the data
-            metadata, data = parser.parse_data(content)
-            
-            # Save to database
-            records_count = parser.save_to_database(parameter_code, region_code, metadata, data)
-            
-            return Response({
+
+        job, created = enqueue_import(parameter_code, region_code)
+        status_url = reverse('import-job-detail', kwargs={'pk': job.id})
+
+        return Response(
+            {
                 "success": True,
-                "message": f"Data imported successfully for {parameter_code} in {region_code}",
-                "records_imported": records_count
-            })
-            
-        except Exception as e:
-            return Response(
-                {"error": str(e)}, 
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+                "message": (
+                    f"Import queued for {parameter_code} in {region_code}" if created
+                    else f"An import for {parameter_code} in {region_code} is already {job.state}"
+                ),
+                "job_id": job.id,
+                "state": job.state,
+                "status_url": request.build_absolute_uri(status_url),
+            },
+            status=status.HTTP_202_ACCEPTED,
+            headers={"Location": status_url},
+        )
+
+
+class ImportJobDetailView(RetrieveAPIView):
+    """
+    API endpoint to check the status of a background import job.
+    """
+    queryset = ImportJob.objects.all()
+    serializer_class = ImportJobSerializer
@@ -1,7 +1,6 @@
 from django.shortcuts import render
 from django.http import JsonResponse
-from django.utils import timezone
-from db.models import Region, Parameter, WeatherData
+from utils.dataset_stats import get_dataset_summary
 
 def home(request):
     """Home page view"""
@@ -16,11 +15,13 @@ def data_explorer(request):
     return render(request, 'data_explorer.html')
 
 def stats_api(request):
-    """API endpoint to return statistics about the database"""
+    """API endpoint to return statistics about the database, read from the precomputed summary"""
+    summary = get_dataset_summary()
     stats = {
-        'regions_count': Region.objects.count(),
-        'parameters_count': Parameter.objects.count(),
-        'data_count': WeatherData.objects.count(),
-        'last_updated': timezone.now().isoformat(),
+        'regions_count': summary['regions_count'],
+        'parameters_count': summary['parameters_count'],
+        'data_count': summary['data_count'],
+        'years_covered': summary['years_covered'],
+        'last_updated': summary['last_imported_at'],
     }
-    return JsonResponse(stats)
\ No newline at end of file
+    return JsonResponse(stats)